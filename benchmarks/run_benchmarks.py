@@ -0,0 +1,392 @@
+"""Seeded performance benchmarks for world_core, graphics and the world scene.
+
+Run from the repository root:
+
+    python benchmarks/run_benchmarks.py -o bench_results.json
+    python benchmarks/run_benchmarks.py --compare bench_results.json
+
+Results are written as JSON. With --compare, every result is checked against a saved
+baseline and the run exits with status 1 if any benchmark regressed by more than
+--threshold (a fraction, 0.10 = 10%).
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import time
+import tracemalloc
+from typing import Callable, Dict, List
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SRC = os.path.join(ROOT, "src")
+
+# Everything runs offscreen
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+sys.path.insert(0, SRC)
+
+import pygame  # noqa: E402
+
+SEED = 1234
+REPEATS = 3
+
+
+class Result:
+    def __init__(self, name: str, value: float, unit: str, higher_is_better: bool = True):
+        self.name = name
+        self.value = value
+        self.unit = unit
+        self.higher_is_better = higher_is_better
+
+    def to_dict(self) -> dict:
+        return {"value": self.value, "unit": self.unit, "higher_is_better": self.higher_is_better}
+
+
+def set_repeats(repeats: int):
+    global REPEATS
+    REPEATS = max(1, repeats)
+
+
+def best_rate(count: int, run: Callable[[], None], setup: Callable[[], None] | None = None) -> float:
+    """Return the best operations per second over REPEATS runs of count operations."""
+    best = 0.0
+    for _ in range(REPEATS):
+        if setup:
+            setup()
+        start = time.perf_counter()
+        run()
+        elapsed = time.perf_counter() - start
+        best = max(best, count / elapsed if elapsed > 0 else float("inf"))
+    return best
+
+
+def _make_game(width: int, height: int):
+    """Create a Game whose screen is an offscreen surface of the given size."""
+    os.chdir(ROOT)  # assets are loaded relative to the working directory
+    from main import Game
+    game = Game(width, height)
+    game.screen = pygame.Surface((width, height))
+    game.display_width = width
+    game.display_height = height
+    return game
+
+
+def _make_world_scene(game, seed: int = SEED):
+    from world_scene import WorldScene, WorldSettings
+    game.set_scene(lambda: WorldScene(game, WorldSettings(seed=seed, max_waves=100)))
+    return game.current_scene
+
+
+# ----------------------------------------------------------------------
+# Benchmarks
+# ----------------------------------------------------------------------
+
+def bench_spatial_hash(sizes: List[int]) -> List[Result]:
+    from world_scene.world_core import Entity, SpatialHash
+
+    results = []
+    for n in sizes:
+        rng = random.Random(SEED)
+        extent = (n ** 0.5) * 2  # keeps density constant across sizes
+        entities = [Entity(rng.uniform(0, extent), rng.uniform(0, extent), 32, 32, {}) for _ in range(n)]
+        moves = [(rng.uniform(-0.5, 0.5), rng.uniform(-0.5, 0.5)) for _ in range(n)]
+        queries = [(rng.uniform(0, extent), rng.uniform(0, extent)) for _ in range(1000)]
+        spatial_hash = SpatialHash(cell_size=1.0)
+
+        def insert_all():
+            for e in entities:
+                spatial_hash.insert(e)
+
+        def update_all():
+            for e, (dx, dy) in zip(entities, moves):
+                e.pos = (e.pos[0] + dx, e.pos[1] + dy)
+                spatial_hash.update(e)
+
+        def query_all():
+            # Roughly one 800x600 screen of tiles per query
+            for x, y in queries:
+                spatial_hash.query_region(x, y, x + 25, y + 19)
+
+        results.append(Result(f"spatial_hash.insert.{n}", best_rate(n, insert_all, spatial_hash.clear), "ops/s"))
+        results.append(Result(f"spatial_hash.update.{n}", best_rate(n, update_all), "ops/s"))
+        results.append(Result(f"spatial_hash.query_region.{n}", best_rate(len(queries), query_all), "ops/s"))
+    return results
+
+
+def bench_world_queries(sizes: List[int]) -> List[Result]:
+    from world_scene.world_core import World
+    from world_scene.world_core.world import QUERY_CACHE_SIZE
+    from world_scene.entities import Zombie
+
+    results = []
+    for n in sizes:
+        rng = random.Random(SEED)
+        # Dense crowd: about one zombie per two tiles
+        extent = (n * 2) ** 0.5
+        world = World(None)  # type: ignore[arg-type]  # the log is not used by queries
+        zombies = []
+        for _ in range(n):
+            zombie = Zombie(rng.uniform(0, extent), rng.uniform(0, extent))
+            zombie.set_world(world)
+            zombies.append(zombie)
+        probes = [zombies[rng.randrange(n)] for _ in range(2000)]
+        # Screen-sized regions repeated within one generation, fewer than the cache holds
+        regions = [(z.pos[0] - 12, z.pos[1] - 9, z.pos[0] + 12, z.pos[1] + 9) for z in probes[:QUERY_CACHE_SIZE // 4]]
+        region_probes = [regions[i % len(regions)] for i in range(2000)]
+
+        def collisions():
+            for z in probes:
+                world.has_collision(z)
+
+        def radius():
+            for z in probes:
+                world.entities_in_radius(z.pos[0], z.pos[1], 3)
+
+        def region():
+            for bounds in region_probes:
+                # A new generation per probe measures the query itself, not the result cache
+                world.generation += 1
+                world.get_entities_in_region(*bounds)
+
+        def region_cached():
+            for bounds in region_probes:
+                world.get_entities_in_region(*bounds)
+
+        results.append(Result(f"world.has_collision.{n}", best_rate(len(probes), collisions), "ops/s"))
+        results.append(Result(f"world.entities_in_radius.{n}", best_rate(len(probes), radius), "ops/s"))
+        results.append(Result(f"world.get_entities_in_region.{n}", best_rate(len(region_probes), region), "ops/s"))
+        results.append(Result(f"world.get_entities_in_region.cached.{n}", best_rate(len(region_probes), region_cached), "ops/s"))
+    return results
+
+
+def _traced_bytes(build: Callable[[], object]) -> int:
+    """Return the bytes still allocated by build() while its result is alive."""
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        keep = build()
+        after = tracemalloc.get_traced_memory()[0]
+        del keep
+    finally:
+        tracemalloc.stop()
+    return after - before
+
+
+def bench_tilemap_memory(sides: List[int]) -> List[Result]:
+    from world_scene.world_core import Tile, TileMap
+
+    grass = Tile("grass", "textures/tiles/grass0.png")
+    dirt = Tile("dirt", "textures/tiles/dirt0.png")
+    results = []
+    for side in sides:
+        n = side * side
+        row_tiles = [[dirt if (x + y) % 3 == 0 else grass for x in range(side)] for y in range(side)]
+
+        def build_dict():
+            # The previous dict[tuple[int, int], Tile] layout
+            return {(x, y): row[x] for y, row in enumerate(row_tiles) for x in range(side)}
+
+        def build_chunked():
+            tile_map = TileMap()
+            for y, row in enumerate(row_tiles):
+                tile_map.write_region(0, y, side, row)
+            return tile_map
+
+        results.append(Result(f"tilemap.bytes_per_tile.dict.{n}", _traced_bytes(build_dict) / n, "B/tile", higher_is_better=False))
+        results.append(Result(f"tilemap.bytes_per_tile.chunked.{n}", _traced_bytes(build_chunked) / n, "B/tile", higher_is_better=False))
+    return results
+
+
+def bench_generation(chunk_counts: List[int]) -> List[Result]:
+    from world_scene.generation import CHUNK_SIZE, ChunkGenerator, DIRT, GRASS
+    from world_scene.entities import Chest, Tree
+    from world_scene.world_core import Chunk, World
+
+    results = []
+    for count in chunk_counts:
+        side = max(1, int(count ** 0.5))
+        keys = [(cx, cy) for cx in range(side) for cy in range(side)]
+        tiles = len(keys) * CHUNK_SIZE * CHUNK_SIZE
+
+        def legacy():
+            # The previous generator: per-cell random(), add_tile and has_collision checks
+            rng = random.Random(SEED)
+            world = World(None)  # type: ignore[arg-type]  # generation does not log
+            tile_map = world.get_tile_map()
+            for x in range(side * CHUNK_SIZE):
+                for y in range(side * CHUNK_SIZE):
+                    r = rng.random()
+                    if (x + y) % 3 == 0:
+                        tile_map.add_tile(x, y, DIRT)
+                    else:
+                        tile_map.add_tile(x, y, GRASS)
+                        if r < 0.1:
+                            tree = Tree(x, y)
+                            if not world.has_collision(tree):
+                                tree.set_world(world)
+                    if r < 0.005:
+                        chest = Chest(x, y)
+                        if not world.has_collision(chest):
+                            chest.set_world(world)
+
+        generator = ChunkGenerator(SEED)
+
+        def terrain():
+            for cx, cy in keys:
+                generator.generate_tiles(cx * CHUNK_SIZE, cy * CHUNK_SIZE)
+
+        def chunks():
+            world = World(None)  # type: ignore[arg-type]
+            for cx, cy in keys:
+                generator.generate(world, Chunk(cx, cy))
+
+        results.append(Result(f"generation.legacy.{len(keys)}", best_rate(tiles, legacy), "tiles/s"))
+        results.append(Result(f"generation.chunks.{len(keys)}", best_rate(tiles, chunks), "tiles/s"))
+        results.append(Result(f"generation.terrain_only.{len(keys)}", best_rate(tiles, terrain), "tiles/s"))
+    return results
+
+
+def bench_renderer(resolutions: List[tuple]) -> List[Result]:
+    results = []
+    for width, height in resolutions:
+        game = _make_game(width, height)
+        scene = _make_world_scene(game)
+        frames = 30
+        rate = best_rate(frames, lambda: [scene.renderer.render(scene.snapshots.latest()) for _ in range(frames)])
+        results.append(Result(f"renderer.render.{width}x{height}", rate, "frames/s"))
+        scene.on_leave()
+    return results
+
+
+def bench_fixed_update(waves: List[int]) -> List[Result]:
+    results = []
+    game = _make_game(800, 600)
+    for wave_number in waves:
+        scene = _make_world_scene(game)
+        manager = scene.wave_manager
+        while manager.current_wave_index is not None and manager.current_wave_index + 1 < wave_number:
+            manager.waves.append(scene._make_wave(manager.current_wave_index + 2))
+            manager.start_next_wave()
+        # Fill the wave up to its zombie cap before measuring
+        for _ in range(20):
+            scene._spawn_zombies(1.0)
+
+        steps = 120
+        rate = best_rate(steps, lambda: [scene.fixed_update(game.fixed_dt) for _ in range(steps)])
+        results.append(Result(f"world_scene.fixed_update.wave{wave_number}", rate, "steps/s"))
+        scene.on_leave()
+    return results
+
+
+STARTUP_SNIPPET = """
+import os, sys
+sys.path.insert(0, {src!r})
+import pygame
+from main import Game
+from startup import TIMELINE
+game = Game(800, 600)
+pygame.event.post(pygame.event.Event(pygame.QUIT))
+game.run()  # renders exactly one frame
+# When the first frame was presented, not when run() returned after shutting down
+print(TIMELINE.finished_at)
+"""
+
+
+def bench_startup() -> List[Result]:
+    best = float("inf")
+    for _ in range(REPEATS):
+        start = time.time()
+        out = subprocess.run(
+            [sys.executable, "-c", STARTUP_SNIPPET.format(src=SRC)],
+            cwd=ROOT, env=os.environ.copy(), capture_output=True, text=True, check=True
+        )
+        first_frame = float(out.stdout.strip().splitlines()[-1])
+        best = min(best, first_frame - start)
+    return [Result("startup.first_menu_frame", best * 1000.0, "ms", higher_is_better=False)]
+
+
+BENCHMARKS: Dict[str, Callable[[bool], List[Result]]] = {
+    "spatial_hash": lambda quick: bench_spatial_hash([1_000, 10_000] if quick else [1_000, 10_000, 100_000]),
+    "world": lambda quick: bench_world_queries([1_000] if quick else [1_000, 10_000]),
+    "tilemap": lambda quick: bench_tilemap_memory([1000]),
+    "generation": lambda quick: bench_generation([16] if quick else [16, 256]),
+    "renderer": lambda quick: bench_renderer([(800, 600)] if quick else [(800, 600), (1920, 1080)]),
+    "fixed_update": lambda quick: bench_fixed_update([1, 5] if quick else [1, 5, 10]),
+    "startup": lambda quick: bench_startup(),
+}
+
+
+# ----------------------------------------------------------------------
+# Reporting
+# ----------------------------------------------------------------------
+
+def compare(results: Dict[str, dict], baseline: Dict[str, dict], threshold: float) -> List[str]:
+    """Return a line per regressed benchmark, printing every comparison."""
+    regressions = []
+    for name, result in results.items():
+        if name not in baseline:
+            print(f"  {name:<45} (new)")
+            continue
+        old = baseline[name]["value"]
+        new = result["value"]
+        change = (new - old) / old if old else 0.0
+        worse = -change if result["higher_is_better"] else change
+        flag = "REGRESSION" if worse > threshold else ""
+        line = f"  {name:<45} {old:>14.1f} -> {new:>14.1f} {result['unit']:<9} {change:+7.1%} {flag}"
+        print(line)
+        if flag:
+            regressions.append(line)
+    return regressions
+
+
+def main(argv: List[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("-o", "--output", help="write results to this JSON file")
+    parser.add_argument("--compare", metavar="BASELINE", help="compare against a saved results file")
+    parser.add_argument("--threshold", type=float, default=0.10, help="allowed slowdown before flagging (default 0.10)")
+    parser.add_argument("--only", nargs="*", choices=sorted(BENCHMARKS), help="run only these benchmarks")
+    parser.add_argument("--quick", action="store_true", help="skip the largest sizes")
+    parser.add_argument("--repeats", type=int, default=REPEATS, help=f"runs per benchmark, best is kept (default {REPEATS})")
+    args = parser.parse_args(argv)
+    set_repeats(args.repeats)
+
+    results: Dict[str, dict] = {}
+    for name, bench in BENCHMARKS.items():
+        if args.only and name not in args.only:
+            continue
+        for result in bench(args.quick):
+            print(f"{result.name:<45} {result.value:>14.1f} {result.unit}")
+            results[result.name] = result.to_dict()
+
+    report = {
+        "meta": {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "pygame": pygame.version.ver,
+            "platform": platform.platform(),
+            "seed": SEED,
+            "repeats": REPEATS,
+        },
+        "results": results,
+    }
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)["results"]
+        print(f"\nComparison against {args.compare}:")
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            print(f"\n{len(regressions)} regression(s) beyond {args.threshold:.0%}")
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
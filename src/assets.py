@@ -1,3 +1,4 @@
+import json
 import pygame
 import os
 from io import BytesIO
@@ -7,10 +8,14 @@ class AssetManager:
     def __init__(self, base_path: str):
         self.base_path = base_path
         self.cache: dict[str, bytes] = {}
-    
+        self.images: dict[str, pygame.Surface] = {}  # Decoded and converted surfaces
+        self.themes: dict[str, dict] = {}            # Parsed UI themes
+        self.masks: dict[str, pygame.mask.Mask] = {}  # Opaque pixels of images, for hit tests
+
     def load_assets(self):
         # Recursively load all assets from the base path We also need to support subdirectories
-        # Assets can be any file type; here we just store their paths and contents
+        # Assets can be any file type; here we just store their paths and contents.
+        # Optional: get_asset reads files on first use, this only front-loads the I/O.
 
         def _load_directory(self: AssetManager, current_path: str):
             for entry in os.scandir(current_path):
@@ -29,24 +34,62 @@ class AssetManager:
         _load_directory(self, self.base_path)
 
     def get_asset(self, relative_path: str) -> bytes | None:
-        return self.cache.get(relative_path)
-    
+        data = self.cache.get(relative_path)
+        if data is None:
+            # Read on first use so startup does not wait for assets it does not need
+            try:
+                with open(os.path.join(self.base_path, relative_path), 'rb') as f:
+                    data = f.read()
+            except OSError:
+                return None
+            self.cache[relative_path] = data
+        return data
+
     def get_absolute_path(self, relative_path: str) -> str | None:
         absolute_path = os.path.join(self.base_path, relative_path)
         if os.path.exists(absolute_path):
             return absolute_path
         return None
-    
+
+    def get_theme(self, relative_path: str) -> dict | None:
+        """Return a parsed UI theme, parsing the JSON only once."""
+        theme = self.themes.get(relative_path)
+        if theme is None:
+            asset_data = self.get_asset(relative_path)
+            if asset_data is None:
+                return None
+            try:
+                theme = json.loads(asset_data)
+            except ValueError as e:
+                print(f"Error parsing theme {relative_path}: {e}")
+                return None
+            self.themes[relative_path] = theme
+        return theme
+
     def try_get_image(self, relative_path: str) -> pygame.Surface:
+        # Images are decoded once and shared; callers must not draw onto them
+        image = self.images.get(relative_path)
+        if image is not None:
+            return image
+
         asset_data = self.get_asset(relative_path)
         if asset_data is not None:
             try:
                 image_file = BytesIO(asset_data)
                 image = pygame.image.load(image_file).convert_alpha()
-                return image
             except Exception as e:
                 print(f"Error converting asset to image {relative_path}: {e}")
-        # Return fallback magenta surface if loading fails
-        fallback = pygame.Surface((32, 32))
-        fallback.fill((255, 0, 255))
-        return fallback
+        if image is None:
+            # Return fallback magenta surface if loading fails
+            image = pygame.Surface((32, 32))
+            image.fill((255, 0, 255))
+        self.images[relative_path] = image
+        return image
+
+    def get_mask(self, relative_path: str) -> pygame.mask.Mask:
+        """Return the collision mask (opaque pixels) of an image, built once and shared by every user."""
+        mask = self.masks.get(relative_path)
+        if mask is None:
+            mask = pygame.mask.from_surface(self.try_get_image(relative_path))
+            self.masks[relative_path] = mask
+        return mask
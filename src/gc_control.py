@@ -0,0 +1,109 @@
+import gc
+import time
+from typing import TYPE_CHECKING, Dict, List
+
+if TYPE_CHECKING:
+    from profiler import FrameProfiler
+
+
+class GCManager:
+    """Controls when the cyclic garbage collector runs and measures its pauses.
+
+    - freeze() moves everything currently alive (e.g. a freshly generated world)
+      into the permanent generation so later collections no longer traverse it.
+    - In deferred mode automatic collection is disabled and collect_idle(),
+      called after display.flip, runs whatever collections are due.
+    - Every pause is timed through gc.callbacks and added to the frame profiler
+      as gc0/gc1/gc2 (ms per frame).
+    """
+
+    def __init__(self, profiler: 'FrameProfiler | None' = None, defer: bool = False):
+        self.profiler = profiler
+        self.deferred = False
+        self.pause_counts: List[int] = [0, 0, 0]
+        self.pause_totals: List[float] = [0.0, 0.0, 0.0]  # ms per generation
+        self.pause_max: List[float] = [0.0, 0.0, 0.0]
+        self._start = 0.0
+        self._installed = False
+        # Objects in the oldest generation after the last full collection run by collect_idle
+        self._long_lived_total = 0
+        # Last count of the oldest generation while a full collection was due but not run,
+        # and the generation 1 collections since; None when it has to be measured again
+        self._long_lived_measured: int | None = None
+        self._gen1_since_measured = 0
+
+        self.install()
+        self.set_deferred(defer)
+
+    def install(self):
+        if not self._installed:
+            gc.callbacks.append(self._on_gc)
+            self._installed = True
+
+    def uninstall(self):
+        if self._installed:
+            gc.callbacks.remove(self._on_gc)
+            self._installed = False
+        self.set_deferred(False)
+
+    def _on_gc(self, phase: str, info: Dict[str, int]):
+        if phase == "start":
+            self._start = time.perf_counter()
+            return
+
+        generation = info["generation"]
+        pause = (time.perf_counter() - self._start) * 1000.0
+        self.pause_counts[generation] += 1
+        self.pause_totals[generation] += pause
+        self.pause_max[generation] = max(self.pause_max[generation], pause)
+        if self.profiler is not None:
+            self.profiler.add(f"gc{generation}", pause)
+
+    def set_deferred(self, deferred: bool):
+        """Enable or disable deferring collections to collect_idle()."""
+        self.deferred = deferred
+        if deferred:
+            gc.disable()
+        else:
+            gc.enable()
+
+    def freeze(self):
+        """Collect existing garbage, then exclude every surviving object from future collections."""
+        gc.collect()
+        gc.freeze()
+        self._long_lived_total = 0  # The oldest generation is empty now
+        self._long_lived_measured = None
+
+    def unfreeze(self):
+        gc.unfreeze()
+
+    def collect_idle(self):
+        """Run the collections that automatic GC would have run, now that the frame is presented."""
+        if not self.deferred:
+            return
+
+        count0, count1, count2 = gc.get_count()
+        threshold0, threshold1, threshold2 = gc.get_threshold()
+        if count0 < threshold0:
+            return
+
+        # Same escalation rule as the automatic collector: a full collection also needs the
+        # objects promoted to the oldest generation since the last one to exceed a quarter
+        # of those that survived it. CPython does not expose those counts, so they are
+        # measured with gc.get_objects(2), which lists the whole generation. That only runs
+        # once a full collection is due, and while it stays due only after another threshold1
+        # generation 1 collections could have promoted enough objects to change the answer.
+        if count2 >= threshold2:
+            if self._long_lived_measured is None or self._gen1_since_measured >= threshold1:
+                self._long_lived_measured = len(gc.get_objects(2))
+                self._gen1_since_measured = 0
+            if self._long_lived_measured - self._long_lived_total > self._long_lived_total // 4:
+                gc.collect(2)
+                self._long_lived_total = len(gc.get_objects(2))
+                self._long_lived_measured = None
+                return
+        if count1 >= threshold1:
+            gc.collect(1)
+            self._gen1_since_measured += 1
+        else:
+            gc.collect(0)
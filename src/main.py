@@ -1,97 +1,317 @@
-from typing import Callable
+# Imported first so the startup timeline includes every other import
+from startup import TIMELINE
+import argparse
+import os
+from typing import TYPE_CHECKING, Callable, List, Tuple
 
 import pygame
-import pygame_gui
 from scene import Scene
 from menu_scene import MenuScene
 from assets import AssetManager
+from scheduler import Scheduler
+from profiler import FrameProfiler
+from profile_capture import ProfileCapture
+from gc_control import GCManager
+from sim_thread import InstrumentedLock, SimulationThread
+
+if TYPE_CHECKING:
+    import pygame_gui
+
+TIMELINE.mark("imports")
+
+PROFILER_TOGGLE_KEY = pygame.K_F3
+PROFILER_EXPORT_KEY = pygame.K_F4
+CAPTURE_TOGGLE_KEY = pygame.K_F5
+RENDER_SIZE_KEY = pygame.K_F7
+
+# Internal resolutions cycled with RENDER_SIZE_KEY; None draws at the window resolution
+RENDER_SIZES: List[Tuple[int, int] | None] = [None, (640, 360), (960, 540), (1280, 720)]
+
+UI_THEME = "ui/ui_theme.json"
 
 class Game:
-    def __init__(self, width: int = 800, height: int = 600):
+    def __init__(self, width: int = 800, height: int = 600, headless: bool = False, render_size: Tuple[int, int] | None = None):
+        if headless:
+            # Must be set before the display is initialised
+            os.environ["SDL_VIDEODRIVER"] = "dummy"
+            os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+        self.headless = headless
+
         pygame.init()
         pygame.font.init()
+        TIMELINE.mark("pygame_init")
 
-        self.screen = pygame.display.set_mode((width, height), pygame.RESIZABLE)
-        self.display_width = width
-        self.display_height = height
+        # pygame_gui is only imported once a scene asks for the UI manager
+        self._ui_manager: 'pygame_gui.UIManager | None' = None
+
+        self.window_size = (width, height)
+        self.render_size: Tuple[int, int] | None = None
+        self.set_render_size(render_size)
         self.clock = pygame.time.Clock()
+        TIMELINE.mark("display")
 
+        # Assets are read and decoded on first use
         self.asset_manager = AssetManager("assets")
-        self.asset_manager.load_assets()
 
         self.running = True
 
-        self.ui_manager = pygame_gui.UIManager((width, height), self.asset_manager.get_absolute_path("ui/ui_theme.json"))
+        self.report_startup = bool(os.environ.get("CHEST_HUNTERS_STARTUP"))
 
-        # fixed-step timing (global)
+        # fixed-step timing (global); scenes register their systems with the scheduler
         self.fixed_dt = 1.0 / 60.0
-        self.accumulator = 0.0
+        self.scheduler = Scheduler()
+        self.profiler = FrameProfiler(enabled=bool(os.environ.get("CHEST_HUNTERS_PROFILE")))
+        self.profiler.overlay_visible = self.profiler.enabled
+        self.gc = GCManager(self.profiler, defer=bool(os.environ.get("CHEST_HUNTERS_GC_DEFER")))
+        self.trace_memory = bool(os.environ.get("CHEST_HUNTERS_TRACEMALLOC"))
+        self.capture = ProfileCapture()
+        capture_spec = os.environ.get("CHEST_HUNTERS_CAPTURE")
+        if capture_spec:
+            self.capture.arm_from_spec(capture_spec, os.environ.get("CHEST_HUNTERS_CAPTURE_SCENE"))
         self.last_time = pygame.time.get_ticks() / 1000.0
+        # Optionally the scheduler runs on a worker thread; sim_lock guards the simulation state either way
+        self.threaded_simulation = bool(os.environ.get("CHEST_HUNTERS_SIM_THREAD"))
+        self.sim_lock = InstrumentedLock()
+        self.sim_thread: SimulationThread | None = None
+        TIMELINE.mark("game_systems")
 
         # scene management
         self.current_scene: Scene = MenuScene(self)
+        self.current_scene.register_systems(self.scheduler)
+        TIMELINE.mark("menu")
+
+        # headless runs simulate one fixed step per frame, as fast as possible
+        self.max_frames: int | None = None
+        self.frame_count = 0
+        # Replays run uncapped, and the simulation thread does not wait between batches
+        self.fast_forward = False
+
+    @property
+    def ui_manager(self) -> 'pygame_gui.UIManager':
+        """The pygame_gui manager, created (and pygame_gui imported) on first use."""
+        if self._ui_manager is None:
+            import pygame_gui
+            # A parsed theme dict also skips pygame_gui's file polling for live theme updates
+            self._ui_manager = pygame_gui.UIManager(
+                (self.display_width, self.display_height),
+                self.asset_manager.get_theme(UI_THEME),
+                enable_live_theme_updates=False
+            )
+        return self._ui_manager
+
+    @property
+    def ui_loaded(self) -> bool:
+        return self._ui_manager is not None
+
+    def set_render_size(self, size: Tuple[int, int] | None):
+        """
+        Draw into a fixed internal resolution that SDL scales to the window on the
+        GPU (pygame.SCALED), so rendering cost no longer depends on the window size.
+        None draws at the window's own resolution. Either way scenes and the UI see
+        display_width/display_height, and SDL maps mouse positions to them.
+        """
+        self.render_size = size
+        if size is None:
+            self.screen = pygame.display.set_mode(self.window_size, pygame.RESIZABLE)
+        elif self.headless:
+            # Nothing is presented, so skip the scaling renderer
+            self.screen = pygame.display.set_mode(size)
+        else:
+            self.screen = pygame.display.set_mode(size, pygame.SCALED | pygame.RESIZABLE)
+        self.display_width, self.display_height = self.screen.get_size()
+        if self._ui_manager is not None:
+            self._ui_manager.set_window_resolution((self.display_width, self.display_height))
+
+    def cycle_render_size(self):
+        index = RENDER_SIZES.index(self.render_size) if self.render_size in RENDER_SIZES else 0
+        self.set_render_size(RENDER_SIZES[(index + 1) % len(RENDER_SIZES)])
+        print("Render size:", "window" if self.render_size is None else "%dx%d" % self.render_size)
+        # Let the scene lay itself out again for the new resolution
+        pygame.event.post(pygame.event.Event(
+            pygame.VIDEORESIZE, w=self.display_width, h=self.display_height, size=(self.display_width, self.display_height)
+        ))
 
     def set_scene(self, scene: Callable[[], Scene]):
-        self.current_scene.on_leave()
-        self.current_scene = scene()
+        with self.sim_lock:
+            self.current_scene.on_leave()
+            self.scheduler.clear()
+            self.current_scene = scene()
+            self.current_scene.register_systems(self.scheduler)
 
     def _gather_events(self) -> list[pygame.event.Event]:
         return list(pygame.event.get())
 
     def run(self):
+        profiler = self.profiler
+        if self.threaded_simulation:
+            self.sim_thread = SimulationThread(self)
+            self.sim_thread.start()
         while self.running:
+            self.capture.begin_frame(self.current_scene)
+            profiler.begin_frame()
             events = self._gather_events()
+            profiler.mark("events")
             for ev in events:
                 if ev.type == pygame.QUIT:
                     self.running = False
 
                 elif ev.type == pygame.VIDEORESIZE:
-                    self.screen = pygame.display.set_mode((ev.w, ev.h), pygame.RESIZABLE)
-                    self.display_width = ev.w
-                    self.display_height = ev.h
-                    self.ui_manager.set_window_resolution((ev.w, ev.h))
+                    # A fixed render size is only rescaled, the surface keeps its size
+                    if self.render_size is None:
+                        self.window_size = (ev.w, ev.h)
+                        self.set_render_size(None)
+
+                elif ev.type == pygame.KEYDOWN:
+                    if ev.key == PROFILER_TOGGLE_KEY:
+                        profiler.toggle()
+                    elif ev.key == PROFILER_EXPORT_KEY and profiler.frame_count > 0:
+                        print("Profiler traces written to", *profiler.export())
+                    elif ev.key == CAPTURE_TOGGLE_KEY:
+                        self.capture.toggle(self.current_scene)
+                    elif ev.key == RENDER_SIZE_KEY:
+                        self.cycle_render_size()
 
-                self.ui_manager.process_events(ev)
+                if self._ui_manager is not None:
+                    self._ui_manager.process_events(ev)
+            profiler.mark("ui_events")
 
             # deliver raw events to scene first (scene may change state / switch)
             self.current_scene.handle_events(events)
+            profiler.mark("scene_events")
 
             # --- timing: frame / fixed-step management (single global place) ---
             now = pygame.time.get_ticks() / 1000.0
             frame_time = now - self.last_time
             self.last_time = now
+            if self.headless:
+                frame_time = self.fixed_dt
 
             # clamp to avoid spiral of death
             if frame_time > 0.25:
                 frame_time = 0.25
 
-            self.accumulator += frame_time
-
-            # run fixed steps
-            while self.accumulator >= self.fixed_dt:
-                # deterministic updates
-                self.current_scene.fixed_update(self.fixed_dt)
-                self.accumulator -= self.fixed_dt
+            # run fixed steps of every system at its own rate, unless the simulation thread does
+            if self.sim_thread is None:
+                scene = self.current_scene
+                frame_time = scene.before_steps(frame_time)
+                self.scheduler.update(frame_time)
+                scene.after_steps(frame_time)
+            profiler.mark("fixed_steps")
 
             # compute alpha for render interpolation (0..1)
-            alpha = self.accumulator / self.fixed_dt if self.fixed_dt > 0 else 1.0
+            alpha = self.scheduler.alpha
 
             # per-frame update (non-critical)
             dt = self.clock.get_time() / 1000.0
             self.current_scene.update(dt)
-            self.ui_manager.update(dt)
+            profiler.mark("scene_update")
+            if self._ui_manager is not None:
+                self._ui_manager.update(dt)
+            profiler.mark("ui_update")
 
             # render with interpolation
             self.screen.fill((0, 0, 0))
             self.current_scene.render(self.screen, alpha)
-            self.ui_manager.draw_ui(self.screen)
+            profiler.mark("render")
+            if self._ui_manager is not None:
+                self._ui_manager.draw_ui(self.screen)
+            profiler.mark("draw_ui")
+            profiler.draw_overlay(self.screen)
             pygame.display.flip()
+            profiler.mark("flip")
+            if not TIMELINE.finished:
+                TIMELINE.finish("first_frame")
+                if self.report_startup:
+                    print(TIMELINE.format())
+
+            # deferred garbage collection runs in the idle time after presenting
+            self.gc.collect_idle()
+            profiler.mark("gc_idle")
+
+            if profiler.enabled:
+                profiler.record("steps", sum(s.steps_last_frame for s in self.scheduler.systems))
+                for name, value in self.current_scene.get_stats().items():
+                    profiler.record(name, value)
+            profiler.end_frame()
+            self.capture.end_frame()
+
+            self.frame_count += 1
+            if self.max_frames is not None and self.frame_count >= self.max_frames:
+                self.running = False
 
-            # cap frame rate
-            self.clock.tick(120)
+            # cap frame rate (uncapped when headless)
+            self.clock.tick(0 if self.headless or self.fast_forward else 120)
 
+        if self.sim_thread is not None:
+            self.sim_thread.stop()
+        # Give the scene a chance to finish, e.g. write a final save
+        self.current_scene.on_leave()
+        self.capture.stop()
+        self.gc.uninstall()
         pygame.quit()
 
+
+def parse_size(spec: str) -> Tuple[int, int]:
+    """Parse a WIDTHxHEIGHT resolution such as 640x360."""
+    try:
+        width, height = (int(part) for part in spec.lower().split("x"))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected WIDTHxHEIGHT, got {spec!r}")
+    if width <= 0 or height <= 0:
+        raise argparse.ArgumentTypeError(f"resolution must be positive, got {spec!r}")
+    return width, height
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Chest Hunters")
+    parser.add_argument("--headless", action="store_true", help="run without a window, one fixed step per frame at unlimited speed")
+    parser.add_argument("--frames", type=int, help="quit after this many frames")
+    parser.add_argument("--world", action="store_true", help="skip the menu and start a world")
+    parser.add_argument("--seed", type=int, default=0, help="world seed used with --world")
+    parser.add_argument("--capture", metavar="MODE[:FRAMES]", default=os.environ.get("CHEST_HUNTERS_CAPTURE"),
+                        help="profile frames with cprofile or sample, e.g. sample:600")
+    parser.add_argument("--capture-scene", metavar="SCENE", default=os.environ.get("CHEST_HUNTERS_CAPTURE_SCENE"),
+                        help="only capture frames of this scene class, e.g. WorldScene")
+    parser.add_argument("--render-size", metavar="WxH", type=parse_size, default=os.environ.get("CHEST_HUNTERS_RENDER_SIZE"),
+                        help="draw at a fixed internal resolution scaled to the window, e.g. 640x360 (F7 cycles presets)")
+    parser.add_argument("--zoom", type=float, default=1.0, help="initial camera zoom for --world (mouse wheel changes it)")
+    parser.add_argument("--precise-attacks", action="store_true", help="attacks hit zombies whose sprite overlaps the attack range (pixel masks)")
+    parser.add_argument("--save", metavar="PATH", help="autosave the world started with --world to PATH")
+    parser.add_argument("--load", action="store_true", help="continue the world saved at --save PATH")
+    parser.add_argument("--record", metavar="PATH", help="record the input of the world started with --world to PATH")
+    parser.add_argument("--replay", metavar="PATH", help="replay a recorded session as fast as possible, then quit")
+    parser.add_argument("--sim-thread", action="store_true", help="run the fixed-step simulation on a worker thread")
+    parser.add_argument("--gc-defer", action="store_true", help="run garbage collections after display.flip only")
+    parser.add_argument("--startup-timeline", action="store_true", help="print the startup timeline after the first frame")
+    parser.add_argument("--trace-memory", action="store_true", help="report tracemalloc snapshots at each wave boundary")
+    args = parser.parse_args(argv)
+    if args.record and (args.load or args.replay):
+        parser.error("--record starts a new world, it cannot be combined with --load or --replay")
+    return args
+
+
 if __name__ == "__main__":
-    game = Game(800, 600)
+    args = parse_args()
+    game = Game(800, 600, headless=args.headless, render_size=args.render_size)
+    game.max_frames = args.frames
+    game.trace_memory = game.trace_memory or args.trace_memory
+    game.report_startup = game.report_startup or args.startup_timeline
+    if args.gc_defer:
+        game.gc.set_deferred(True)
+    game.threaded_simulation = game.threaded_simulation or args.sim_thread
+    if args.capture:
+        game.capture.arm_from_spec(args.capture, args.capture_scene)
+    if args.replay:
+        from world_scene import InputReplay, WorldScene, WorldSettings
+        replay = InputReplay(args.replay)
+        settings = replay.apply_to(WorldSettings(seed=args.seed, max_waves=10, save_path=args.save, zoom=args.zoom))
+        game.fast_forward = True
+        game.set_scene(lambda: WorldScene(game, settings, replay=replay))
+    elif args.world:
+        from world_scene import WorldScene, WorldSettings
+        settings = WorldSettings(
+            seed=args.seed, max_waves=10, save_path=args.save, load_save=args.load, zoom=args.zoom,
+            precise_attacks=args.precise_attacks, record_path=args.record
+        )
+        game.set_scene(lambda: WorldScene(game, settings))
     game.run()
\ No newline at end of file
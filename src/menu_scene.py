@@ -1,13 +1,38 @@
-from typing import TYPE_CHECKING, List
+import os
+from typing import TYPE_CHECKING, Dict, List, Tuple
 
 import pygame
-import pygame_gui
 
 if TYPE_CHECKING:
     from main import Game
 
 from scene import Scene
 
+# Autosave location of worlds started from the menu
+SAVE_PATH = os.path.join("saves", "world.sav")
+
+# Colours matching the default pygame_gui theme used by the in-game UI
+PANEL_COLOUR = (33, 40, 45)
+BUTTON_COLOUR = (69, 73, 78)
+BUTTON_HOVER_COLOUR = (53, 57, 62)
+BUTTON_BORDER_COLOUR = (221, 221, 221)
+TEXT_COLOUR = (255, 255, 255)
+
+
+class MenuButton:
+    """A plain pygame button, so showing the menu does not need pygame_gui."""
+    def __init__(self, text: str, y: int, width: int = 200, height: int = 50):
+        self.text = text
+        self.rect = pygame.Rect(0, y, width, height)
+
+    def layout(self, panel_width: int):
+        self.rect.x = (panel_width - self.rect.width) // 2
+
+    def draw(self, surface: pygame.Surface, label: pygame.Surface, hovered: bool):
+        pygame.draw.rect(surface, BUTTON_HOVER_COLOUR if hovered else BUTTON_COLOUR, self.rect)
+        pygame.draw.rect(surface, BUTTON_BORDER_COLOUR, self.rect, 1)
+        surface.blit(label, label.get_rect(center=self.rect.center))
+
 
 class MenuScene(Scene):
     TITLE = "Chest Hunters"
@@ -16,49 +41,61 @@ class MenuScene(Scene):
     def __init__(self, game: 'Game'):
         super().__init__(game)
 
-        screen_w = self.game.display_width
-        screen_h = self.game.display_height
-        self.panel = pygame_gui.elements.UIPanel(
-            relative_rect=pygame.Rect((0, 0), (screen_w/2, screen_h)),
-            manager=self.game.ui_manager,
-        )
+        self.font = pygame.font.Font(None, 28)
+        self.title_font = pygame.font.Font(None, 40)
+        # Text is rendered once, not every frame
+        self._labels: Dict[str, pygame.Surface] = {}
 
-        # Title label inside the panel
-        self.title_label = pygame_gui.elements.UILabel(
-            relative_rect=pygame.Rect((0, 20), (screen_w/2, 50)),
-            text=self.TITLE,
-            manager=self.game.ui_manager,
-            container=self.panel,
-        )
+        self.start_button = MenuButton("Start Game", 70)
+        # Continue button, only when there is a save to continue
+        self.continue_button: MenuButton | None = None
+        if os.path.exists(SAVE_PATH):
+            self.continue_button = MenuButton("Continue", 130)
 
-        # Start button inside the panel, centered horizontally
-        button_width = 200
-        button_x = (screen_w/2 - button_width) // 2
-        self.start_button = pygame_gui.elements.UIButton(
-            relative_rect=pygame.Rect((button_x, 70), (button_width, 50)),
-            text="Start Game",
-            manager=self.game.ui_manager,
-            container=self.panel,
-        )
+    @property
+    def buttons(self) -> List[MenuButton]:
+        return [b for b in (self.start_button, self.continue_button) if b is not None]
+
+    def _panel_size(self) -> Tuple[int, int]:
+        return self.game.display_width // 2, self.game.display_height
+
+    def _label(self, text: str, font: pygame.font.Font) -> pygame.Surface:
+        label = self._labels.get(text)
+        if label is None:
+            label = font.render(text, True, TEXT_COLOUR)
+            self._labels[text] = label
+        return label
 
     def handle_events(self, events: List[pygame.event.Event]):
-        # UI manager handles its own events
         for event in events:
-            self.game.ui_manager.process_events(event)
-            if event.type == pygame.VIDEORESIZE:
-                # Recenter the panel on window resize
-                self.panel.set_position((0, 0))
-                self.panel.set_dimensions((self.game.display_width / 2, self.game.display_height))
-                self.title_label.set_position((
-                    (self.game.display_width / 2 - self.title_label.get_relative_rect().width) // 2,
-                    self.title_label.get_relative_rect().y
-                ))
-                self.start_button.set_position((
-                    (self.game.display_width / 2 - self.start_button.get_relative_rect().width) // 2,
-                    self.start_button.get_relative_rect().y
-                ))
-            elif event.type == pygame_gui.UI_BUTTON_PRESSED:
-                if event.ui_element == self.start_button:
-                    from world_scene import WorldScene, WorldSettings
-                    settings = WorldSettings(seed=0, max_waves=10)
-                    self.game.set_scene(lambda: WorldScene(self.game, settings))
+            if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
+                panel_width, _ = self._panel_size()
+                for button in self.buttons:
+                    button.layout(panel_width)
+                    if button.rect.collidepoint(event.pos):
+                        self._start_world(load_save=button is self.continue_button)
+                        return
+
+    def _start_world(self, load_save: bool):
+        from world_scene import LoadingScene, WorldSettings
+        settings = WorldSettings(
+            seed=0,
+            max_waves=10,
+            save_path=SAVE_PATH,
+            load_save=load_save
+        )
+        # The world is built on a worker thread while the loading scene shows progress
+        self.game.set_scene(lambda: LoadingScene(self.game, settings))
+
+    def render(self, screen: pygame.Surface, alpha: float):
+        # Laid out from the current window size, so resizes need no handling
+        panel_width, panel_height = self._panel_size()
+        pygame.draw.rect(screen, PANEL_COLOUR, (0, 0, panel_width, panel_height))
+
+        title = self._label(self.TITLE, self.title_font)
+        screen.blit(title, title.get_rect(center=(panel_width // 2, 45)))
+
+        mouse = pygame.mouse.get_pos()
+        for button in self.buttons:
+            button.layout(panel_width)
+            button.draw(screen, self._label(button.text, self.font), button.rect.collidepoint(mouse))
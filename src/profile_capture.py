@@ -0,0 +1,215 @@
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from typing import TYPE_CHECKING, Dict, Iterator
+
+if TYPE_CHECKING:
+    import cProfile
+    from scene import Scene
+
+# From Python 3.12 cProfile runs on sys.monitoring: one enabled profiler sees every thread,
+# and no second one can be enabled meanwhile
+CPROFILE_ALL_THREADS = sys.version_info >= (3, 12)
+
+
+class StackSampler:
+    """
+    Samples the call stacks of some threads at a fixed interval into collapsed-stack
+    counts. Each stack starts with the name its thread was added under.
+    """
+
+    def __init__(self, threads: Dict[int, str], interval: float = 0.005):
+        self.threads = dict(threads)  # thread id -> name; add_thread may add more while sampling
+        self.interval = interval
+        self.counts: Counter[str] = Counter()
+        self.sampling = False  # only frames inside the captured scope are sampled
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="stack-sampler", daemon=True)
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+    def add_thread(self, thread_id: int, name: str):
+        self.threads[thread_id] = name
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            if not self.sampling:
+                continue
+            frames = sys._current_frames()
+            for thread_id, name in list(self.threads.items()):
+                frame = frames.get(thread_id)
+                stack = []
+                while frame is not None:
+                    code = frame.f_code
+                    stack.append(f"{os.path.basename(code.co_filename)}:{code.co_name}")
+                    frame = frame.f_back
+                if stack:
+                    stack.append(name)
+                    self.counts[";".join(reversed(stack))] += 1
+
+    def write(self, path: str):
+        """Write in the collapsed format read by flamegraph.pl and speedscope."""
+        with open(path, "w") as f:
+            for stack, count in self.counts.most_common():
+                f.write(f"{stack} {count}\n")
+
+
+class ProfileCapture:
+    """Profiles a chosen number of frames with cProfile or a sampling thread.
+
+    Once armed, capture starts at the next frame whose scene matches the scope (a
+    scene class name, or any scene if None). Only frames of that scene are profiled;
+    the capture is written out when the frame count is reached, when the scene is
+    left, or when stop() is called. Files are named after the scene's capture label
+    (e.g. its wave) and a timestamp.
+
+    A simulation thread wraps its batches in simulation_batch() so they are captured
+    too, while a capture is active: before Python 3.12 cProfile keeps a second profile
+    for that thread, written next to the main one with a "-simulation" suffix, and the
+    sampler samples both threads, each stack rooted at its thread's name.
+    """
+
+    MODES = ("cprofile", "sample")
+
+    def __init__(self, directory: str = "profiles"):
+        self.directory = directory
+        self.mode = "cprofile"
+        self.frames = 300
+        self.scope: str | None = None
+        self.armed = False
+        self.active = False
+
+        self._frames_left = 0
+        self._label = ""
+        self._in_frame = False
+        self._profiler: 'cProfile.Profile | None' = None
+        self._sampler: StackSampler | None = None
+        # Held by the simulation thread for a whole batch, so stop() never writes its profile mid-batch
+        self._simulation_lock = threading.Lock()
+        self._simulation_profiler: 'cProfile.Profile | None' = None
+
+    def arm(self, mode: str = "cprofile", frames: int = 300, scope: str | None = None):
+        if mode not in self.MODES:
+            raise ValueError(f"Unknown capture mode {mode!r}, expected one of {self.MODES}")
+        self.mode = mode
+        self.frames = frames
+        self.scope = scope
+        self.armed = True
+
+    def arm_from_spec(self, spec: str, scope: str | None = None):
+        """Arm from a "mode[:frames]" string such as "sample:600"."""
+        mode, _, frames = spec.partition(":")
+        self.arm(mode or "cprofile", int(frames) if frames else 300, scope)
+
+    def toggle(self, scene: 'Scene'):
+        """Hotkey behaviour: stop a running capture, or arm one scoped to the current scene."""
+        if self.armed:
+            self.stop()
+        else:
+            self.arm(self.mode, self.frames, type(scene).__name__)
+
+    def begin_frame(self, scene: 'Scene'):
+        if not self.armed:
+            return
+
+        if self.scope is not None and type(scene).__name__ != self.scope:
+            if self.active:
+                # The captured scene was left
+                self.stop()
+            return
+
+        if not self.active:
+            self._start(scene)
+
+        self._in_frame = True
+        if self._profiler is not None:
+            self._profiler.enable()
+        elif self._sampler is not None:
+            self._sampler.sampling = True
+
+    def end_frame(self):
+        if not self._in_frame:
+            return
+        self._in_frame = False
+
+        if self._profiler is not None:
+            self._profiler.disable()
+        elif self._sampler is not None:
+            self._sampler.sampling = False
+
+        self._frames_left -= 1
+        if self._frames_left <= 0:
+            self.stop()
+
+    def _start(self, scene: 'Scene'):
+        self.active = True
+        self._frames_left = self.frames
+        self._label = scene.get_capture_label()
+        if self.mode == "cprofile":
+            import cProfile
+            self._profiler = cProfile.Profile()
+        else:
+            self._sampler = StackSampler({threading.get_ident(): "main"})
+            self._sampler.start()
+
+    @contextmanager
+    def simulation_batch(self) -> Iterator[None]:
+        """Capture a batch of simulation steps run on a simulation thread, if a capture is active."""
+        with self._simulation_lock:
+            profiler = None
+            sampler = self._sampler
+            if self.active:
+                if self.mode == "cprofile" and not CPROFILE_ALL_THREADS:
+                    if self._simulation_profiler is None:
+                        import cProfile
+                        self._simulation_profiler = cProfile.Profile()
+                    profiler = self._simulation_profiler
+                    profiler.enable()
+                elif sampler is not None:
+                    sampler.add_thread(threading.get_ident(), "simulation")
+            try:
+                yield
+            finally:
+                if profiler is not None:
+                    profiler.disable()
+
+    def stop(self) -> str | None:
+        """Stop capturing and write the results. Returns the written path, if any."""
+        self.armed = False
+        if not self.active:
+            return None
+        self.active = False
+        if self._in_frame:
+            self._in_frame = False
+            if self._profiler is not None:
+                self._profiler.disable()
+
+        os.makedirs(self.directory, exist_ok=True)
+        stamp = time.strftime("%Y%m%d-%H%M%S")
+        path = None
+        if self._profiler is not None:
+            path = os.path.join(self.directory, f"{self._label}-{stamp}.prof")
+            self._profiler.dump_stats(path)
+            self._profiler = None
+            with self._simulation_lock:
+                if self._simulation_profiler is not None:
+                    simulation_path = os.path.join(self.directory, f"{self._label}-{stamp}-simulation.prof")
+                    self._simulation_profiler.dump_stats(simulation_path)
+                    self._simulation_profiler = None
+                    print(f"Simulation thread profile written to {simulation_path}")
+        elif self._sampler is not None:
+            self._sampler.stop()
+            path = os.path.join(self.directory, f"{self._label}-{stamp}.collapsed")
+            self._sampler.write(path)
+            self._sampler = None
+
+        print(f"Profile written to {path}")
+        return path
@@ -0,0 +1,218 @@
+import csv
+import json
+import os
+import time
+from array import array
+from typing import Dict, List, Tuple
+
+import pygame
+
+
+class RingBuffer:
+    """Fixed-capacity buffer of floats, overwriting the oldest value when full."""
+    def __init__(self, capacity: int, filled: int = 0):
+        self.capacity = capacity
+        self._data = array('d', [0.0] * capacity)
+        self._index = filled % capacity
+        self._count = min(filled, capacity)
+
+    def push(self, value: float):
+        self._data[self._index] = value
+        self._index = (self._index + 1) % self.capacity
+        if self._count < self.capacity:
+            self._count += 1
+
+    def values(self) -> List[float]:
+        """Return the stored values, oldest first."""
+        if self._count < self.capacity:
+            return self._data[:self._count].tolist()
+        return (self._data[self._index:] + self._data[:self._index]).tolist()
+
+    def latest(self) -> float:
+        if self._count == 0:
+            return 0.0
+        return self._data[self._index - 1]
+
+    def percentiles(self, *percents: float) -> Tuple[float, ...]:
+        values = sorted(self.values())
+        if not values:
+            return tuple(0.0 for _ in percents)
+        last = len(values) - 1
+        return tuple(values[min(last, int(round(p / 100.0 * last)))] for p in percents)
+
+    def __len__(self) -> int:
+        return self._count
+
+
+class FrameProfiler:
+    """Records per-frame phase durations and counters into ring buffers.
+
+    Game.run calls begin_frame(), then mark(phase) at the end of every phase, and
+    end_frame(). Phase durations are stored in milliseconds. Counters are recorded
+    with record(name, value). When disabled every call returns immediately; enabling
+    takes effect at the next begin_frame(), so no frame is measured from stale marks.
+    """
+
+    OVERLAY_REFRESH = 0.25  # Seconds between overlay text refreshes
+    OVERLAY_PADDING = 6
+
+    def __init__(self, capacity: int = 600, enabled: bool = False):
+        self.capacity = capacity
+        self.enabled = enabled
+        self.overlay_visible = False
+        self.phases: List[str] = []
+        self.counters: List[str] = []
+        self.series: Dict[str, RingBuffer] = {}
+        self.frame_count = 0
+
+        self._frame_starts = RingBuffer(capacity)
+        self._frame_start = 0.0
+        self._last_mark = 0.0
+        self._current: Dict[str, float] = {}
+        self._in_frame = False  # Between a begin_frame() and end_frame() while enabled
+
+        self._font: pygame.font.Font | None = None
+        self._overlay: pygame.Surface | None = None
+        self._overlay_time = float("-inf")
+
+    def toggle(self):
+        """Toggle profiling together with its overlay."""
+        self.enabled = not self.enabled
+        self.overlay_visible = self.enabled
+        self._in_frame = False
+
+    def begin_frame(self):
+        if not self.enabled:
+            return
+        self._frame_start = self._last_mark = time.perf_counter()
+        self._current.clear()
+        self._in_frame = True
+
+    def mark(self, phase: str):
+        """Record the time since the previous mark (or frame start) as phase."""
+        if not self._in_frame:
+            return
+        now = time.perf_counter()
+        self._current[phase] = self._current.get(phase, 0.0) + (now - self._last_mark) * 1000.0
+        self._last_mark = now
+        if phase not in self.series:
+            self.phases.append(phase)
+            self._add_series(phase)
+
+    def record(self, name: str, value: float):
+        """Record a per-frame counter such as entity or query counts."""
+        if not self._in_frame:
+            return
+        self._current[name] = value
+        if name not in self.series:
+            self.counters.append(name)
+            self._add_series(name)
+
+    def add(self, name: str, value: float):
+        """Accumulate into a per-frame counter, e.g. several GC pauses within one frame."""
+        if not self._in_frame:
+            return
+        self.record(name, self._current.get(name, 0.0) + value)
+
+    def end_frame(self):
+        if not self._in_frame:
+            return
+        self._in_frame = False
+        self._current["frame"] = (time.perf_counter() - self._frame_start) * 1000.0
+        if "frame" not in self.series:
+            self._add_series("frame")
+
+        for name, buffer in self.series.items():
+            buffer.push(self._current.get(name, 0.0))
+        self._frame_starts.push(self._frame_start)
+        self.frame_count += 1
+
+    def _add_series(self, name: str):
+        # Back-fill so every series stays aligned with the frame index
+        self.series[name] = RingBuffer(self.capacity, filled=self.frame_count)
+
+    # ------------------------------------------------------------------
+    # Overlay
+    # ------------------------------------------------------------------
+
+    def draw_overlay(self, surface: pygame.Surface):
+        if not self.overlay_visible:
+            return
+
+        now = time.perf_counter()
+        if self._overlay is None or now - self._overlay_time >= self.OVERLAY_REFRESH:
+            self._overlay = self._build_overlay()
+            self._overlay_time = now
+        surface.blit(self._overlay, (surface.get_width() - self._overlay.get_width() - self.OVERLAY_PADDING, self.OVERLAY_PADDING))
+
+    def _build_overlay(self) -> pygame.Surface:
+        if self._font is None:
+            self._font = pygame.font.Font(None, 18)
+
+        lines = ["phase          p50     p95     p99 (ms)"]
+        for name in self.phases + ["frame"]:
+            if name in self.series:
+                p50, p95, p99 = self.series[name].percentiles(50, 95, 99)
+                lines.append(f"{name:<12} {p50:7.2f} {p95:7.2f} {p99:7.2f}")
+        for name in self.counters:
+            lines.append(f"{name:<12} {self.series[name].latest():7.0f}")
+
+        line_height = self._font.get_linesize()
+        rendered = [self._font.render(line, True, (255, 255, 255)) for line in lines]
+        width = max(r.get_width() for r in rendered) + self.OVERLAY_PADDING * 2
+        height = line_height * len(rendered) + self.OVERLAY_PADDING * 2
+
+        overlay = pygame.Surface((width, height), pygame.SRCALPHA)
+        overlay.fill((0, 0, 0, 160))
+        for i, r in enumerate(rendered):
+            overlay.blit(r, (self.OVERLAY_PADDING, self.OVERLAY_PADDING + i * line_height))
+        return overlay
+
+    # ------------------------------------------------------------------
+    # Export
+    # ------------------------------------------------------------------
+
+    def export_csv(self, path: str):
+        """Write one row per recorded frame with every phase and counter."""
+        names = self.phases + ["frame"] + self.counters
+        columns = [self.series[name].values() if name in self.series else [] for name in names]
+        rows = len(self._frame_starts)
+
+        with open(path, "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(["frame_start"] + names)
+            starts = self._frame_starts.values()
+            for i in range(rows):
+                writer.writerow([f"{starts[i]:.6f}"] + [f"{column[i]:.4f}" if column else "" for column in columns])
+
+    def export_chrome_trace(self, path: str):
+        """Write the recorded frames as Chrome trace-event JSON (chrome://tracing, Perfetto)."""
+        starts = self._frame_starts.values()
+        phases = {name: self.series[name].values() for name in self.phases}
+        frames = self.series["frame"].values() if "frame" in self.series else []
+        counters = {name: self.series[name].values() for name in self.counters}
+
+        events = []
+        for i, start in enumerate(starts):
+            ts = start * 1_000_000.0
+            events.append({"name": "frame", "ph": "X", "ts": ts, "dur": frames[i] * 1000.0, "pid": 0, "tid": 0})
+            # Phases run back to back in the order they were first marked
+            offset = ts
+            for name, values in phases.items():
+                events.append({"name": name, "ph": "X", "ts": offset, "dur": values[i] * 1000.0, "pid": 0, "tid": 0})
+                offset += values[i] * 1000.0
+            for name, values in counters.items():
+                events.append({"name": name, "ph": "C", "ts": ts, "pid": 0, "args": {name: values[i]}})
+
+        with open(path, "w") as f:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f)
+
+    def export(self, directory: str = "profiles") -> Tuple[str, str]:
+        """Export both formats into directory, named by timestamp. Returns the written paths."""
+        os.makedirs(directory, exist_ok=True)
+        stamp = time.strftime("%Y%m%d-%H%M%S")
+        csv_path = os.path.join(directory, f"frames-{stamp}.csv")
+        trace_path = os.path.join(directory, f"frames-{stamp}.json")
+        self.export_csv(csv_path)
+        self.export_chrome_trace(trace_path)
+        return csv_path, trace_path
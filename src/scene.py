@@ -1,17 +1,20 @@
 from __future__ import annotations
 import pygame
-from typing import TYPE_CHECKING, List
+from typing import TYPE_CHECKING, Dict, List
 
 if TYPE_CHECKING:
     from main import Game
+    from scheduler import Scheduler
 
 
 class Scene:
     """Base scene API.
 
     Scenes receive:
+      - register_systems(scheduler)  # register fixed-rate systems when the scene becomes active
       - handle_events(events)
       - fixed_update(dt)    # called at a fixed timestep (game logic)
+      - before_steps(frame_time) / after_steps(dt)  # around each batch of fixed steps
       - update(dt)          # called once per frame for non-critical updates/animations
       - render(screen, alpha)  # render, alpha is interpolation factor [0..1]
     """
@@ -19,6 +22,10 @@ class Scene:
     def __init__(self, game: 'Game'):
         self.game = game
 
+    def register_systems(self, scheduler: 'Scheduler'):
+        """Register fixed-rate systems. By default the whole fixed_update runs at the global rate."""
+        scheduler.register("fixed_update", self.fixed_update, rate=1.0 / self.game.fixed_dt)
+
     def handle_events(self, events: List[pygame.event.Event]):
         pass
 
@@ -26,6 +33,18 @@ class Scene:
         """Deterministic logic — called from the global fixed-step loop."""
         pass
 
+    def before_steps(self, frame_time: float) -> float:
+        """
+        Called before each batch of fixed steps, e.g. to apply queued input. Returns the
+        time the batch simulates, normally frame_time (a replay returns the recorded one).
+        Runs on the simulation thread when it is enabled.
+        """
+        return frame_time
+
+    def after_steps(self, dt: float):
+        """Called after each batch of fixed steps covering dt seconds, e.g. to publish what render() draws. Runs on the simulation thread when it is enabled."""
+        pass
+
     def update(self, dt: float):
         """Frame-dependent updates (input smoothing, UI animations)."""
         pass
@@ -34,6 +53,15 @@ class Scene:
         """Draw the scene. alpha is interpolation fraction for rendering between fixed steps."""
         pass
 
+    def get_stats(self) -> Dict[str, float]:
+        """Per-frame counters shown by the profiler overlay (e.g. entity and query counts)."""
+        return {}
+
+    def get_capture_label(self) -> str:
+        """Name used for profile capture files started in this scene."""
+        return type(self).__name__
+
     def on_leave(self):
         """Called when the scene is being replaced."""
-        self.game.ui_manager.clear_and_reset()
\ No newline at end of file
+        if self.game.ui_loaded:
+            self.game.ui_manager.clear_and_reset()
\ No newline at end of file
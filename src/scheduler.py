@@ -0,0 +1,108 @@
+import time
+from typing import Callable, List
+
+
+class System:
+    """A subsystem stepped at its own fixed rate by the Scheduler."""
+    def __init__(
+        self,
+        name: str,
+        step: Callable[[float], None],
+        rate: float,
+        priority: int = 0,
+        budget: float | None = None,
+        max_lag: float = 0.25
+    ):
+        self.name = name
+        self.step = step
+        self.interval = 1.0 / rate
+        self.priority = priority
+        self.budget = budget    # seconds per frame, None for unlimited
+        # Cap on accumulated time to avoid a spiral of death; slow systems may hold two steps
+        self.max_lag = max(max_lag, 2 * self.interval)
+        self.accumulator = 0.0
+
+        # Stats for the last frame
+        self.steps_last_frame = 0
+        self.time_last_frame = 0.0
+        self.deferred_frames = 0
+
+    @property
+    def rate(self) -> float:
+        return 1.0 / self.interval
+
+
+class Scheduler:
+    """Runs registered systems at independent fixed rates, in priority order.
+
+    Lower priority values run first. Each system steps as many times as its
+    accumulated time allows. If a system overruns its per-frame time budget, its
+    remaining steps and every lower-priority system are deferred to the next frame;
+    their accumulated time is kept so the work is caught up later rather than lost.
+    """
+
+    def __init__(self):
+        self.systems: List[System] = []
+        # Off for deterministic runs: whether a budget is overrun depends on wall-clock time
+        self.budgets_enabled = True
+
+    def register(
+        self,
+        name: str,
+        step: Callable[[float], None],
+        rate: float,
+        priority: int = 0,
+        budget: float | None = None
+    ) -> System:
+        system = System(name, step, rate, priority, budget)
+        self.systems.append(system)
+        # Stable sort keeps registration order for equal priorities
+        self.systems.sort(key=lambda s: s.priority)
+        return system
+
+    def unregister(self, name: str):
+        self.systems = [s for s in self.systems if s.name != name]
+
+    def get(self, name: str) -> System | None:
+        for system in self.systems:
+            if system.name == name:
+                return system
+        return None
+
+    def clear(self):
+        self.systems.clear()
+        self.budgets_enabled = True
+
+    @property
+    def alpha(self) -> float:
+        """Interpolation factor [0..1] of the highest-priority system."""
+        if not self.systems:
+            return 1.0
+        primary = self.systems[0]
+        return min(primary.accumulator / primary.interval, 1.0)
+
+    def update(self, frame_time: float):
+        for system in self.systems:
+            system.accumulator = min(system.accumulator + frame_time, system.max_lag)
+
+        deferring = False
+        for system in self.systems:
+            system.steps_last_frame = 0
+            system.time_last_frame = 0.0
+            if deferring:
+                if system.accumulator >= system.interval:
+                    system.deferred_frames += 1
+                continue
+
+            start = time.perf_counter()
+            while system.accumulator >= system.interval:
+                system.step(system.interval)
+                system.accumulator -= system.interval
+                system.steps_last_frame += 1
+
+                system.time_last_frame = time.perf_counter() - start
+                if self.budgets_enabled and system.budget is not None and system.time_last_frame > system.budget:
+                    deferring = True
+                    if system.accumulator >= system.interval:
+                        system.deferred_frames += 1
+                    break
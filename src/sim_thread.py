@@ -0,0 +1,94 @@
+import sys
+import threading
+import time
+import traceback
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from main import Game
+
+
+class InstrumentedLock:
+    """A re-entrant lock that counts contended acquisitions and the time spent waiting on them."""
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self.acquisitions = 0
+        self.contended = 0
+        self.wait_time = 0.0  # seconds
+
+    def acquire(self, blocking: bool = True) -> bool:
+        if not self._lock.acquire(blocking=False):
+            self.contended += 1
+            if not blocking:
+                return False
+            start = time.perf_counter()
+            self._lock.acquire()
+            self.wait_time += time.perf_counter() - start
+        self.acquisitions += 1
+        return True
+
+    def release(self):
+        self._lock.release()
+
+    def __enter__(self) -> 'InstrumentedLock':
+        self.acquire()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.release()
+
+
+class SimulationThread:
+    """
+    Steps the current scene's fixed-rate systems on a worker thread at wall-clock pace.
+
+    Each batch (Scene.before_steps, Scheduler.update, Scene.after_steps) runs while
+    holding game.sim_lock; the main thread only handles events and renders what the
+    scene published. On free-threaded Python builds both threads run in parallel,
+    with the GIL they still interleave at the batch boundaries and during sleeps.
+    """
+
+    def __init__(self, game: 'Game'):
+        self.game = game
+        self.batches = 0
+        self.busy_time = 0.0  # seconds spent in batches
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def start(self):
+        gil = getattr(sys, "_is_gil_enabled", lambda: True)()
+        print(f"Simulation thread started ({'GIL enabled' if gil else 'free-threaded'})")
+        self._thread = threading.Thread(target=self._run, name="simulation", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _run(self):
+        game = self.game
+        last = time.perf_counter()
+        try:
+            while not self._stop.is_set():
+                start = time.perf_counter()
+                # Same clamp as the single-threaded loop, to avoid a spiral of death
+                frame_time = min(start - last, 0.25)
+                last = start
+                with game.sim_lock, game.capture.simulation_batch():
+                    scene = game.current_scene
+                    frame_time = scene.before_steps(frame_time)
+                    game.scheduler.update(frame_time)
+                    scene.after_steps(frame_time)
+                elapsed = time.perf_counter() - start
+                self.batches += 1
+                self.busy_time += elapsed
+
+                # Wait for the next step of the fastest system
+                if elapsed < game.fixed_dt and not game.fast_forward:
+                    time.sleep(game.fixed_dt - elapsed)
+        except Exception:
+            traceback.print_exc()
+            game.running = False
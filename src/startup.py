@@ -0,0 +1,66 @@
+import os
+import time
+from typing import List, Tuple
+
+
+def _process_age() -> float | None:
+    """Seconds since the OS started this process, where the platform exposes it (Linux)."""
+    try:
+        with open("/proc/self/stat") as f:
+            stat = f.read()
+        with open("/proc/uptime") as f:
+            uptime = float(f.read().split()[0])
+    except (OSError, ValueError):
+        return None
+    # The command name may contain spaces, the fields after it are fixed; starttime is field 22
+    start_ticks = int(stat.rsplit(")", 1)[1].split()[19])
+    return max(0.0, uptime - start_ticks / os.sysconf("SC_CLK_TCK"))
+
+
+class StartupTimeline:
+    """
+    Wall-clock phases from process start to the first presented frame.
+
+    The timeline starts when this module is imported, which main.py does first.
+    Time spent before that (interpreter start-up) is measured from the process start
+    time where available. Phases are recorded with mark(phase) at the end of each
+    phase, and finish() closes the timeline; later marks are ignored. finished_at is
+    the wall-clock time (time.time()) of finish(), e.g. for a launching process.
+    """
+
+    def __init__(self):
+        self.start = time.perf_counter()
+        self.phases: List[Tuple[str, float]] = []
+        self.finished = False
+        self.finished_at: float | None = None
+        self._last = self.start
+
+        age = _process_age()
+        if age is not None:
+            self.phases.append(("interpreter", age * 1000.0))
+
+    def mark(self, phase: str):
+        if self.finished:
+            return
+        now = time.perf_counter()
+        self.phases.append((phase, (now - self._last) * 1000.0))
+        self._last = now
+
+    def finish(self, phase: str = "first_frame"):
+        self.mark(phase)
+        self.finished = True
+        self.finished_at = time.time()
+
+    @property
+    def total_ms(self) -> float:
+        return sum(ms for _, ms in self.phases)
+
+    def format(self) -> str:
+        lines = ["startup phase          ms"]
+        for phase, ms in self.phases:
+            lines.append(f"{phase:<18} {ms:7.1f}")
+        lines.append(f"{'total':<18} {self.total_ms:7.1f}")
+        return "\n".join(lines)
+
+
+TIMELINE = StartupTimeline()
@@ -1,6 +1,11 @@
 from .scene import WorldScene, WorldSettings
+from .loading_scene import LoadingScene
+from .replay import InputRecorder, InputReplay
 
 __all__ = [
     "WorldScene",
     "WorldSettings",
+    "LoadingScene",
+    "InputRecorder",
+    "InputReplay",
 ]
\ No newline at end of file
@@ -0,0 +1,20 @@
+from dataclasses import dataclass
+
+MOVE = "move"    # value: held movement keys, MOVE_* bits
+CLICK = "click"  # x, y: clicked world position
+ZOOM = "zoom"    # value: zoom levels to step, in (positive) or out (negative)
+
+# Movement key bits, combined in MOVE commands and input recordings
+MOVE_LEFT = 1
+MOVE_RIGHT = 2
+MOVE_UP = 4
+MOVE_DOWN = 8
+
+
+@dataclass(frozen=True)
+class InputCommand:
+    """Player input, forwarded from the event loop to the simulation through a queue."""
+    kind: str
+    x: float = 0.0
+    y: float = 0.0
+    value: int = 0
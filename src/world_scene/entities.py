@@ -1,19 +1,19 @@
 from .player import Player
 from .world_core import Entity
-import time
-import random
 
 
 class Chest(Entity):
+    # Image paths by state, shared by every instance
+    IMAGES = {
+        "closed": "textures/entities/chest_closed0.png",
+        "open": "textures/entities/chest_open0.png"
+    }
+
     def __init__(self, x: float, y: float):
-        images = {
-            "closed": "textures/entities/chest_closed0.png",
-            "open": "textures/entities/chest_open0.png"
-        }
-        super().__init__(x, y, 32, 32, images)
+        super().__init__(x, y, 32, 32, self.IMAGES)
         self.set_image_state("closed")
         self.is_open = False
-        self.delay = 0.0 # Delay in seconds before it can be opened again
+        self.delay = 0.0 # World time at which it closes and can be opened again, 0 while closed
 
     def interact(self, player: 'Player'):
         if self.world is None:
@@ -24,56 +24,61 @@ class Chest(Entity):
             if not self.is_open and self.delay <= 0:
                 self.is_open = True
                 self.set_image_state("open")
-                self.delay = time.time() + 10.0  # 10 second delay before it can be opened again
+                self.delay = self.world.time + 10.0  # 10 second delay before it can be opened again
 
                 # Give player random points between 3 and 15
-                points = random.randint(3, 15)
+                points = self.world.rng.randint(3, 15)
                 player.points += points
                 self.world.log.add(f"You found {points} points in the chest!")
+                self.emit_effect("chest")
         else:
             self.world.log.add("Too far to interact with the chest.")
 
     def tick(self, dt: float):
         super().tick(dt)
-        if self.is_open and time.time() >= self.delay:
+        if self.is_open and self.world is not None and self.world.time >= self.delay:
             self.is_open = False
             self.set_image_state("closed")
             self.delay = 0.0
         
 
 class Tree(Entity):
+    IMAGES = {
+        "default": "textures/entities/jungle_tree0.png"
+    }
+
     def __init__(self, x: float, y: float):
-        images = {
-            "default": "textures/entities/jungle_tree0.png"
-        }
-        super().__init__(x, y, 64, 64, images)
+        super().__init__(x, y, 64, 64, self.IMAGES)
         self.set_image_state("default")
 
 
 class Zombie(Entity):
+    ANIMATION = "zombie"
+    WANDER_RATE = 6.0  # Expected direction changes per second
+    ATTACK_RATE = 3.0  # Expected attack attempts per second
+    IMAGES = {
+        "default": "textures/entities/zombie0.png"
+    }
+
     def __init__(self, x: float, y: float):
-        images = {
-            "default": "textures/entities/zombie0.png"
-        }
-        super().__init__(x, y, 32, 64, images)
+        super().__init__(x, y, 32, 64, self.IMAGES)
         self.set_image_state("default")
         self.health = 100
         self.max_health = 100
 
-    def tick(self, dt: float):
-        super().tick(dt)
-
+    def think(self, dt: float):
+        """AI decisions, stepped at the AI rate. Chances scale with dt so any rate behaves alike."""
         if not self.world:
             return
 
         # Simple random movement logic
-        import random
-        if random.random() < 0.1:
-            self.set_velocity(random.uniform(-3, 3), random.uniform(-3, 3))
+        rng = self.world.rng
+        if rng.random() < self.WANDER_RATE * dt:
+            self.set_velocity(rng.uniform(-3, 3), rng.uniform(-3, 3))
 
         # Simple attack logic here
 
-        if random.random() < 0.05:
+        if rng.random() < self.ATTACK_RATE * dt:
             res = self.world.entities_in_radius(self.pos[0], self.pos[1], 2, excluded=[Zombie])
             for entity in res:
                 if isinstance(entity, Player):
@@ -81,14 +86,13 @@ class Zombie(Entity):
 
     def take_damage(self, amount: float, attacker: 'Entity | None' = None):
         super().take_damage(amount, attacker=attacker)
-        if isinstance(attacker, Player):
+        self.emit_effect("hit" if self.health > 0 else "death")
+        if isinstance(attacker, Player) and self.world:
             if self.health > 0:
-                points = random.randint(10, 20)
+                points = self.world.rng.randint(10, 20)
                 attacker.points += points
-                if self.world:
-                    self.world.log.add(f"The zombie was damaged! +{points} points")
+                self.world.log.add(f"The zombie was damaged! +{points} points")
             else:
-                points = random.randint(20, 40)
+                points = self.world.rng.randint(20, 40)
                 attacker.points += points
-                if self.world:
-                    self.world.log.add(f"The zombie was defeated! +{points} points")
+                self.world.log.add(f"The zombie was defeated! +{points} points")
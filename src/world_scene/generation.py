@@ -0,0 +1,161 @@
+import math
+import random
+import sys
+from array import array
+from typing import Dict, List, Tuple
+
+from .world_core import Entity, Tile, World
+from .world_core.chunks import CHUNK_SIZE, Chunk
+from .entities import Chest, Tree
+
+# Global tiles
+GRASS = Tile("grass", "textures/tiles/grass0.png")
+DIRT = Tile("dirt", "textures/tiles/dirt0.png")
+# Tiles by name, used to resolve tiles read from saves
+TILES: Dict[str, Tile] = {tile.name: tile for tile in (GRASS, DIRT)}
+
+# Noise scales in tiles per lattice cell
+BIOME_SCALE = 64
+DETAIL_SCALE = 8
+FOREST_SCALE = 24
+# Cells below this blend of biome and detail noise are dirt
+DIRT_LEVEL = 0.38
+
+TREE_CHANCE = 0.1    # Average chance of a tree on a grass cell, scaled by forest noise
+CHEST_CHANCE = 0.005
+# Tiles around the origin kept clear so the player never spawns inside a tree
+SPAWN_CLEARING = 2
+
+# Per-cell rolls are 16 bit, probabilities are compared against them as thresholds
+ROLL_RANGE = 0x10000
+
+
+def _fade(t: float) -> float:
+    return t * t * (3.0 - 2.0 * t)
+
+
+class ValueNoise:
+    """
+    Seeded 2D value noise: hashed random values on an integer lattice every `scale`
+    tiles, smoothly interpolated in between. Values are in [0, 1].
+    """
+
+    def __init__(self, seed: int, scale: float):
+        self.seed = seed & 0xFFFFFFFF
+        self.scale = scale
+
+    def lattice(self, ix: int, iy: int) -> float:
+        h = (ix * 374761393 + iy * 668265263 + self.seed * 2246822519) & 0xFFFFFFFF
+        h = ((h ^ (h >> 13)) * 1274126177) & 0xFFFFFFFF
+        return (h ^ (h >> 16)) / 0xFFFFFFFF
+
+    def region(self, min_x: int, min_y: int, width: int, height: int) -> List[float]:
+        """Return the noise of a row-major block of tiles, a whole row at a time."""
+        xs = [(min_x + i) / self.scale for i in range(width)]
+        ixs = [math.floor(x) for x in xs]
+        txs = [_fade(x - ix) for x, ix in zip(xs, ixs)]
+        base = ixs[0]
+        span = range(base, ixs[-1] + 2)
+        # Offsets into the lattice row for every column
+        columns = [ix - base for ix in ixs]
+
+        values: List[float] = []
+        row_iy = None
+        top: List[float] = []
+        bottom: List[float] = []
+        for j in range(height):
+            y = (min_y + j) / self.scale
+            iy = math.floor(y)
+            if iy != row_iy:
+                top = [self.lattice(ix, iy) for ix in span]
+                bottom = [self.lattice(ix, iy + 1) for ix in span]
+                row_iy = iy
+            ty = _fade(y - iy)
+            # Interpolate the lattice row vertically once, then every column horizontally
+            row = [t + (b - t) * ty for t, b in zip(top, bottom)]
+            values.extend(row[c] + (row[c + 1] - row[c]) * tx for c, tx in zip(columns, txs))
+        return values
+
+
+class ChunkGenerator:
+    """
+    Generates chunks deterministically from the world seed and chunk coordinates.
+
+    Tiles come from biome and detail noise, tree density from forest noise, all
+    computed for the whole chunk at once. Each chunk draws its per-cell rolls from
+    its own RNG in one call, and static entities are only checked for overlap against
+    an occupancy grid of their own chunk (trees never cross the chunk edge), so the
+    result does not depend on which chunks were generated before.
+    """
+
+    def __init__(self, seed: int):
+        self.seed = seed
+        self.biome = ValueNoise(seed, BIOME_SCALE)
+        self.detail = ValueNoise(seed + 1, DETAIL_SCALE)
+        self.forest = ValueNoise(seed + 2, FOREST_SCALE)
+
+    def rng_for(self, cx: int, cy: int) -> random.Random:
+        # String seeds are hashed deterministically, unlike hash() of str
+        return random.Random(f"{self.seed}:{cx}:{cy}")
+
+    def rolls(self, rng: random.Random, count: int) -> array:
+        """Draw count 16 bit rolls in one call."""
+        rolls = array('H')
+        rolls.frombytes(rng.randbytes(count * rolls.itemsize))
+        if sys.byteorder != "little":
+            rolls.byteswap()
+        return rolls
+
+    def generate_tiles(self, min_x: int, min_y: int) -> Tuple[List[Tile], List[float]]:
+        """Return the chunk's row-major tiles and tree chances (0 where no tree can grow)."""
+        biome = self.biome.region(min_x, min_y, CHUNK_SIZE, CHUNK_SIZE)
+        detail = self.detail.region(min_x, min_y, CHUNK_SIZE, CHUNK_SIZE)
+        forest = self.forest.region(min_x, min_y, CHUNK_SIZE, CHUNK_SIZE)
+
+        tiles = [DIRT if b * 0.7 + d * 0.3 < DIRT_LEVEL else GRASS for b, d in zip(biome, detail)]
+        tree_chances = [
+            TREE_CHANCE * 2.0 * f if tile is GRASS else 0.0
+            for tile, f in zip(tiles, forest)
+        ]
+        return tiles, tree_chances
+
+    def generate(self, world: World, chunk: Chunk) -> List[Entity]:
+        min_x, min_y, _, _ = chunk.bounds
+        tiles, tree_chances = self.generate_tiles(min_x, min_y)
+        # All tiles of the chunk are written as one block
+        world.get_tile_map().write_region(min_x, min_y, CHUNK_SIZE, tiles)
+
+        cells = CHUNK_SIZE * CHUNK_SIZE
+        rng = self.rng_for(chunk.cx, chunk.cy)
+        tree_rolls = self.rolls(rng, cells)
+        chest_rolls = self.rolls(rng, cells)
+        chest_threshold = int(CHEST_CHANCE * ROLL_RANGE)
+
+        # Trees need their whole 2x2 footprint inside the chunk
+        last = CHUNK_SIZE - 1
+        trees = [
+            i for i, (chance, roll) in enumerate(zip(tree_chances, tree_rolls))
+            if roll < chance * ROLL_RANGE and i % CHUNK_SIZE < last and i // CHUNK_SIZE < last
+        ]
+        chests = [i for i, roll in enumerate(chest_rolls) if roll < chest_threshold]
+
+        # Resolve overlaps on a local occupancy grid: trees claim cells first, in cell order
+        occupied = bytearray(cells)
+        entities: List[Entity] = []
+        for candidates, footprint, make in (
+            (trees, (0, 1, CHUNK_SIZE, CHUNK_SIZE + 1), Tree),
+            (chests, (0,), Chest),
+        ):
+            for i in candidates:
+                x = min_x + i % CHUNK_SIZE
+                y = min_y + i // CHUNK_SIZE
+                if abs(x) <= SPAWN_CLEARING and abs(y) <= SPAWN_CLEARING:
+                    continue
+                if any(occupied[i + offset] for offset in footprint):
+                    continue
+                for offset in footprint:
+                    occupied[i + offset] = 1
+                entity = make(x, y)
+                entity.set_world(world)
+                entities.append(entity)
+        return entities
@@ -1,11 +1,26 @@
 from .log import MessageLog
 from .hud import HUD
+from .bindings import Binding, BindingGroup
+from .animation import Animator
+from .camera import Camera, ZOOM_LEVELS
+from .texture_cache import TextureCache
+from .particles import ParticleSystem, EFFECTS
+from .minimap import Minimap
 from .renderer import Renderer, get_screen_bounds, screen_to_world, world_to_screen
 
 
 __all__ = [
     'MessageLog',
     'HUD',
+    'Binding',
+    'BindingGroup',
+    'Animator',
+    'Camera',
+    'ZOOM_LEVELS',
+    'TextureCache',
+    'ParticleSystem',
+    'EFFECTS',
+    'Minimap',
     'Renderer',
     'get_screen_bounds',
     'screen_to_world',
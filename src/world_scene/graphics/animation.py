@@ -0,0 +1,140 @@
+from typing import TYPE_CHECKING, Dict, Iterable, List, Sequence, Tuple
+
+import pygame
+
+if TYPE_CHECKING:
+    from assets import AssetManager
+    from ..world_core import Entity
+
+
+class AnimationDef:
+    """
+    One animation of a sprite sheet. The sheet is cut into frame_size cells, numbered
+    left to right, top to bottom; frames lists the cells to play. offsets optionally
+    shifts each frame when drawn (e.g. a walking bob), and flip mirrors the frames
+    horizontally for the left-facing variant.
+    """
+    def __init__(
+        self,
+        sheet: str,
+        frame_size: Tuple[int, int],
+        frames: Sequence[int],
+        fps: float,
+        offsets: Sequence[Tuple[int, int]] | None = None,
+        flip: bool = False
+    ):
+        self.sheet = sheet
+        self.frame_size = frame_size
+        self.frames = list(frames)
+        self.fps = fps
+        self.offsets = list(offsets) if offsets else [(0, 0)] * len(self.frames)
+        self.flip = flip
+
+
+def _cycle(sheet: str, frame_size: Tuple[int, int], walk_frames: Sequence[int], idle_frames: Sequence[int]) -> Dict[str, AnimationDef]:
+    # The current sheets hold a single frame, so the walk cycle is that frame with a bob
+    walk_bob = [(0, 0), (0, -2), (0, 0), (0, -2)]
+    walk_offsets = [walk_bob[i % len(walk_bob)] for i in range(len(walk_frames))]
+    return {
+        "idle_right": AnimationDef(sheet, frame_size, idle_frames, fps=2.0),
+        "idle_left": AnimationDef(sheet, frame_size, idle_frames, fps=2.0, flip=True),
+        "walk_right": AnimationDef(sheet, frame_size, walk_frames, fps=8.0, offsets=walk_offsets),
+        "walk_left": AnimationDef(sheet, frame_size, walk_frames, fps=8.0, offsets=walk_offsets, flip=True),
+    }
+
+
+# Animation sets by name, selected by an entity's ANIMATION class attribute
+ANIMATIONS: Dict[str, Dict[str, AnimationDef]] = {
+    "player": _cycle("textures/entities/player0.png", (48, 56), walk_frames=[0, 0, 0, 0], idle_frames=[0]),
+    "zombie": _cycle("textures/entities/zombie0.png", (32, 64), walk_frames=[0, 0, 0, 0], idle_frames=[0]),
+}
+
+
+class AnimationClip:
+    """The frames of one animation, sliced from the sheet once and shared by every entity playing it."""
+    def __init__(self, frames: List[pygame.Surface], offsets: List[Tuple[int, int]], fps: float, facing_left: bool):
+        self.frames = frames
+        self.offsets = offsets
+        self.fps = fps
+        self.facing_left = facing_left
+
+
+class Animator:
+    """
+    Plays sprite animations for every entity whose class sets ANIMATION.
+
+    Entities only carry an animation id (an index into clips) and a phase in frames.
+    update() advances all of them in one pass and picks idle or walk clips from
+    their velocity. Frames are subsurfaces of the sheet (mirrored copies for left
+    facing clips) built once per clip, so any number of entities adds no surfaces.
+    """
+
+    def __init__(self, asset_manager: 'AssetManager'):
+        self.asset_manager = asset_manager
+        self.clips: List[AnimationClip] = [AnimationClip([], [], 0.0, False)]  # id 0: not animated
+        self._ids: Dict[Tuple[str, str], int] = {}
+        self._sheets: Dict[Tuple[str, Tuple[int, int]], List[pygame.Surface]] = {}
+        # Build every clip now, on the thread that draws: flipping frames locks their sheet,
+        # which must not happen on the simulation thread while a frame of it is being blitted
+        for animation, states in ANIMATIONS.items():
+            for state in states:
+                self.clip_id(animation, state)
+
+    def _slice(self, sheet: str, frame_size: Tuple[int, int]) -> List[pygame.Surface]:
+        key = (sheet, frame_size)
+        cells = self._sheets.get(key)
+        if cells is None:
+            image = self.asset_manager.try_get_image(sheet)
+            width, height = frame_size
+            columns = max(1, image.get_width() // width)
+            rows = max(1, image.get_height() // height)
+            cells = [
+                image.subsurface(pygame.Rect(column * width, row * height, min(width, image.get_width()), min(height, image.get_height())))
+                for row in range(rows) for column in range(columns)
+            ]
+            self._sheets[key] = cells
+        return cells
+
+    def clip_id(self, animation: str, state: str) -> int:
+        """Return the id of an animation clip, building its frames on first use."""
+        key = (animation, state)
+        clip_id = self._ids.get(key)
+        if clip_id is None:
+            definition = ANIMATIONS[animation][state]
+            cells = self._slice(definition.sheet, definition.frame_size)
+            frames = [cells[i % len(cells)] for i in definition.frames]
+            if definition.flip:
+                # Mirrored once per distinct cell, shared between its frames
+                mirrored = {id(cell): pygame.transform.flip(cell, True, False) for cell in frames}
+                frames = [mirrored[id(cell)] for cell in frames]
+            self.clips.append(AnimationClip(frames, definition.offsets, definition.fps, definition.flip))
+            clip_id = len(self.clips) - 1
+            self._ids[key] = clip_id
+        return clip_id
+
+    def update(self, entities: Iterable['Entity'], dt: float):
+        clips = self.clips
+        for entity in entities:
+            animation = entity.ANIMATION
+            if animation is None:
+                continue
+
+            vx, vy = entity.velocity
+            current = clips[entity.anim_id]
+            if vx < 0:
+                facing_left = True
+            elif vx > 0:
+                facing_left = False
+            else:
+                facing_left = current.facing_left
+            moving = vx != 0 or vy != 0
+            state = ("walk_" if moving else "idle_") + ("left" if facing_left else "right")
+
+            clip_id = self._ids.get((animation, state))
+            if clip_id is None:
+                clip_id = self.clip_id(animation, state)
+            if clip_id != entity.anim_id:
+                entity.anim_id = clip_id
+                entity.anim_phase = 0.0
+                continue
+            entity.anim_phase = (entity.anim_phase + dt * current.fps) % len(current.frames)
@@ -0,0 +1,67 @@
+import time
+from typing import Any, Callable, List
+
+_UNSET = object()
+
+
+class Binding:
+    """Binds a UI widget to a value source, re-rendering only when the value changes.
+
+    If min_interval is set, the widget is refreshed at most once per min_interval
+    seconds even if the value keeps changing (e.g. a continuously filling progress bar).
+    """
+    def __init__(self, source: Callable[[], Any], apply: Callable[[Any], None], min_interval: float = 0.0):
+        self.source = source
+        self.apply = apply
+        self.min_interval = min_interval
+        self._value: Any = _UNSET
+        self._last_applied = float("-inf")
+
+    def refresh(self, now: float) -> bool:
+        """Poll the source and apply the value if it changed. Returns True if the widget was re-rendered."""
+        if now - self._last_applied < self.min_interval:
+            return False
+
+        value = self.source()
+        if value == self._value:
+            return False
+
+        self._value = value
+        self._last_applied = now
+        self.apply(value)
+        return True
+
+    def invalidate(self):
+        """Force the next refresh to re-apply the current value."""
+        self._value = _UNSET
+        self._last_applied = float("-inf")
+
+
+class BindingGroup:
+    """A set of bindings refreshed together, counting UI re-renders per second."""
+    def __init__(self):
+        self.bindings: List[Binding] = []
+        self.renders_per_second: float = 0.0
+        self._renders = 0
+        self._window_start = time.perf_counter()
+
+    def bind(self, source: Callable[[], Any], apply: Callable[[Any], None], min_interval: float = 0.0) -> Binding:
+        binding = Binding(source, apply, min_interval)
+        self.bindings.append(binding)
+        return binding
+
+    def update(self):
+        now = time.perf_counter()
+        for binding in self.bindings:
+            if binding.refresh(now):
+                self._renders += 1
+
+        elapsed = now - self._window_start
+        if elapsed >= 1.0:
+            self.renders_per_second = self._renders / elapsed
+            self._renders = 0
+            self._window_start = now
+
+    def invalidate(self):
+        for binding in self.bindings:
+            binding.invalidate()
@@ -0,0 +1,48 @@
+from typing import TYPE_CHECKING, Tuple
+
+from ..constants import TILE_SIZE
+
+if TYPE_CHECKING:
+    from main import Game
+    from ..world_core import Entity
+    from ..snapshot import RenderSnapshot
+
+# Zoom factors the camera snaps to. Every level maps a tile to a whole number of
+# pixels, so scaled textures tile seamlessly and can be cached per level.
+ZOOM_LEVELS: Tuple[float, ...] = (0.5, 0.625, 0.75, 0.875, 1.0, 1.25, 1.5, 1.75, 2.0, 2.5, 3.0)
+
+
+class Camera:
+    """The view onto the world: centred on a target (anything with a pos, e.g. an entity or a RenderSnapshot), scaled by a zoom level."""
+
+    def __init__(self, game: 'Game', target: 'Entity | RenderSnapshot', zoom: float = 1.0):
+        self.game = game
+        self.target = target
+        self.level = 0
+        self.set_zoom(zoom)
+        # Screen size in pixels the view covers; None follows the display. Replays pin it
+        # to the recorded size, since the simulated area is what is on screen.
+        self.view_size: Tuple[int, int] | None = None
+
+    @property
+    def size(self) -> Tuple[int, int]:
+        if self.view_size is not None:
+            return self.view_size
+        return self.game.display_width, self.game.display_height
+
+    @property
+    def zoom(self) -> float:
+        return ZOOM_LEVELS[self.level]
+
+    @property
+    def tile_pixels(self) -> int:
+        """On-screen size of one world unit in pixels."""
+        return round(TILE_SIZE * self.zoom)
+
+    def set_zoom(self, zoom: float):
+        """Snap to the zoom level closest to zoom."""
+        self.level = min(range(len(ZOOM_LEVELS)), key=lambda i: abs(ZOOM_LEVELS[i] - zoom))
+
+    def zoom_by(self, steps: int):
+        """Move steps levels in (positive) or out (negative), e.g. per mouse wheel notch."""
+        self.level = max(0, min(len(ZOOM_LEVELS) - 1, self.level + steps))
@@ -2,6 +2,8 @@ import pygame
 import pygame_gui
 from typing import TYPE_CHECKING
 
+from .bindings import BindingGroup
+
 if TYPE_CHECKING:
     from ..player import Player
     from ..waves import WaveManager
@@ -16,6 +18,7 @@ class HUD:
     WAVE_PANEL_WIDTH = 320
     WAVE_PANEL_HEIGHT = 80
     PADDING = 8
+    WAVE_PROGRESS_INTERVAL = 0.25  # Seconds between wave progress bar refreshes
 
     def __init__(
         self,
@@ -118,6 +121,14 @@ class HUD:
             object_id="#info_panel/centered_message"
         )
 
+        # Widgets are only re-rendered when their bound value changes
+        self.bindings = BindingGroup()
+        self.bindings.bind(self._get_health_percent, self._set_health_percent)
+        self.bindings.bind(lambda: self._player.points, lambda points: self.points_label.set_text(f"Points: {points}"))
+        self.bindings.bind(lambda: self._player.lives, lambda lives: self.lives_label.set_text(f"Lives: {lives}"))
+        self.bindings.bind(self._get_wave_number, self._set_wave_number)
+        self.bindings.bind(self._get_wave_progress, self._set_wave_progress, min_interval=self.WAVE_PROGRESS_INTERVAL)
+
     @property
     def player(self) -> "Player":
         return self._player
@@ -125,27 +136,42 @@ class HUD:
     @player.setter
     def player(self, value: "Player"):
         self._player = value
+        self.bindings.invalidate()
+
+    @property
+    def renders_per_second(self) -> float:
+        """Number of HUD widget re-renders over the last second."""
+        return self.bindings.renders_per_second
 
     def update(self):
         """Update HUD values from player state."""
-        # Update health bar
-        health_percent = self._player.health / self._player.max_health
+        self.bindings.update()
+
+    def _get_health_percent(self) -> float:
+        return self._player.health / self._player.max_health
+
+    def _set_health_percent(self, health_percent: float):
         self.health_bar.percent_full = health_percent
 
-        # Update labels
-        self.points_label.set_text(f"Points: {self._player.points}")
-        self.lives_label.set_text(f"Lives: {self._player.lives}")
+    def _get_wave_number(self) -> int | None:
+        if self.wave_manager.get_current_wave() and self.wave_manager.current_wave_index is not None:
+            return self.wave_manager.current_wave_index + 1
+        return None
 
-        # Update wave info
-        current_wave = self.wave_manager.get_current_wave()
-        if current_wave and self.wave_manager.current_wave_index is not None:
-            wave_number = self.wave_manager.current_wave_index + 1
+    def _set_wave_number(self, wave_number: int | None):
+        # Keep showing the last wave once all waves are done
+        if wave_number is not None:
             self.wave_label.set_text(f"Wave: {wave_number}")
-            progress = self.wave_manager.get_current_progress()
-            if progress is not None:
-                self.wave_progress_bar.percent_full = progress
-            else:
-                self.wave_progress_bar.percent_full = 0.0
+
+    def _get_wave_progress(self) -> float | None:
+        if self._get_wave_number() is None:
+            return None
+        progress = self.wave_manager.get_current_progress()
+        return progress if progress is not None else 0.0
+
+    def _set_wave_progress(self, progress: float | None):
+        if progress is not None:
+            self.wave_progress_bar.percent_full = progress
 
     def handle_resize(self):
         """Handle window resize - HUD stays in top-left, no repositioning needed."""
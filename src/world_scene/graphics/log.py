@@ -1,38 +1,28 @@
 import pygame
 import pygame_gui
-from typing import List
+from collections import deque
+from typing import Deque, List
 
 
 class Message:
-    """Represents a single message in the log with its UI label."""
-    def __init__(
-        self,
-        manager: pygame_gui.UIManager,
-        container: pygame_gui.elements.UIPanel,
-        text: str,
-        y_position: int,
-        width: int
-    ):
+    """Represents a single message in the log, folding consecutive repeats into a count."""
+    def __init__(self, text: str):
         self.text: str = text
-        self.manager = manager
-        self.container = container
-
-        # Create a label for this message
-        self.label = pygame_gui.elements.UILabel(
-            relative_rect=pygame.Rect((5, y_position), (width - 10, 25)),
-            text=text,
-            manager=manager,
-            container=container,
-            object_id="#info_panel/message"
-        )
+        self.count: int = 1
 
-    def kill(self):
-        """Remove the UI element."""
-        self.label.kill()
+    @property
+    def display_text(self) -> str:
+        if self.count > 1:
+            return f"{self.text} ×{self.count}"
+        return self.text
 
 
 class MessageLog:
-    """A reusable message log for PyGame using pygame_gui, anchored to bottom-left."""
+    """A reusable message log for PyGame using pygame_gui, anchored to bottom-left.
+
+    Labels are created once and recycled. add() only records the message; the labels
+    are updated by flush(), which should be called once per frame.
+    """
 
     PANEL_WIDTH = 400
     PANEL_HEIGHT = 200
@@ -42,8 +32,9 @@ class MessageLog:
     def __init__(self, manager: pygame_gui.UIManager, screen_height: int, max_messages: int = 10):
         self.manager = manager
         self.max_messages: int = max_messages
-        self.messages: List[Message] = []
+        self.messages: Deque[Message] = deque(maxlen=max_messages)
         self.screen_height = screen_height
+        self._dirty = False
 
         # Create a panel at the bottom-left
         panel_y = screen_height - self.PANEL_HEIGHT - self.PADDING
@@ -53,30 +44,42 @@ class MessageLog:
             object_id="#info_panel",
         )
 
-    def add(self, text: str):
-        # Remove oldest message if at capacity
-        if len(self.messages) >= self.max_messages:
-            old_message = self.messages.pop(0)
-            old_message.kill()
+        # Fixed pool of labels, index 0 is the bottom (newest) slot
+        self._labels: List[pygame_gui.elements.UILabel] = []
+        for i in range(self.max_messages):
+            y_position = self.PANEL_HEIGHT - self.MESSAGE_HEIGHT - self.PADDING - (i * self.MESSAGE_HEIGHT)
+            label = pygame_gui.elements.UILabel(
+                relative_rect=pygame.Rect((5, y_position), (self.PANEL_WIDTH - 10, 25)),
+                text="",
+                manager=self.manager,
+                container=self.panel,
+                object_id="#info_panel/message"
+            )
+            label.hide()
+            self._labels.append(label)
 
-        # Calculate y position for new message (at the bottom of existing messages)
-        y_position = self.PANEL_HEIGHT - self.MESSAGE_HEIGHT - self.PADDING - (len(self.messages) * self.MESSAGE_HEIGHT)
+    def add(self, text: str):
+        # Fold repeats of the newest message instead of taking a new slot
+        if self.messages and self.messages[-1].text == text:
+            self.messages[-1].count += 1
+        else:
+            self.messages.append(Message(text))
+        self._dirty = True
 
-        message = Message(
-            manager=self.manager,
-            container=self.panel,
-            text=text,
-            y_position=y_position,
-            width=self.PANEL_WIDTH,
-        )
-        self.messages.append(message)
-        self._reposition_messages()
+    def flush(self):
+        """Apply pending messages to the label pool. Does nothing if the log is unchanged."""
+        if not self._dirty:
+            return
+        self._dirty = False
 
-    def _reposition_messages(self):
-        """Reposition all message labels from bottom to top."""
-        for i, message in enumerate(reversed(self.messages)):
-            y_position = self.PANEL_HEIGHT - self.MESSAGE_HEIGHT - self.PADDING - (i * self.MESSAGE_HEIGHT)
-            message.label.set_relative_position((5, y_position))
+        for i, label in enumerate(self._labels):
+            if i < len(self.messages):
+                # set_text is a no-op when the text is unchanged
+                label.set_text(self.messages[-1 - i].display_text)
+                if not label.visible:
+                    label.show()
+            elif label.visible:
+                label.hide()
 
     def handle_resize(self, screen_height: int):
         """Handle window resize by repositioning the panel."""
@@ -0,0 +1,151 @@
+import math
+from typing import TYPE_CHECKING, Dict, List, Sequence, Tuple
+
+import pygame
+
+from ..world_core.tiles import TILE_CHUNK_SIZE
+
+if TYPE_CHECKING:
+    from assets import AssetManager
+    from ..world_core import Entity, World
+
+BACKGROUND_COLOUR = (0, 0, 0)
+BORDER_COLOUR = (200, 200, 200)
+
+
+class Minimap:
+    """
+    Overview of the tiles and entities around a target entity, drawn in the top-right corner.
+
+    Tiles are kept as one 8-bit palettised surface per storage chunk, created from
+    the chunk's palette-index array in a single frombytes call; each tile type's
+    colour is the average colour of its texture. The TileMap region listener keeps
+    them current: single tile changes are patched in place through a PixelArray,
+    bulk writes (chunk generation and unloading) drop the affected chunk surfaces
+    to be rebuilt on demand.
+
+    refresh() composes the visible chunks and the entity markers into a back
+    surface and swaps it with surface. It is meant to run at its own low rate,
+    possibly on the simulation thread, while draw() only blits the front one.
+    Markers come from World.get_entities_of_type, which uses the world's type
+    index, so only the marked entity types are visited.
+    """
+
+    VIEW_TILES = 96  # Tiles across the map, centred on the target
+    SIZE = 144       # Side of the widget in pixels
+    PADDING = 8
+    MARKER_SIZE = 3
+
+    def __init__(
+        self,
+        world: 'World',
+        asset_manager: 'AssetManager',
+        target: 'Entity',
+        markers: Sequence[Tuple[type, Tuple[int, int, int]]]
+    ):
+        self.world = world
+        self.tile_map = world.get_tile_map()
+        self.asset_manager = asset_manager
+        self.target = target
+        self.markers = list(markers)  # (entity type, colour), later entries drawn on top
+        self.visible = True
+
+        self._colours: List[Tuple[int, int, int]] = [BACKGROUND_COLOUR]  # By palette index, 0 is no tile
+        self._chunks: Dict[Tuple[int, int], pygame.Surface] = {}
+        self._view = pygame.Surface((self.VIEW_TILES, self.VIEW_TILES))
+        self.surface = pygame.Surface((self.SIZE, self.SIZE))
+        self._back = pygame.Surface((self.SIZE, self.SIZE))
+
+        # Metrics
+        self.chunks_built = 0
+        self.tiles_patched = 0
+
+        self.tile_map.add_region_listener(self._on_tiles_changed)
+        self.refresh()
+
+    # ------------------------------------------------------------------
+    # Tile surfaces
+    # ------------------------------------------------------------------
+
+    def _sync_palette(self):
+        """Pick up tile types added to the TileMap palette since the last refresh."""
+        palette = self.tile_map.palette
+        if len(palette) + 1 == len(self._colours):
+            return
+        for tile in palette[len(self._colours) - 1:]:
+            colour = pygame.transform.average_color(self.asset_manager.try_get_image(tile.image))
+            self._colours.append((colour[0], colour[1], colour[2]))
+        colours = self._surface_palette()
+        for surface in self._chunks.values():
+            surface.set_palette(colours)
+
+    def _surface_palette(self) -> List[Tuple[int, int, int]]:
+        return self._colours[:256] + [BACKGROUND_COLOUR] * (256 - len(self._colours))
+
+    def _chunk_surface(self, cx: int, cy: int) -> pygame.Surface | None:
+        surface = self._chunks.get((cx, cy))
+        if surface is None:
+            indices = self.tile_map.get_chunk(cx, cy)
+            if indices is None:
+                return None
+            # More than 255 tile types only happens with a 16-bit TileMap; the extras draw as background
+            data = indices.tobytes() if indices.itemsize == 1 else bytes(i if i < 256 else 0 for i in indices)
+            surface = pygame.image.frombytes(data, (TILE_CHUNK_SIZE, TILE_CHUNK_SIZE), "P")
+            surface.set_palette(self._surface_palette())
+            self._chunks[(cx, cy)] = surface
+            self.chunks_built += 1
+        return surface
+
+    def _on_tiles_changed(self, min_x: int, min_y: int, max_x: int, max_y: int):
+        if max_x - min_x == 1 and max_y - min_y == 1:
+            surface = self._chunks.get((min_x // TILE_CHUNK_SIZE, min_y // TILE_CHUNK_SIZE))
+            index = self.tile_map.read_region(min_x, min_y, max_x, max_y)[0]
+            if surface is not None and index < len(self._colours):
+                with pygame.PixelArray(surface) as pixels:
+                    pixels[min_x % TILE_CHUNK_SIZE, min_y % TILE_CHUNK_SIZE] = index
+                self.tiles_patched += 1
+                return
+
+        for cy in range(min_y // TILE_CHUNK_SIZE, (max_y - 1) // TILE_CHUNK_SIZE + 1):
+            for cx in range(min_x // TILE_CHUNK_SIZE, (max_x - 1) // TILE_CHUNK_SIZE + 1):
+                self._chunks.pop((cx, cy), None)
+
+    # ------------------------------------------------------------------
+    # Drawing
+    # ------------------------------------------------------------------
+
+    def refresh(self):
+        """Recompose the map around the target. Throttled by the caller."""
+        self._sync_palette()
+        view = self._view
+        view.fill(BACKGROUND_COLOUR)
+        half = self.VIEW_TILES // 2
+        left = math.floor(self.target.pos[0]) - half
+        top = math.floor(self.target.pos[1]) - half
+        right = left + self.VIEW_TILES
+        bottom = top + self.VIEW_TILES
+        for cy in range(top // TILE_CHUNK_SIZE, (bottom - 1) // TILE_CHUNK_SIZE + 1):
+            for cx in range(left // TILE_CHUNK_SIZE, (right - 1) // TILE_CHUNK_SIZE + 1):
+                surface = self._chunk_surface(cx, cy)
+                if surface is not None:
+                    view.blit(surface, (cx * TILE_CHUNK_SIZE - left, cy * TILE_CHUNK_SIZE - top))
+        back = self._back
+        pygame.transform.scale(view, (self.SIZE, self.SIZE), back)
+
+        # Markers are drawn after scaling so they stay crisp
+        scale = self.SIZE / self.VIEW_TILES
+        offset = self.MARKER_SIZE // 2
+        for entity_type, colour in self.markers:
+            for entity in self.world.get_entities_of_type(entity_type):
+                x, y = entity.pos
+                if left <= x < right and top <= y < bottom:
+                    back.fill(colour, (
+                        int((x - left) * scale) - offset, int((y - top) * scale) - offset,
+                        self.MARKER_SIZE, self.MARKER_SIZE
+                    ))
+        pygame.draw.rect(back, BORDER_COLOUR, back.get_rect(), 1)
+        self.surface, self._back = back, self.surface
+
+    def draw(self, screen: pygame.Surface):
+        if self.visible:
+            screen.blit(self.surface, (screen.get_width() - self.SIZE - self.PADDING, self.PADDING))
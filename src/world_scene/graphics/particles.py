@@ -0,0 +1,185 @@
+import random
+from array import array
+from collections import deque
+from typing import TYPE_CHECKING, Deque, Dict, List, Sequence, Tuple
+
+import pygame
+
+if TYPE_CHECKING:
+    from .camera import Camera
+
+# Particle colours; particles store an index into this list
+PALETTE: List[Tuple[int, int, int]] = [
+    (120, 0, 0),      # 0 dark red
+    (200, 20, 20),    # 1 red
+    (255, 215, 0),    # 2 gold
+    (255, 250, 180),  # 3 pale yellow
+    (90, 110, 60),    # 4 rotten green
+]
+
+# Sprite side in pixels at zoom 1, from freshly spawned to about to expire
+SIZES = (4, 3, 2)
+MAX_SPRITE_SIZE = 12
+
+
+class EffectDef:
+    """A burst of particles: count particles in random directions, colours picked from colours."""
+    def __init__(
+        self,
+        count: int,
+        colours: Sequence[int],
+        speed: Tuple[float, float],
+        lifetime: Tuple[float, float],
+        gravity: float = 0.0
+    ):
+        self.count = count
+        self.colours = list(colours)
+        self.speed = speed          # World units per second
+        self.lifetime = lifetime    # Seconds
+        self.gravity = gravity      # World units per second squared, positive is down
+
+
+EFFECTS: Dict[str, EffectDef] = {
+    "hit": EffectDef(10, [0, 1], speed=(2.0, 5.0), lifetime=(0.25, 0.5), gravity=12.0),
+    "death": EffectDef(28, [0, 1, 4], speed=(1.5, 6.0), lifetime=(0.4, 0.9), gravity=10.0),
+    "chest": EffectDef(18, [2, 3], speed=(1.0, 3.5), lifetime=(0.5, 1.0), gravity=-2.0),
+}
+
+
+class ParticleSystem:
+    """
+    Short-lived visual particles with a fixed capacity.
+
+    Particles live in preallocated parallel arrays (position, velocity, gravity,
+    remaining and total lifetime, colour index) used as a ring buffer: a burst
+    writes at the cursor and, once the system is full, overwrites the oldest
+    particles, so bursts never allocate and update/draw cost is bounded by the
+    capacity. update() advances every particle in one pass, draw() submits them
+    in a single fblits batch using a small cache of square sprites per colour
+    and size.
+
+    Particles are purely cosmetic and use their own random generator, so
+    emitting them never changes the simulation's random sequence. burst() only
+    queues the request and update() spawns the particles, so the simulation can
+    request effects from its own thread.
+    """
+
+    def __init__(self, capacity: int = 1024, seed: int | None = None):
+        self.capacity = capacity
+        zeros = bytes(4 * capacity)
+        self.x = array('f', zeros)
+        self.y = array('f', zeros)
+        self.vx = array('f', zeros)
+        self.vy = array('f', zeros)
+        self.gravity = array('f', zeros)
+        self.life = array('f', zeros)       # Remaining seconds, <= 0 when dead
+        self.lifetime = array('f', zeros)
+        self.colour = array('B', bytes(capacity))
+
+        self.used = 0       # Slots [0, used) have been written since the system was last empty
+        self.cursor = 0     # Next slot to write, the oldest particle once full
+        self.alive = 0
+        self.random = random.Random(seed)
+        self._sprites: Dict[Tuple[int, int], pygame.Surface] = {}
+        self._batch: List[Tuple[pygame.Surface, Tuple[int, int]]] = []
+        self._requests: Deque[Tuple[str, float, float]] = deque()
+
+    def __len__(self) -> int:
+        return self.alive
+
+    def burst(self, effect: str, x: float, y: float):
+        """Emit the particles of an effect at world position (x, y) on the next update()."""
+        self._requests.append((effect, x, y))
+
+    def _emit(self, effect: str, x: float, y: float):
+        definition = EFFECTS[effect]
+        rand = self.random.random
+        capacity = self.capacity
+        min_speed, max_speed = definition.speed
+        min_life, max_life = definition.lifetime
+        colours = definition.colours
+        for _ in range(min(definition.count, capacity)):
+            i = self.cursor
+            # Random direction from a point in the unit square, normalised
+            dx = rand() * 2.0 - 1.0
+            dy = rand() * 2.0 - 1.0
+            length = (dx * dx + dy * dy) ** 0.5 or 1.0
+            speed = min_speed + (max_speed - min_speed) * rand()
+            life = min_life + (max_life - min_life) * rand()
+            if self.life[i] <= 0.0:
+                self.alive += 1
+            self.x[i] = x
+            self.y[i] = y
+            self.vx[i] = dx / length * speed
+            self.vy[i] = dy / length * speed
+            self.gravity[i] = definition.gravity
+            self.life[i] = life
+            self.lifetime[i] = life
+            self.colour[i] = colours[int(rand() * len(colours))]
+            self.cursor = (i + 1) % capacity
+            if self.used < capacity:
+                self.used += 1
+
+    def update(self, dt: float):
+        requests = self._requests
+        while requests:
+            self._emit(*requests.popleft())
+
+        xs, ys, vxs, vys = self.x, self.y, self.vx, self.vy
+        gravity, lives = self.gravity, self.life
+        alive = 0
+        for i in range(self.used):
+            life = lives[i]
+            if life <= 0.0:
+                continue
+            life -= dt
+            lives[i] = life
+            if life <= 0.0:
+                continue
+            vy = vys[i] + gravity[i] * dt
+            vys[i] = vy
+            xs[i] += vxs[i] * dt
+            ys[i] += vy * dt
+            alive += 1
+        self.alive = alive
+        if alive == 0:
+            # Start over at slot 0 so idle updates skip the whole buffer
+            self.used = 0
+            self.cursor = 0
+
+    def _sprite(self, colour: int, size: int) -> pygame.Surface:
+        key = (colour, size)
+        sprite = self._sprites.get(key)
+        if sprite is None:
+            sprite = pygame.Surface((size, size))
+            sprite.fill(PALETTE[colour])
+            self._sprites[key] = sprite
+        return sprite
+
+    def draw(self, screen: pygame.Surface, camera: 'Camera'):
+        if not self.alive:
+            return
+        tile_pixels = camera.tile_pixels
+        zoom = camera.zoom
+        origin_x = camera.size[0] // 2 - int(camera.target.pos[0] * tile_pixels)
+        origin_y = camera.size[1] // 2 - int(camera.target.pos[1] * tile_pixels)
+        sizes = [max(1, min(MAX_SPRITE_SIZE, round(size * zoom))) for size in SIZES]
+        last_bucket = len(sizes) - 1
+
+        sprite = self._sprite
+        xs, ys, lives, lifetimes, colours = self.x, self.y, self.life, self.lifetime, self.colour
+        batch = self._batch
+        batch.clear()
+        for i in range(self.used):
+            life = lives[i]
+            if life <= 0.0:
+                continue
+            # Particles shrink as they age
+            bucket = last_bucket - int(life / lifetimes[i] * last_bucket + 0.5)
+            size = sizes[bucket]
+            half = size // 2
+            batch.append((
+                sprite(colours[i], size),
+                (int(xs[i] * tile_pixels) + origin_x - half, int(ys[i] * tile_pixels) + origin_y - half)
+            ))
+        screen.fblits(batch)
@@ -1,117 +1,171 @@
-from typing import TYPE_CHECKING, Tuple
+from collections import deque
+from typing import TYPE_CHECKING, Deque, List, Tuple
 
 import pygame
-from ..constants import TILE_SIZE
+from ..world_core.tiles import TILE_CHUNK_SIZE
+from ..snapshot import NO_HEALTH_BAR, RenderSnapshot, SpriteTable
+from .animation import Animator
+from .camera import Camera
+from .particles import ParticleSystem
+from .texture_cache import TextureCache
 
 if TYPE_CHECKING:
     from main import Game
-    from ..player import Player
     from ..world_core import World
 
 
 class Renderer:
+    """
+    Draws RenderSnapshots: the tile map around the snapshot's focus, its entities and
+    the particles, and can run while the simulation steps on another thread.
+
+    Entities come from the snapshot. Tiles do not: pre-rendering a chunk reads the
+    live TileMap arrays (see TextureCache.chunk), which the simulation thread may be
+    writing, generating or unloading at the same moment. Such a pre-render can show
+    the chunk from just before the change; it is not kept, since every change is
+    queued by the region listener and drops the affected chunks on the next render.
+    A chunk unloaded meanwhile is drawn once more from the pre-render, then dropped.
+    """
     def __init__(
             self,
             game: 'Game',
-            player: 'Player',
+            camera: Camera,
             world: 'World'
         ):
         self.game = game
-        self.player = player
+        self.camera = camera
         self.world = world
+        self.animator = Animator(game.asset_manager)
+        self.sprites = SpriteTable()
+        self.textures = TextureCache(game.asset_manager)
+        self.particles = ParticleSystem()
+        # The view follows the drawn snapshot, the camera the live player
+        self.view = Camera(game, camera.target, camera.zoom)
+        # Sprite id -> (surface, dx, dy), resolved on first draw
+        self._resolved: List[Tuple[pygame.Surface | None, int, int]] = []
+
+        # Pre-rendered chunks are redrawn when their tiles change. Changes may come
+        # from the simulation thread, so they are queued and applied when drawing.
+        self._changed_regions: Deque[Tuple[int, int, int, int]] = deque()
+        world.get_tile_map().add_region_listener(self._on_tiles_changed)
+
+    def _on_tiles_changed(self, min_x: int, min_y: int, max_x: int, max_y: int):
+        self._changed_regions.append((min_x, min_y, max_x, max_y))
+
+    def render(self, snapshot: RenderSnapshot):
+        self.view.target = snapshot
+        self.view.level = self.camera.level
+        self.textures.set_tile_pixels(self.view.tile_pixels)
+        changed = self._changed_regions
+        while changed:
+            self.textures.invalidate_region(*changed.popleft())
 
-    def render(self):
         self.renderTileMap()
-        self.renderEntities()        
+        self.renderEntities(snapshot)
+        self.particles.draw(self.game.screen, self.view)
 
     def renderTileMap(self):
-        # Determine visible tile range
-        # player.x / y are in tile coordinates; convert player center to
-        # pixel coordinates before computing visible tile ranges.
-        cam_px = (self.player.pos[0] * TILE_SIZE)
-        cam_py = (self.player.pos[1] * TILE_SIZE)
-
-        start_x = int((cam_px - (self.game.display_width // 2)) // TILE_SIZE)
-        end_x = int((cam_px + (self.game.display_width // 2)) // TILE_SIZE + 1)
-        start_y = int((cam_py - (self.game.display_height // 2)) // TILE_SIZE)
-        end_y = int((cam_py + (self.game.display_height // 2)) // TILE_SIZE + 1)
-
-        for x in range(start_x, end_x):
-            for y in range(start_y, end_y):            
-                tile = self.world.get_tile_at(x, y)
-                if tile:
-                    image = self.game.asset_manager.try_get_image(tile.image)
-                    screen_x, screen_y = world_to_screen(x, y, self.player, self.game)
-                    self.game.screen.blit(image, (screen_x, screen_y))
-
-    def renderEntities(self):       
-        min_x, min_y, max_x, max_y = get_screen_bounds(self.player, self.game)
-
-        # Query only entities in the visible region using spatial hash
-        visible_entities = self.world.get_entities_in_region(min_x, min_y, max_x, max_y)
-        
-        for entity in visible_entities:
-            screen_x, screen_y = world_to_screen(entity.pos[0], entity.pos[1], self.player, self.game)
-            img = entity.get_current_image()
-            if img:
-                img = self.game.asset_manager.try_get_image(img)
-                # Align entity sprite so its base sits on the tile row.
-                # Many entity sprites are taller than a single tile; draw them
-                # shifted up by the difference between sprite height and tile size.
-                offset_y = img.get_height() - TILE_SIZE
-                if offset_y < 0:
-                    offset_y = 0
-                self.game.screen.blit(img, (screen_x, screen_y - offset_y))
-
-                if entity.health > 0 and entity.max_health > 0:
-                    if entity.health < entity.max_health:
-                        health_bar_width = 40
-                        health_bar_height = 6
-                        health_ratio = entity.health / entity.max_health
-                        health_bar_x = screen_x + (img.get_width() - health_bar_width) // 2
-                        health_bar_y = screen_y - offset_y - 10
-                        
-                        # Draw background bar (red)
-                        pygame.draw.rect(
-                            self.game.screen,
-                            (255, 0, 0),
-                            (health_bar_x, health_bar_y, health_bar_width, health_bar_height)
-                        )
-                        
-                        # Draw foreground bar (green)
-                        pygame.draw.rect(
-                            self.game.screen,
-                            (0, 255, 0),
-                            (health_bar_x, health_bar_y, int(health_bar_width * health_ratio), health_bar_height)
-                        )
-
-
-def world_to_screen(world_x: float, world_y: float, player: 'Player', game: 'Game') -> Tuple[int, int]:
-    """Convert world coordinates to screen coordinates based on the player position."""
-    cam_px = int(player.pos[0] * TILE_SIZE)
-    cam_py = int(player.pos[1] * TILE_SIZE)
-
-    screen_x = int((world_x * TILE_SIZE) - cam_px + (game.display_width // 2))
-    screen_y = int((world_y * TILE_SIZE) - cam_py + (game.display_height // 2))
+        # Draw whole storage chunks pre-rendered at the current zoom level, a
+        # handful of blits per frame instead of one per visible tile.
+        min_x, min_y, max_x, max_y = get_screen_bounds(self.view, margin=0)
+        tile_map = self.world.get_tile_map()
+        screen = self.game.screen
+        for cy in range(min_y // TILE_CHUNK_SIZE, max_y // TILE_CHUNK_SIZE + 1):
+            for cx in range(min_x // TILE_CHUNK_SIZE, max_x // TILE_CHUNK_SIZE + 1):
+                surface = self.textures.chunk(tile_map, cx, cy)
+                if surface is not None:
+                    screen.blit(surface, world_to_screen(cx * TILE_CHUNK_SIZE, cy * TILE_CHUNK_SIZE, self.view))
+
+    def _sprite(self, sprite_id: int) -> Tuple[pygame.Surface | None, int, int]:
+        resolved = self._resolved
+        while len(resolved) <= sprite_id:
+            key = self.sprites.keys[len(resolved)]
+            if key is None:
+                resolved.append((None, 0, 0))
+            elif key[0] == "frame":
+                clip = self.animator.clips[key[1]]
+                dx, dy = clip.offsets[key[2]]
+                resolved.append((clip.frames[key[2]], dx, dy))
+            else:
+                resolved.append((self.game.asset_manager.try_get_image(key[1]), 0, 0))
+        return resolved[sprite_id]
+
+    def renderEntities(self, snapshot: RenderSnapshot):
+        view = self.view
+        tile_pixels = view.tile_pixels
+        zoom = view.zoom
+        screen = self.game.screen
+
+        xs, ys, sprites, health = snapshot.xs, snapshot.ys, snapshot.sprites, snapshot.health
+        for i in range(len(snapshot)):
+            img, dx, dy = self._sprite(sprites[i])
+            if img is None:
+                continue
+            screen_x, screen_y = world_to_screen(xs[i], ys[i], view)
+            screen_x += int(dx * zoom)
+            screen_y += int(dy * zoom)
+            img = self.textures.scale(img)
+            # Align entity sprite so its base sits on the tile row.
+            # Many entity sprites are taller than a single tile; draw them
+            # shifted up by the difference between sprite height and tile size.
+            offset_y = img.get_height() - tile_pixels
+            if offset_y < 0:
+                offset_y = 0
+            screen.blit(img, (screen_x, screen_y - offset_y))
+
+            health_ratio = health[i]
+            if health_ratio != NO_HEALTH_BAR:
+                health_bar_width = 40
+                health_bar_height = 6
+                health_bar_x = screen_x + (img.get_width() - health_bar_width) // 2
+                health_bar_y = screen_y - offset_y - 10
+
+                # Draw background bar (red)
+                pygame.draw.rect(
+                    screen,
+                    (255, 0, 0),
+                    (health_bar_x, health_bar_y, health_bar_width, health_bar_height)
+                )
+
+                # Draw foreground bar (green)
+                pygame.draw.rect(
+                    screen,
+                    (0, 255, 0),
+                    (health_bar_x, health_bar_y, int(health_bar_width * health_ratio), health_bar_height)
+                )
+
+
+def world_to_screen(world_x: float, world_y: float, camera: Camera) -> Tuple[int, int]:
+    """Convert world coordinates to screen coordinates based on the camera position and zoom."""
+    tile_pixels = camera.tile_pixels
+    cam_px = int(camera.target.pos[0] * tile_pixels)
+    cam_py = int(camera.target.pos[1] * tile_pixels)
+    width, height = camera.size
+
+    screen_x = int((world_x * tile_pixels) - cam_px + (width // 2))
+    screen_y = int((world_y * tile_pixels) - cam_py + (height // 2))
     return screen_x, screen_y
 
-def screen_to_world(screen_x: int, screen_y: int, player: 'Player', game: 'Game') -> Tuple[float, float]:
-    """Convert screen coordinates to world coordinates based on the player position."""
-    cam_px = int(player.pos[0] * TILE_SIZE)
-    cam_py = int(player.pos[1] * TILE_SIZE)
+def screen_to_world(screen_x: int, screen_y: int, camera: Camera) -> Tuple[float, float]:
+    """Convert screen coordinates to world coordinates based on the camera position and zoom."""
+    tile_pixels = camera.tile_pixels
+    cam_px = int(camera.target.pos[0] * tile_pixels)
+    cam_py = int(camera.target.pos[1] * tile_pixels)
+    width, height = camera.size
 
-    world_x = (screen_x + cam_px - (game.display_width // 2)) / TILE_SIZE
-    world_y = (screen_y + cam_py - (game.display_height // 2)) / TILE_SIZE
+    world_x = (screen_x + cam_px - (width // 2)) / tile_pixels
+    world_y = (screen_y + cam_py - (height // 2)) / tile_pixels
     return world_x, world_y
 
-def get_screen_bounds(player: 'Player', game: 'Game') -> Tuple[int, int, int, int]:
-    """Get the world coordinate bounds of the player's visible area."""
-    cam_px = int(player.pos[0] * TILE_SIZE)
-    cam_py = int(player.pos[1] * TILE_SIZE)
-
-    margin = 2  # Extra tiles of margin for large sprites
-    min_x = (cam_px - (game.display_width // 2)) // TILE_SIZE - margin
-    max_x = (cam_px + (game.display_width // 2)) // TILE_SIZE + margin
-    min_y = (cam_py - (game.display_height // 2)) // TILE_SIZE - margin
-    max_y = (cam_py + (game.display_height // 2)) // TILE_SIZE + margin
+def get_screen_bounds(camera: Camera, margin: int = 2) -> Tuple[int, int, int, int]:
+    """Get the world coordinate bounds of the camera's visible area, with margin extra tiles for large sprites."""
+    tile_pixels = camera.tile_pixels
+    cam_px = int(camera.target.pos[0] * tile_pixels)
+    cam_py = int(camera.target.pos[1] * tile_pixels)
+    width, height = camera.size
+
+    min_x = (cam_px - (width // 2)) // tile_pixels - margin
+    max_x = (cam_px + (width // 2)) // tile_pixels + margin
+    min_y = (cam_py - (height // 2)) // tile_pixels - margin
+    max_y = (cam_py + (height // 2)) // tile_pixels + margin
     return min_x, min_y, max_x, max_y
@@ -0,0 +1,150 @@
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Dict, List, Tuple
+
+import pygame
+
+from ..constants import TILE_SIZE
+from ..world_core.tiles import TILE_CHUNK_SIZE
+
+if TYPE_CHECKING:
+    from assets import AssetManager
+    from ..world_core import TileMap
+
+
+def _surface_bytes(surface: pygame.Surface) -> int:
+    return surface.get_width() * surface.get_height() * surface.get_bytesize()
+
+
+class TextureCache:
+    """
+    Textures scaled to the current zoom level, and tile chunks pre-rendered at it.
+
+    Only one zoom level is cached at a time: changing tile_pixels evicts everything
+    scaled for the previous level. Downscaled textures are made from the closest
+    mipmap (successive halvings of the source, kept across zoom changes) with
+    smoothscale; upscaled ones use plain scale to keep pixel art crisp. Chunk
+    surfaces are kept in LRU order and evicted once the cache passes max_bytes.
+    """
+
+    def __init__(self, asset_manager: 'AssetManager', max_bytes: int = 64 * 1024 * 1024):
+        self.asset_manager = asset_manager
+        self.max_bytes = max_bytes
+        self.tile_pixels = TILE_SIZE
+        self.bytes_used = 0
+
+        self._scaled: Dict[pygame.Surface, pygame.Surface] = {}
+        self._chunks: OrderedDict[Tuple[int, int], pygame.Surface | None] = OrderedDict()
+        self._mips: Dict[pygame.Surface, List[pygame.Surface]] = {}
+
+        # Metrics
+        self.chunks_rendered = 0
+        self.evictions = 0
+
+    def set_tile_pixels(self, tile_pixels: int):
+        """Switch to a zoom level, evicting everything cached for the previous one."""
+        if tile_pixels == self.tile_pixels:
+            return
+        self.tile_pixels = tile_pixels
+        self.evictions += len(self._scaled) + len(self._chunks)
+        self._scaled.clear()
+        self._chunks.clear()
+        self.bytes_used = 0
+
+    # ------------------------------------------------------------------
+    # Textures
+    # ------------------------------------------------------------------
+
+    def _mip_for(self, source: pygame.Surface, width: int, height: int) -> pygame.Surface:
+        """Return the smallest mip of source that is still at least width x height."""
+        mips = self._mips.get(source)
+        if mips is None:
+            mips = [source]
+            self._mips[source] = mips
+        level = 0
+        while True:
+            mip = mips[level]
+            half = (mip.get_width() // 2, mip.get_height() // 2)
+            if half[0] < width or half[1] < height:
+                return mip
+            level += 1
+            if level == len(mips):
+                try:
+                    mips.append(pygame.transform.smoothscale(mip, half))
+                except ValueError:
+                    # smoothscale needs 24 or 32 bit surfaces
+                    mips.append(pygame.transform.scale(mip, half))
+
+    def scale(self, source: pygame.Surface) -> pygame.Surface:
+        """Return source scaled to the current zoom level, scaling it only once per level."""
+        if self.tile_pixels == TILE_SIZE:
+            return source
+        scaled = self._scaled.get(source)
+        if scaled is None:
+            factor = self.tile_pixels / TILE_SIZE
+            width = max(1, round(source.get_width() * factor))
+            height = max(1, round(source.get_height() * factor))
+            if factor < 1.0:
+                mip = self._mip_for(source, width, height)
+                try:
+                    scaled = pygame.transform.smoothscale(mip, (width, height))
+                except ValueError:
+                    scaled = pygame.transform.scale(mip, (width, height))
+            else:
+                scaled = pygame.transform.scale(source, (width, height))
+            self._scaled[source] = scaled
+            self.bytes_used += _surface_bytes(scaled)
+        return scaled
+
+    def image(self, path: str) -> pygame.Surface:
+        return self.scale(self.asset_manager.try_get_image(path))
+
+    # ------------------------------------------------------------------
+    # Tile chunks
+    # ------------------------------------------------------------------
+
+    def chunk(self, tile_map: 'TileMap', cx: int, cy: int) -> pygame.Surface | None:
+        """Return storage chunk (cx, cy) pre-rendered at the current level, or None if it has no tiles."""
+        key = (cx, cy)
+        if key in self._chunks:
+            self._chunks.move_to_end(key)
+            return self._chunks[key]
+
+        indices = tile_map.get_chunk(cx, cy)
+        surface = None
+        if indices is not None:
+            # The simulation thread may write this chunk meanwhile. Copy it in one slice (atomic
+            # under the GIL) before reading the palette: tiles join the palette before any index
+            # refers to them, so every copied index resolves. A copy taken just before a write is
+            # stale, but that write's region change is queued and drops this pre-render next frame.
+            indices = indices[:]
+            size = self.tile_pixels
+            images = [None] + [self.image(tile.image) for tile in tile_map.palette]
+            surface = pygame.Surface((TILE_CHUNK_SIZE * size, TILE_CHUNK_SIZE * size)).convert()
+            surface.fill((0, 0, 0))
+            for offset, index in enumerate(indices):
+                if index:
+                    surface.blit(images[index], ((offset % TILE_CHUNK_SIZE) * size, (offset // TILE_CHUNK_SIZE) * size))
+            self.bytes_used += _surface_bytes(surface)
+            self.chunks_rendered += 1
+
+        self._chunks[key] = surface
+        self._evict()
+        return surface
+
+    def invalidate_region(self, min_x: int, min_y: int, max_x: int, max_y: int):
+        """Drop the pre-rendered chunks overlapping [min_x, max_x) x [min_y, max_y). TileMap region listener."""
+        for cy in range(min_y // TILE_CHUNK_SIZE, (max_y - 1) // TILE_CHUNK_SIZE + 1):
+            for cx in range(min_x // TILE_CHUNK_SIZE, (max_x - 1) // TILE_CHUNK_SIZE + 1):
+                self._drop_chunk((cx, cy))
+
+    def _drop_chunk(self, key: Tuple[int, int]):
+        surface = self._chunks.pop(key, None)
+        if surface is not None:
+            self.bytes_used -= _surface_bytes(surface)
+
+    def _evict(self):
+        # Least recently drawn chunks go first; the newest chunk is always kept
+        while self.bytes_used > self.max_bytes and len(self._chunks) > 1:
+            key = next(iter(self._chunks))
+            self._drop_chunk(key)
+            self.evictions += 1
@@ -0,0 +1,197 @@
+"""
+Staged world construction, runnable synchronously or on a worker thread.
+
+WorldLoader does everything a WorldScene needs that does not touch pygame_gui:
+opening the save, creating the world and player, generating the chunks around
+the spawn point and decoding their textures. Work is split into small steps so
+progress can be reported and a cancel request is noticed between steps.
+WorldScene adopts the PreparedWorld on the main thread.
+"""
+import os
+import threading
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, List, Tuple
+
+from .world_core import Entity, World, Chunk, ChunkManager
+from .entities import Player, Zombie
+from .generation import ChunkGenerator, TILES
+from .memory import MemoryInstrumentation
+from .save import ChunkStore, SaveFile, SaveState
+
+if TYPE_CHECKING:
+    from main import Game
+    from .scene import WorldSettings
+
+# Stage names and their share of the overall progress
+STAGES: List[Tuple[str, float]] = [
+    ("Opening save", 0.05),
+    ("Generating terrain", 0.75),
+    ("Decoding textures", 0.20),
+]
+
+
+class LoadCancelled(Exception):
+    pass
+
+
+@dataclass
+class PreparedWorld:
+    memory: MemoryInstrumentation
+    world: World
+    player: Player
+    generator: ChunkGenerator
+    chunk_store: ChunkStore
+    chunks: ChunkManager
+    save_state: SaveState | None
+
+    def release(self):
+        """Close the save and stop memory tracing of a world that will not be adopted."""
+        if self.chunk_store.save_file is not None:
+            self.chunk_store.save_file.close()
+        self.memory.stop()
+
+
+class WorldLoader:
+    """Builds a PreparedWorld in stages. Use run() directly, or start() for a worker thread."""
+
+    def __init__(self, game: 'Game', settings: 'WorldSettings', spawn_footprint: Tuple[int, int]):
+        self.game = game
+        self.settings = settings
+        self.spawn_footprint = spawn_footprint
+
+        # Written by the worker, read by the loading scene
+        self.stage = STAGES[0][0]
+        self.progress = 0.0
+        self.result: PreparedWorld | None = None
+        self.error: Exception | None = None
+
+        self._cancel = threading.Event()
+        self._thread: threading.Thread | None = None
+        self.generator: ChunkGenerator | None = None
+        self.chunk_store: ChunkStore | None = None
+        self.chunks: ChunkManager | None = None
+
+    # ------------------------------------------------------------------
+    # Worker control
+    # ------------------------------------------------------------------
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run_worker, name="world-loader", daemon=True)
+        self._thread.start()
+
+    def cancel(self):
+        """
+        Ask the loader to stop at the next step. The partial world is discarded; a
+        finished result is not, release() it once the worker is done.
+        """
+        self._cancel.set()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancel.is_set()
+
+    @property
+    def done(self) -> bool:
+        return self._thread is not None and not self._thread.is_alive()
+
+    def _run_worker(self):
+        try:
+            self.result = self.run()
+        except LoadCancelled:
+            pass
+        except Exception as e:
+            self.error = e
+
+    def _step(self, stage: int, fraction: float):
+        """Report progress within a stage and stop here if cancelled."""
+        if self._cancel.is_set():
+            raise LoadCancelled()
+        self.stage = STAGES[stage][0]
+        self.progress = sum(share for _, share in STAGES[:stage]) + STAGES[stage][1] * fraction
+
+    # ------------------------------------------------------------------
+    # Stages
+    # ------------------------------------------------------------------
+
+    def run(self) -> PreparedWorld:
+        # Start tracing before anything is allocated so world generation shows up
+        memory = MemoryInstrumentation(enabled=self.game.trace_memory)
+        save_file: SaveFile | None = None
+        try:
+            self._step(0, 0.0)
+            save_file = self._open_save()
+            world = World(None, spawn_footprint=self.spawn_footprint)  # type: ignore[arg-type]  # the scene sets the log
+            world.assets = self.game.asset_manager
+            player = Player(self.game)
+            if save_file is not None:
+                save_file.state.apply_to_player(player)
+            player.set_world(world)
+
+            self.generator = ChunkGenerator(self.settings.seed)
+            # Chunks come from this session's unloaded chunks or the save before being generated
+            self.chunk_store = ChunkStore(world, TILES, save_file)
+            self.chunks = ChunkManager(
+                world,
+                self.load_chunk,
+                load_radius=self.settings.chunk_radius,
+                unload_radius=self.settings.chunk_radius + 1,
+                max_resident=self.settings.max_resident_chunks,
+                keep_types=[Player],
+                on_unload=self.store_chunk
+            )
+
+            # Chunks around the spawn point are loaded up front, the rest streams in
+            pending = self.chunks.missing_around(player.pos[0], player.pos[1])
+            for i, (cx, cy) in enumerate(pending):
+                self._step(1, i / len(pending))
+                self.chunks.load_chunk(cx, cy)
+
+            # Decode every texture the first frames will draw, and build the hit-test masks of entity images
+            entity_images = (
+                {image for entity in world.get_entities() for image in entity.image_map.values()}
+                | set(Zombie.IMAGES.values())
+            )
+            images = sorted({tile.image for tile in world.get_tile_map().palette} | entity_images)
+            for i, image in enumerate(images):
+                self._step(2, i / len(images))
+                self.game.asset_manager.try_get_image(image)
+                if image in entity_images:
+                    self.game.asset_manager.get_mask(image)
+            self._step(2, 1.0)
+
+            return PreparedWorld(
+                memory, world, player, self.generator, self.chunk_store, self.chunks,
+                save_file.state if save_file is not None else None
+            )
+        except Exception:
+            # Cancelled or failed: nothing adopts the partial world, so release what it holds
+            if save_file is not None:
+                save_file.close()
+            memory.stop()
+            raise
+
+    def _open_save(self) -> SaveFile | None:
+        path = self.settings.save_path
+        if not self.settings.load_save or path is None or not os.path.exists(path):
+            return None
+        try:
+            save_file = SaveFile(path)
+        except (OSError, ValueError) as e:
+            print(f"Error loading save {path}: {e}")
+            return None
+        self.settings.seed = save_file.state.seed
+        self.settings.max_waves = save_file.state.max_waves
+        return save_file
+
+    # ------------------------------------------------------------------
+    # Chunk streaming callbacks, used for the lifetime of the world
+    # ------------------------------------------------------------------
+
+    def load_chunk(self, world: World, chunk: Chunk) -> List[Entity]:
+        entities = self.chunk_store.load(chunk)
+        if entities is None:
+            entities = self.generator.generate(world, chunk)
+        return entities
+
+    def store_chunk(self, chunk: Chunk):
+        self.chunk_store.store(chunk, self.chunks.entities_in(chunk))
@@ -0,0 +1,92 @@
+from typing import TYPE_CHECKING, List
+
+import pygame
+import pygame_gui
+
+from scene import Scene
+from .loading import WorldLoader
+from .scene import WorldScene, WorldSettings, ZOMBIE_FOOTPRINT
+
+if TYPE_CHECKING:
+    from main import Game
+
+
+class LoadingScene(Scene):
+    """
+    Shows progress while a WorldLoader builds the world on a worker thread, then
+    swaps to the finished WorldScene in one set_scene call. Cancel (or Escape) stops
+    the loader and returns to the menu once the worker has finished, so a new load
+    never overlaps it (e.g. on memory tracing).
+    """
+
+    BAR_WIDTH = 400
+    BAR_HEIGHT = 30
+
+    def __init__(self, game: 'Game', settings: WorldSettings):
+        super().__init__(game)
+        self.settings = settings
+
+        x = (self.game.display_width - self.BAR_WIDTH) // 2
+        y = self.game.display_height // 2
+        self.stage_label = pygame_gui.elements.UILabel(
+            relative_rect=pygame.Rect((x, y - 40), (self.BAR_WIDTH, 30)),
+            text="Loading...",
+            manager=self.game.ui_manager,
+        )
+        self.progress_bar = pygame_gui.elements.UIProgressBar(
+            relative_rect=pygame.Rect((x, y), (self.BAR_WIDTH, self.BAR_HEIGHT)),
+            manager=self.game.ui_manager,
+        )
+        self.cancel_button = pygame_gui.elements.UIButton(
+            relative_rect=pygame.Rect(((self.game.display_width - 120) // 2, y + 50), (120, 40)),
+            text="Cancel",
+            manager=self.game.ui_manager,
+        )
+
+        self.cancelling = False
+        self.loader = WorldLoader(game, settings, ZOMBIE_FOOTPRINT)
+        self.loader.start()
+
+    def handle_events(self, events: List[pygame.event.Event]):
+        for event in events:
+            if event.type == pygame_gui.UI_BUTTON_PRESSED and event.ui_element == self.cancel_button:
+                self._cancel()
+                return
+            if event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE:
+                self._cancel()
+                return
+
+    def update(self, dt: float):
+        loader = self.loader
+        if not self.cancelling:
+            self.stage_label.set_text(f"{loader.stage}...")
+            self.progress_bar.set_current_progress(loader.progress * 100.0)
+        if not loader.done:
+            return
+
+        if self.cancelling:
+            # The worker may have finished before it noticed the cancel
+            if loader.result is not None:
+                loader.result.release()
+                loader.result = None
+            self._back_to_menu()
+        elif loader.result is not None:
+            prepared = loader.result
+            self.game.set_scene(lambda: WorldScene(self.game, self.settings, prepared))
+        else:
+            if loader.error is not None:
+                print(f"Error loading world: {loader.error}")
+            self._back_to_menu()
+
+    def _cancel(self):
+        if self.cancelling:
+            return
+        # The worker stops at its next step; update() returns to the menu once it has
+        self.cancelling = True
+        self.loader.cancel()
+        self.stage_label.set_text("Cancelling...")
+        self.cancel_button.disable()
+
+    def _back_to_menu(self):
+        from menu_scene import MenuScene
+        self.game.set_scene(lambda: MenuScene(self.game))
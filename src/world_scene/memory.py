@@ -0,0 +1,153 @@
+import os
+import sys
+import time
+import tracemalloc
+from collections import defaultdict
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Dict, List, Tuple
+
+if TYPE_CHECKING:
+    from .world_core import Entity, World
+
+
+def estimate_entity_bytes(entity: 'Entity') -> int:
+    """Rough size of an entity: the object, its attribute dict and its tuple fields."""
+    size = sys.getsizeof(entity) + sys.getsizeof(entity.__dict__)
+    for value in entity.__dict__.values():
+        if isinstance(value, tuple):
+            size += sys.getsizeof(value)
+    return size
+
+
+@dataclass
+class EntityTypeStats:
+    count: int = 0
+    bytes: int = 0
+    dead_in_hash: int = 0  # health ran out but the entity was never removed
+
+    @property
+    def bytes_per_entity(self) -> float:
+        return self.bytes / self.count if self.count else 0.0
+
+
+@dataclass
+class MemoryReport:
+    wave: int
+    traced_bytes: int
+    peak_bytes: int
+    entity_types: Dict[str, EntityTypeStats]
+    grid_cells: int
+    grid_entries: int
+    grid_bytes: int
+    free_cells: int
+    top_sites: List[Tuple[str, int, int]] = field(default_factory=list)  # (site, size, size_diff)
+
+    def format(self) -> str:
+        lines = [
+            f"Memory report at wave {self.wave}",
+            f"  traced: {self.traced_bytes / 1024:.1f} KiB (peak {self.peak_bytes / 1024:.1f} KiB)",
+            f"  spatial hash: {self.grid_cells} cells, {self.grid_entries} entries, ~{self.grid_bytes / 1024:.1f} KiB",
+            f"  free spawn cells: {self.free_cells}",
+            "  entities:",
+        ]
+        for name, stats in sorted(self.entity_types.items()):
+            line = f"    {name:<10} {stats.count:>7} live  ~{stats.bytes_per_entity:.0f} B each  {stats.bytes / 1024:.1f} KiB"
+            if stats.dead_in_hash:
+                line += f"  ({stats.dead_in_hash} dead still in hash!)"
+            lines.append(line)
+        lines.append("  top allocation sites (size, change since last wave):")
+        for site, size, size_diff in self.top_sites:
+            lines.append(f"    {size / 1024:9.1f} KiB {size_diff / 1024:+9.1f} KiB  {site}")
+        return "\n".join(lines)
+
+
+class MemoryInstrumentation:
+    """Optional tracemalloc snapshots taken at each wave boundary.
+
+    Each report covers the top allocation sites (compared with the previous
+    snapshot), live entities with their estimated size per type, and the size of
+    the spatial hash grid. Reports are written to directory and kept in reports.
+    """
+
+    TOP_SITES = 10
+
+    def __init__(self, enabled: bool, directory: str = "profiles", frames: int = 1):
+        self.enabled = enabled
+        self.directory = directory
+        self.reports: List[MemoryReport] = []
+        self._previous: tracemalloc.Snapshot | None = None
+        self._started = enabled and not tracemalloc.is_tracing()
+        if self._started:
+            tracemalloc.start(frames)
+
+    def stop(self):
+        """Stop tracing if this instance started it, e.g. when its world is discarded."""
+        if self._started:
+            tracemalloc.stop()
+            self._started = False
+        self.enabled = False
+        self._previous = None
+
+    def snapshot(self, world: 'World', wave: int) -> MemoryReport | None:
+        if not self.enabled:
+            return None
+
+        snapshot = tracemalloc.take_snapshot().filter_traces((
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+        ))
+        if self._previous is not None:
+            stats = snapshot.compare_to(self._previous, "lineno")
+            top_sites = [(str(s.traceback), s.size, s.size_diff) for s in stats[:self.TOP_SITES]]
+        else:
+            stats = snapshot.statistics("lineno")
+            top_sites = [(str(s.traceback), s.size, s.size) for s in stats[:self.TOP_SITES]]
+        self._previous = snapshot
+
+        traced, peak = tracemalloc.get_traced_memory()
+        report = MemoryReport(
+            wave=wave,
+            traced_bytes=traced,
+            peak_bytes=peak,
+            entity_types=self._entity_stats(world),
+            grid_cells=0,
+            grid_entries=0,
+            grid_bytes=0,
+            free_cells=len(world.free_cells),
+            top_sites=top_sites,
+        )
+        self._grid_stats(world, report)
+        self.reports.append(report)
+        self._write(report)
+        return report
+
+    def _entity_stats(self, world: 'World') -> Dict[str, EntityTypeStats]:
+        result: Dict[str, EntityTypeStats] = defaultdict(EntityTypeStats)
+        for entity in world.get_entities():
+            stats = result[type(entity).__name__]
+            stats.count += 1
+            stats.bytes += estimate_entity_bytes(entity)
+            if entity.max_health > 0 and entity.health <= 0:
+                stats.dead_in_hash += 1
+        return dict(result)
+
+    def _grid_stats(self, world: 'World', report: MemoryReport):
+        spatial_hash = world.spatial_hash
+        grid = spatial_hash._grid
+        entity_cells = spatial_hash._entity_cells
+        report.grid_cells = len(grid)
+        report.grid_entries = sum(len(cell) for cell in grid.values())
+        report.grid_bytes = (
+            sys.getsizeof(grid) + sys.getsizeof(entity_cells)
+            + sum(sys.getsizeof(cell) for cell in grid.values())
+            + sum(sys.getsizeof(cells) for cells in entity_cells.values())
+        )
+
+    def _write(self, report: MemoryReport):
+        text = report.format()
+        os.makedirs(self.directory, exist_ok=True)
+        path = os.path.join(self.directory, f"memory-wave{report.wave}-{time.strftime('%Y%m%d-%H%M%S')}.txt")
+        with open(path, "w") as f:
+            f.write(text + "\n")
+        print(text)
+        print(f"Memory report written to {path}")
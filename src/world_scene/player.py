@@ -1,14 +1,16 @@
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Tuple
 
 import pygame
 from .world_core import Entity
-from .graphics import screen_to_world
+from .commands import MOVE_DOWN, MOVE_LEFT, MOVE_RIGHT, MOVE_UP
 
 if TYPE_CHECKING:
     from main import Game
 
 
 class Player(Entity):
+    ANIMATION = "player"
+
     def __init__(self, game: 'Game'):
         image_map = {
             "default": "textures/entities/player0.png"
@@ -18,6 +20,7 @@ class Player(Entity):
         self.game = game
         self.speed = 3
         self.attack_range = 3
+        self.precise_attacks = False  # Hit zombies whose sprite overlaps the range, not just their centre
         self.attack_damage = 15
         self.health = 100
         self.max_health = 100
@@ -26,39 +29,50 @@ class Player(Entity):
 
         self.set_image_state("default")
 
-    def handle_input(self):
-        """Read input and store movement vector."""
+    def read_input(self) -> int:
+        """Read the keyboard and return the held movement keys as MOVE_* bits."""
         keys = pygame.key.get_pressed()
-        dx = dy = 0.0
+        held = 0
         if keys[pygame.K_LEFT]:
-            dx -= 1
+            held |= MOVE_LEFT
         if keys[pygame.K_RIGHT]:
-            dx += 1
+            held |= MOVE_RIGHT
         if keys[pygame.K_UP]:
-            dy -= 1
+            held |= MOVE_UP
         if keys[pygame.K_DOWN]:
+            held |= MOVE_DOWN
+        return held
+
+    def velocity_for(self, held: int) -> Tuple[float, float]:
+        """Return the velocity the held movement keys ask for. Applied with set_velocity."""
+        dx = dy = 0.0
+        if held & MOVE_LEFT:
+            dx -= 1
+        if held & MOVE_RIGHT:
+            dx += 1
+        if held & MOVE_UP:
+            dy -= 1
+        if held & MOVE_DOWN:
             dy += 1
         # Normalize diagonal movement
         if dx != 0 and dy != 0:
             factor = 0.7071  # 1/sqrt(2)
             dx *= factor
             dy *= factor
-        self.set_velocity(dx * self.speed, dy * self.speed)
+        return dx * self.speed, dy * self.speed
 
-    def handle_click(self, mouse_x: int, mouse_y: int):
+    def handle_click(self, world_x: float, world_y: float):
         from .entities import Zombie
         if not self.world:
             return
 
-        world_x, world_y = screen_to_world(mouse_x, mouse_y, self, self.game)
-
         # Try to interact with an entity at the clicked position
         entity = self.world.point_collision(world_x, world_y, excluded=[Player])
         if entity:
             entity.interact(self)
     
         # Try attacking zombies in range
-        result = self.world.entities_in_radius(self.pos[0], self.pos[1], self.attack_range, excluded=[Player])
+        result = self.world.entities_in_radius(self.pos[0], self.pos[1], self.attack_range, excluded=[Player], precise=self.precise_attacks)
         for zombie in result:
             if isinstance(zombie, Zombie):
                 zombie.take_damage(self.attack_damage, self)
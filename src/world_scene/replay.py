@@ -0,0 +1,153 @@
+"""
+Input recordings: what the player did before each batch of fixed steps, so a
+session can be replayed exactly, with or without a window and as fast as it
+simulates (e.g. to benchmark the same session before and after a change).
+
+A recording is a gzip stream (little endian):
+
+    header   HEADER: magic, version, seed, max waves, chunk radius,
+             max resident chunks, precise attacks
+    batches  BATCH, then CLICK x click count, for every batch of fixed steps
+    end      BATCH with a negative frame time, then DIGEST: batch count and a
+             hash of the final simulation state
+
+A batch stores the frame time the scheduler was given, so the same fixed steps
+of every system run in the replay, along with the held movement keys, the zoom
+level and screen size (the simulated area is what is on screen) and the clicks
+in world coordinates. Everything else the simulation depends on is derived from
+the header: gameplay randomness comes from World.rng seeded with the seed,
+timers from World.time, and scheduler budgets, which depend on wall-clock time,
+are off while recording and replaying.
+"""
+import dataclasses
+import gzip
+import hashlib
+import struct
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, List, Tuple
+
+if TYPE_CHECKING:
+    from .player import Player
+    from .scene import WorldSettings
+    from .world_core import World
+
+MAGIC = b"CHIR"
+VERSION = 1
+
+HEADER = struct.Struct("<4sHqIHI?")
+BATCH = struct.Struct("<dBBHHH")     # frame time, held keys, zoom level, screen width, height, click count
+CLICK = struct.Struct("<dd")         # world x, y
+DIGEST = struct.Struct("<Q20s")      # batch count, SHA-1 of the final state
+END_OF_BATCHES = -1.0
+
+
+@dataclass
+class BatchInput:
+    """The input applied before one batch of fixed steps."""
+    frame_time: float
+    keys: int                      # Held movement keys, MOVE_* bits
+    zoom_level: int
+    view_size: Tuple[int, int]     # Screen size in pixels
+    clicks: List[Tuple[float, float]] = field(default_factory=list)
+
+
+def state_digest(world: 'World', player: 'Player', wave_index: int | None) -> bytes:
+    """Hash of the state a replay must reproduce: the clock, the wave, the player and every loaded entity."""
+    digest = hashlib.sha1(struct.pack(
+        "<diii", world.time, -1 if wave_index is None else wave_index, player.points, player.lives
+    ))
+    for entity in world.get_entities():
+        digest.update(struct.pack("<ddd", entity.pos[0], entity.pos[1], entity.health))
+    return digest.digest()
+
+
+class InputRecorder:
+    """Writes the input of every batch to a recording as the session is played."""
+
+    def __init__(self, path: str, settings: 'WorldSettings'):
+        self.path = path
+        self.batches = 0
+        self._file = gzip.open(path, "wb")
+        self._file.write(HEADER.pack(
+            MAGIC, VERSION, settings.seed, settings.max_waves,
+            settings.chunk_radius, settings.max_resident_chunks, settings.precise_attacks
+        ))
+
+    def record(self, batch: BatchInput):
+        self._file.write(BATCH.pack(
+            batch.frame_time, batch.keys, batch.zoom_level, batch.view_size[0], batch.view_size[1], len(batch.clicks)
+        ))
+        for x, y in batch.clicks:
+            self._file.write(CLICK.pack(x, y))
+        self.batches += 1
+
+    def close(self, digest: bytes):
+        """End the recording with the final state, which the replay checks it reaches."""
+        self._file.write(BATCH.pack(END_OF_BATCHES, 0, 0, 0, 0, 0))
+        self._file.write(DIGEST.pack(self.batches, digest))
+        self._file.close()
+
+
+class InputReplay:
+    """Reads a recording back one batch at a time."""
+
+    def __init__(self, path: str):
+        self.path = path
+        with gzip.open(path, "rb") as f:
+            self._data = f.read()
+        if len(self._data) < HEADER.size:
+            raise ValueError(f"{path} is not a version {VERSION} Chest Hunters recording")
+        magic, version, seed, max_waves, chunk_radius, max_resident_chunks, precise_attacks = HEADER.unpack_from(self._data, 0)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{path} is not a version {VERSION} Chest Hunters recording")
+        self.seed = seed
+        self.max_waves = max_waves
+        self.chunk_radius = chunk_radius
+        self.max_resident_chunks = max_resident_chunks
+        self.precise_attacks = precise_attacks
+        self._offset = HEADER.size
+
+        self.batches = 0
+        self.finished = False
+        # From the end of the recording; None if it was cut short (e.g. the game crashed)
+        self.recorded_batches: int | None = None
+        self.recorded_digest: bytes | None = None
+
+    def apply_to(self, settings: 'WorldSettings') -> 'WorldSettings':
+        """Return settings with the recorded world's seed and rules."""
+        return dataclasses.replace(
+            settings,
+            seed=self.seed,
+            max_waves=self.max_waves,
+            chunk_radius=self.chunk_radius,
+            max_resident_chunks=self.max_resident_chunks,
+            precise_attacks=self.precise_attacks,
+            load_save=False
+        )
+
+    def next_batch(self) -> BatchInput | None:
+        """Return the input of the next batch, or None once the recording is finished."""
+        data = self._data
+        if self.finished or self._offset + BATCH.size > len(data):
+            self.finished = True
+            return None
+        frame_time, keys, zoom_level, width, height, click_count = BATCH.unpack_from(data, self._offset)
+        self._offset += BATCH.size
+        if frame_time == END_OF_BATCHES:
+            self.finished = True
+            if self._offset + DIGEST.size <= len(data):
+                self.recorded_batches, self.recorded_digest = DIGEST.unpack_from(data, self._offset)
+            return None
+        if self._offset + click_count * CLICK.size > len(data):
+            self.finished = True
+            return None
+        clicks = [CLICK.unpack_from(data, self._offset + i * CLICK.size) for i in range(click_count)]
+        self._offset += click_count * CLICK.size
+        self.batches += 1
+        return BatchInput(frame_time, keys, zoom_level, (width, height), clicks)
+
+    def verify(self, digest: bytes) -> bool | None:
+        """Whether the replay ended in the recorded state, None if the recording has no final state."""
+        if self.recorded_digest is None:
+            return None
+        return self.batches == self.recorded_batches and digest == self.recorded_digest
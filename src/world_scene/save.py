@@ -0,0 +1,404 @@
+"""
+Compact binary save format with lazily decoded chunks.
+
+Layout (little endian):
+
+    header      HEADER: magic, version, seed, max_waves, wave index, wave elapsed,
+                wave count, chunk count
+    waves       WAVE x wave count
+    player      PLAYER
+    index       CHUNK_INDEX x chunk count: cx, cy, blob offset, blob length
+    blobs       one self-contained blob per chunk
+
+A chunk blob holds its own tile palette (so blobs can be copied between files and
+sessions unchanged), the chunk's raw palette-index array, then its entities grouped
+by type, each group a type name, a count and fixed-size packed records.
+
+SaveFile memory-maps a save and only decodes a chunk when it is asked for.
+Autosaver writes saves on a background thread from a snapshot taken on the main
+thread: tile chunks are shared copy-on-write with the TileMap and entity records
+are packed up front, so the main thread never waits for encoding or disk I/O.
+"""
+import mmap
+import os
+import struct
+import threading
+import time
+from array import array
+from typing import TYPE_CHECKING, Callable, Dict, List, Sequence, Tuple, Type
+
+from .world_core import Entity, Tile, World
+from .world_core.chunks import CHUNK_SIZE, Chunk
+from .entities import Chest, Tree, Zombie
+from .waves import Wave
+
+if TYPE_CHECKING:
+    from .player import Player
+
+MAGIC = b"CHSV"
+VERSION = 1
+
+HEADER = struct.Struct("<4sHqIidHI")
+WAVE = struct.Struct("<5IdI")
+PLAYER = struct.Struct("<ddddii")
+CHUNK_INDEX = struct.Struct("<iiQI")
+NAME_LENGTH = struct.Struct("<H")
+BLOB_HEADER = struct.Struct("<cH")   # tile typecode, palette size
+GROUP_HEADER = struct.Struct("<BI")  # type name length, record count
+
+ChunkKey = Tuple[int, int]
+
+
+class EntityCodec:
+    """Packs one entity type into fixed-size records."""
+    def __init__(
+        self,
+        entity_type: Type[Entity],
+        fmt: str,
+        pack: Callable[[Entity], tuple],
+        unpack: Callable[[tuple, float], Entity]
+    ):
+        self.entity_type = entity_type
+        self.record = struct.Struct(fmt)
+        self.pack = pack
+        self.unpack = unpack
+
+
+def _pack_chest(chest: Chest) -> tuple:
+    now = chest.world.time if chest.world is not None else 0.0
+    remaining = max(0.0, chest.delay - now) if chest.is_open else 0.0
+    return (chest.pos[0], chest.pos[1], chest.is_open, remaining)
+
+
+def _unpack_chest(values: tuple, now: float) -> Chest:
+    x, y, is_open, remaining = values
+    chest = Chest(x, y)
+    if is_open:
+        chest.is_open = True
+        chest.set_image_state("open")
+        chest.delay = now + remaining
+    return chest
+
+
+def _unpack_zombie(values: tuple, now: float) -> Zombie:
+    x, y, health, max_health, vx, vy = values
+    zombie = Zombie(x, y)
+    zombie.health = health
+    zombie.max_health = max_health
+    zombie.set_velocity(vx, vy)
+    return zombie
+
+
+ENTITY_CODECS: Dict[str, EntityCodec] = {
+    "Tree": EntityCodec(Tree, "<dd", lambda e: e.pos, lambda v, now: Tree(*v)),
+    "Chest": EntityCodec(Chest, "<dd?d", _pack_chest, _unpack_chest),
+    "Zombie": EntityCodec(
+        Zombie, "<dddddd",
+        lambda e: (e.pos[0], e.pos[1], e.health, e.max_health, e.velocity[0], e.velocity[1]),
+        _unpack_zombie
+    ),
+}
+
+
+def _pack_name(name: str) -> bytes:
+    data = name.encode("utf-8")
+    return NAME_LENGTH.pack(len(data)) + data
+
+
+def _unpack_name(buffer, offset: int) -> Tuple[str, int]:
+    (length,) = NAME_LENGTH.unpack_from(buffer, offset)
+    offset += NAME_LENGTH.size
+    return bytes(buffer[offset:offset + length]).decode("utf-8"), offset + length
+
+
+def pack_entities(entities: Sequence[Entity]) -> bytes:
+    """Pack entities into type groups. Types without a codec are skipped."""
+    groups: Dict[str, List[Entity]] = {}
+    for entity in entities:
+        name = type(entity).__name__
+        if name in ENTITY_CODECS:
+            groups.setdefault(name, []).append(entity)
+
+    parts = [struct.pack("<H", len(groups))]
+    for name, members in groups.items():
+        codec = ENTITY_CODECS[name]
+        encoded = name.encode("utf-8")
+        parts.append(GROUP_HEADER.pack(len(encoded), len(members)) + encoded)
+        parts.extend(codec.record.pack(*codec.pack(entity)) for entity in members)
+    return b"".join(parts)
+
+
+def encode_chunk(tiles: array | None, palette: Sequence[Tile], entity_data: bytes) -> bytes:
+    """Build a chunk blob from a palette-index array, the palette it refers to and packed entities."""
+    if tiles is None:
+        tiles = array('B', bytes(CHUNK_SIZE * CHUNK_SIZE))
+    parts = [BLOB_HEADER.pack(tiles.typecode.encode("ascii"), len(palette))]
+    for tile in palette:
+        parts.append(_pack_name(tile.name))
+        parts.append(_pack_name(tile.image))
+    parts.append(tiles.tobytes())
+    parts.append(entity_data)
+    return b"".join(parts)
+
+
+def decode_chunk(blob, tiles: Dict[str, Tile], now: float = 0.0) -> Tuple[List[Tile | None], List[Entity]]:
+    """Decode a chunk blob into a row-major tile list and freshly created entities. now is the world time they are restored at."""
+    typecode, palette_size = BLOB_HEADER.unpack_from(blob, 0)
+    offset = BLOB_HEADER.size
+    palette: List[Tile | None] = [None]
+    for _ in range(palette_size):
+        name, offset = _unpack_name(blob, offset)
+        image, offset = _unpack_name(blob, offset)
+        # Reuse the game's Tile objects so the TileMap palette is shared
+        palette.append(tiles.get(name) or Tile(name, image))
+
+    indices = array(typecode.decode("ascii"))
+    size = CHUNK_SIZE * CHUNK_SIZE * indices.itemsize
+    indices.frombytes(bytes(blob[offset:offset + size]))
+    offset += size
+    chunk_tiles = [palette[i] for i in indices]
+
+    entities: List[Entity] = []
+    (group_count,) = struct.unpack_from("<H", blob, offset)
+    offset += 2
+    for _ in range(group_count):
+        name_length, count = GROUP_HEADER.unpack_from(blob, offset)
+        offset += GROUP_HEADER.size
+        name = bytes(blob[offset:offset + name_length]).decode("utf-8")
+        offset += name_length
+        codec = ENTITY_CODECS[name]
+        for values in codec.record.iter_unpack(blob[offset:offset + count * codec.record.size]):
+            entities.append(codec.unpack(values, now))
+        offset += count * codec.record.size
+    return chunk_tiles, entities
+
+
+class SaveState:
+    """Everything in a save except the chunks."""
+    def __init__(
+        self,
+        seed: int,
+        max_waves: int,
+        wave_index: int | None,
+        wave_elapsed: float,
+        waves: List[Wave],
+        player: Tuple[float, float, float, float, int, int]
+    ):
+        self.seed = seed
+        self.max_waves = max_waves
+        self.wave_index = wave_index
+        self.wave_elapsed = wave_elapsed
+        self.waves = waves
+        self.player = player  # x, y, health, max_health, points, lives
+
+    def apply_to_player(self, player: 'Player'):
+        x, y, player.health, player.max_health, player.points, player.lives = self.player
+        player.pos = (x, y)
+
+
+class SaveFile:
+    """A memory-mapped save whose chunk blobs are read on demand."""
+    def __init__(self, path: str):
+        self.path = path
+        self._file = open(path, "rb")
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        self._view = memoryview(self._map)
+
+        magic, version, seed, max_waves, wave_index, wave_elapsed, wave_count, chunk_count = HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC or version != VERSION:
+            self.close()
+            raise ValueError(f"{path} is not a version {VERSION} Chest Hunters save")
+        offset = HEADER.size
+
+        waves = []
+        for _ in range(wave_count):
+            values = WAVE.unpack_from(self._map, offset)
+            waves.append(Wave(*values))
+            offset += WAVE.size
+        player = PLAYER.unpack_from(self._map, offset)
+        offset += PLAYER.size
+        self.state = SaveState(seed, max_waves, wave_index if wave_index >= 0 else None, wave_elapsed, waves, player)
+
+        self.index: Dict[ChunkKey, Tuple[int, int]] = {}
+        for _ in range(chunk_count):
+            cx, cy, blob_offset, length = CHUNK_INDEX.unpack_from(self._map, offset)
+            self.index[(cx, cy)] = (blob_offset, length)
+            offset += CHUNK_INDEX.size
+
+    def chunk_blob(self, key: ChunkKey) -> memoryview | None:
+        """Return a zero-copy view of a chunk blob, or None if the save does not have it."""
+        entry = self.index.get(key)
+        if entry is None:
+            return None
+        blob_offset, length = entry
+        return self._view[blob_offset:blob_offset + length]
+
+    def close(self):
+        self._view.release()
+        self._map.close()
+        self._file.close()
+
+
+def write_save(path: str, state: SaveState, blobs: Dict[ChunkKey, bytes | Callable[[], bytes]]):
+    """Write a save atomically. Blobs may be callables, resolved on the writing thread."""
+    resolved = [(key, blob() if callable(blob) else bytes(blob)) for key, blob in blobs.items()]
+
+    wave_index = state.wave_index if state.wave_index is not None else -1
+    header = HEADER.pack(
+        MAGIC, VERSION, state.seed, state.max_waves, wave_index, state.wave_elapsed,
+        len(state.waves), len(resolved)
+    )
+    waves = b"".join(
+        WAVE.pack(
+            w.max_zombies, w.min_zombie_health, w.max_zombie_health,
+            w.min_zombie_strength, w.max_zombie_strength, w.spawn_interval_seconds, w.wave_duration_seconds
+        )
+        for w in state.waves
+    )
+    player = PLAYER.pack(*state.player)
+
+    offset = len(header) + len(waves) + len(player) + CHUNK_INDEX.size * len(resolved)
+    index = []
+    for (cx, cy), blob in resolved:
+        index.append(CHUNK_INDEX.pack(cx, cy, offset, len(blob)))
+        offset += len(blob)
+
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    temp_path = path + ".tmp"
+    with open(temp_path, "wb") as f:
+        f.write(header)
+        f.write(waves)
+        f.write(player)
+        f.write(b"".join(index))
+        for _, blob in resolved:
+            f.write(blob)
+    return temp_path
+
+
+class ChunkStore:
+    """
+    Persistent chunk state for a world: chunks serialised when they were unloaded
+    this session, backed by an optional memory-mapped save file.
+    """
+    def __init__(self, world: World, tiles: Dict[str, Tile], save_file: SaveFile | None = None):
+        self.world = world
+        self.tiles = tiles
+        self.save_file = save_file
+        self.unloaded: Dict[ChunkKey, bytes] = {}
+        # The unloaded blobs the last snapshot captured, dropped once its save is in use
+        self._snapshot_unloaded: Dict[ChunkKey, bytes] = {}
+
+    def load(self, chunk: Chunk) -> List[Entity] | None:
+        """Materialise a stored chunk into the world. Returns None if it was never stored."""
+        key = (chunk.cx, chunk.cy)
+        blob = self.unloaded.pop(key, None)
+        if blob is None and self.save_file is not None:
+            blob = self.save_file.chunk_blob(key)
+        if blob is None:
+            return None
+
+        chunk_tiles, entities = decode_chunk(blob, self.tiles, self.world.time)
+        min_x, min_y, _, _ = chunk.bounds
+        self.world.get_tile_map().write_region(min_x, min_y, CHUNK_SIZE, chunk_tiles)
+        for entity in entities:
+            entity.set_world(self.world)
+        return entities
+
+    def store(self, chunk: Chunk, entities: Sequence[Entity]):
+        """Serialise a chunk that is about to be unloaded."""
+        tile_map = self.world.get_tile_map()
+        self.unloaded[(chunk.cx, chunk.cy)] = encode_chunk(
+            tile_map.get_chunk(chunk.cx, chunk.cy), list(tile_map.palette), pack_entities(entities)
+        )
+
+    def snapshot(self, resident: Dict[ChunkKey, Sequence[Entity]]) -> Dict[ChunkKey, bytes | Callable[[], bytes]]:
+        """
+        Collect every chunk for a save without encoding tiles on this thread. Resident
+        chunks share their tile arrays copy-on-write; entity records are packed now.
+        """
+        tile_map = self.world.get_tile_map()
+        arrays = tile_map.snapshot_chunks()
+        palette = list(tile_map.palette)
+
+        blobs: Dict[ChunkKey, bytes | Callable[[], bytes]] = {}
+        if self.save_file is not None:
+            for key in self.save_file.index:
+                blobs[key] = self.save_file.chunk_blob(key)  # type: ignore[assignment]
+        blobs.update(self.unloaded)
+        self._snapshot_unloaded = dict(self.unloaded)
+        for key, entities in resident.items():
+            tiles = arrays.get(key)
+            entity_data = pack_entities(entities)
+            blobs[key] = lambda tiles=tiles, entity_data=entity_data: encode_chunk(tiles, palette, entity_data)
+        return blobs
+
+    def drop_saved(self):
+        """
+        Forget the unloaded chunks the last snapshot wrote, once its file is the save file.
+        Chunks stored after the snapshot (unloaded while the save was written) are kept.
+        """
+        for key, blob in self._snapshot_unloaded.items():
+            if self.unloaded.get(key) is blob:
+                del self.unloaded[key]
+        self._snapshot_unloaded = {}
+
+
+class Autosaver:
+    """Writes saves on a background thread; the file is swapped in on the main thread."""
+    def __init__(self, path: str, store: ChunkStore):
+        self.path = path
+        self.store = store
+        self.last_save_ms = 0.0
+        self._thread: threading.Thread | None = None
+        self._result: str | None = None
+        self._error: Exception | None = None
+
+    @property
+    def busy(self) -> bool:
+        return self._thread is not None
+
+    def start(self, state: SaveState, resident: Dict[ChunkKey, Sequence[Entity]]) -> bool:
+        """Snapshot and start writing. Returns False if the previous save is still running."""
+        if self.busy:
+            return False
+        blobs = self.store.snapshot(resident)
+        self._thread = threading.Thread(target=self._write, args=(state, blobs), name="autosave", daemon=True)
+        self._thread.start()
+        return True
+
+    def _write(self, state: SaveState, blobs: Dict[ChunkKey, bytes | Callable[[], bytes]]):
+        start = time.perf_counter()
+        try:
+            self._result = write_save(self.path, state, blobs)
+        except Exception as e:
+            self._error = e
+        self.last_save_ms = (time.perf_counter() - start) * 1000.0
+
+    def poll(self) -> bool:
+        """Finish a completed save on the main thread. Returns True when a save was completed."""
+        if self._thread is None or self._thread.is_alive():
+            return False
+        self._thread = None
+
+        if self._error is not None:
+            print(f"Error writing save {self.path}: {self._error}")
+            self._error = None
+            return False
+
+        # The new file contains every chunk stored before the snapshot, so the old mapping can be dropped
+        temp_path = self._result
+        self._result = None
+        if self.store.save_file is not None:
+            self.store.save_file.close()
+        os.replace(temp_path, self.path)
+        self.store.save_file = SaveFile(self.path)
+        self.store.drop_saved()
+        return True
+
+    def wait(self):
+        """Block until a running save is finished and swapped in."""
+        if self._thread is not None:
+            self._thread.join()
+            self.poll()
@@ -1,49 +1,133 @@
-from typing import TYPE_CHECKING, List
+from collections import deque
+from typing import TYPE_CHECKING, Deque, Dict, List
 from dataclasses import dataclass
 import pygame
 
-from .graphics import MessageLog, HUD, Renderer, get_screen_bounds
-from .world_core import Tile, World
-from .entities import Chest, Tree, Zombie, Player
-import random
+from .graphics import MessageLog, HUD, Camera, Minimap, Renderer, get_screen_bounds, screen_to_world
+from .world_core import Entity
+from .entities import Chest, Zombie
 from scene import Scene
 from .waves import Wave, WaveManager
+from .save import Autosaver, SaveState
+from .loading import PreparedWorld, WorldLoader
+from .commands import CLICK, MOVE, ZOOM, InputCommand
+from .snapshot import RenderSnapshot, SnapshotBuffer
+from .replay import BatchInput, InputRecorder, InputReplay, state_digest
 
 if TYPE_CHECKING:
     from main import Game
-    from .player import Player
+    from scheduler import Scheduler
 
-# Global tiles
-GRASS = Tile("grass", "textures/tiles/grass0.png")
-DIRT = Tile("dirt", "textures/tiles/dirt0.png")
+# Zombies are one tile wide and two tiles tall
+ZOMBIE_FOOTPRINT = (1, 2)
+# Minimum distance (in world units) between the player and a freshly spawned zombie
+ZOMBIE_SPAWN_MIN_DISTANCE = 5.0
+# Expected zombie spawns per second while below the wave's cap
+ZOMBIE_SPAWN_RATE = 12.0
+
+MEMORY_REPORT_KEY = pygame.K_F6
+MINIMAP_TOGGLE_KEY = pygame.K_m
+
+# Minimap markers, later entries drawn on top
+MINIMAP_MARKERS = [
+    (Chest, (255, 215, 0)),
+    (Zombie, (220, 40, 40)),
+]
+MINIMAP_PLAYER_COLOUR = (255, 255, 255)
+
+# System rates (Hz), priorities (lower runs first) and per-frame budgets (seconds)
+PHYSICS_RATE = 60.0
+AI_RATE = 10.0
+AI_BUDGET = 0.004
+WAVE_RATE = 2.0
+WAVE_BUDGET = 0.002
+CHUNK_RATE = 10.0
+CHUNK_BUDGET = 0.004
+AUTOSAVE_RATE = 1.0 / 30.0
+MINIMAP_RATE = 4.0
+
+# Chunks streamed in between re-freezing the world (each freeze runs a full collection first)
+CHUNK_FREEZE_BATCH = 16
 
 
 @dataclass
 class WorldSettings:
     seed: int
     max_waves: int
+    chunk_radius: int = 2           # Chunks kept loaded around the player
+    max_resident_chunks: int = 64
+    save_path: str | None = None    # Autosave target, no saving when None
+    load_save: bool = False         # Continue from save_path instead of starting a new world
+    zoom: float = 1.0               # Initial camera zoom, snapped to the nearest zoom level
+    precise_attacks: bool = False   # Attacks test sprite masks against the attack range
+    record_path: str | None = None  # Record the session's input to this file for replaying
 
 
 class WorldScene(Scene):
-    def __init__(self, game: 'Game', settings: WorldSettings):
+    def __init__(
+        self,
+        game: 'Game',
+        settings: WorldSettings,
+        prepared: PreparedWorld | None = None,
+        replay: InputReplay | None = None
+    ):
+        """
+        Adopt a world prepared by a WorldLoader (see LoadingScene), or build one synchronously.
+        With a replay the recorded input drives the player instead of the keyboard and mouse;
+        settings should come from InputReplay.apply_to.
+        """
         super().__init__(game)
+        self.settings = settings
+        if prepared is None:
+            prepared = WorldLoader(game, settings, ZOMBIE_FOOTPRINT).run()
 
-        # Create UI elements with the UI manager first (World needs log)
+        self.memory = prepared.memory
         self.log = MessageLog(self.game.ui_manager, self.game.display_height)
 
-        self.settings = settings
-        self.world = World(self.log)
-        self.player = Player(game)
-        self.player.set_world(self.world)
-        self.wave_manager = WaveManager(self._make_wave(1))
+        self.world = prepared.world
+        self.world.log = self.log
+        self.player = prepared.player
+        # All gameplay randomness comes from the world's RNG and timers run on its clock
+        self.world.rng.seed(self.settings.seed)
+        self.wave_manager = WaveManager(self._make_wave(1), clock=lambda: self.world.time)
 
         self.hud = HUD(self.game.ui_manager, self.player, self.wave_manager, self.game)
 
-        self.renderer = Renderer(self.game, self.player, self.world)
+        self.camera = Camera(self.game, self.player, self.settings.zoom)
+        self.player.precise_attacks = self.settings.precise_attacks
+        self.renderer = Renderer(self.game, self.camera, self.world)
+        self.world.particles = self.renderer.particles
+        # Input goes to the simulation through a queue, the renderer draws published snapshots.
+        # deque append/popleft are atomic, so neither side locks.
+        self.inputs: Deque[InputCommand] = deque()
+        self._held_keys = 0
+        self.replay = replay
+        self.recorder = InputRecorder(settings.record_path, settings) if settings.record_path else None
+        self.snapshots = SnapshotBuffer()
+        self._snapshot_sequence = 0
+        self._last_stats = (0, 0.0, 0, 0, 0.0)
+        self._last_query_cache = (0, 0)
+        self.minimap = Minimap(
+            self.world, self.game.asset_manager, self.player,
+            MINIMAP_MARKERS + [(type(self.player), MINIMAP_PLAYER_COLOUR)]
+        )
+        self._last_query_count = 0
+
+        self.generator = prepared.generator
+        self.chunk_store = prepared.chunk_store
+        self.chunks = prepared.chunks
+        self.autosaver = Autosaver(self.settings.save_path, self.chunk_store) if self.settings.save_path else None
 
-        random.seed(self.settings.seed)
-        self._generate_tiles()
-        self.wave_manager.start_next_wave()
+        # The generated world lives as long as the scene, keep it out of GC passes.
+        # Chunks streamed in later are frozen in batches by _chunk_step.
+        self.game.gc.freeze()
+        self._frozen_chunks = self.chunks.chunks_generated
+        if prepared.save_state is not None:
+            self._restore_waves(prepared.save_state)
+        else:
+            self.wave_manager.start_next_wave()
+        self._report_memory()
+        self._publish_snapshot()
 
         # Optional welcome messages
         self.log.add("Welcome to Chest Hunters!")
@@ -54,35 +138,125 @@ class WorldScene(Scene):
     # Scene interface
     # ----------------------------------------------------------------------
 
+    def register_systems(self, scheduler: 'Scheduler'):
+        # Budgets defer systems by wall-clock time, which a replay could not reproduce
+        scheduler.budgets_enabled = self.recorder is None and self.replay is None
+        scheduler.register("physics", self._physics_step, rate=PHYSICS_RATE, priority=0)
+        scheduler.register("ai", self._ai_step, rate=AI_RATE, priority=1, budget=AI_BUDGET)
+        scheduler.register("waves", self._wave_step, rate=WAVE_RATE, priority=2, budget=WAVE_BUDGET)
+        scheduler.register("chunks", self._chunk_step, rate=CHUNK_RATE, priority=3, budget=CHUNK_BUDGET)
+        if self.autosaver is not None:
+            scheduler.register("autosave", self._autosave_step, rate=AUTOSAVE_RATE, priority=4)
+        scheduler.register("minimap", self._minimap_step, rate=MINIMAP_RATE, priority=5)
+
     def handle_events(self, events: List[pygame.event.Event]):
         for ev in events:
             if ev.type == pygame.VIDEORESIZE:
                 # Handle resize for UI elements
-                self.log.handle_resize(self.game.display_height)
-                self.hud.handle_resize()
-            elif not self.world.is_frozen and ev.type == pygame.MOUSEBUTTONDOWN:
-                if ev.button == 1:
-                    self.player.handle_click(ev.pos[0], ev.pos[1])
+                with self.game.sim_lock:
+                    self.log.handle_resize(self.game.display_height)
+                    self.hud.handle_resize()
+            elif ev.type == pygame.KEYDOWN and ev.key == MEMORY_REPORT_KEY:
+                with self.game.sim_lock:
+                    self._report_memory()
+            elif ev.type == pygame.KEYDOWN and ev.key == MINIMAP_TOGGLE_KEY:
+                self.minimap.visible = not self.minimap.visible
+            elif ev.type == pygame.MOUSEWHEEL:
+                # The simulated area is what is on screen, so zooming is input to the simulation
+                self.inputs.append(InputCommand(ZOOM, value=ev.y))
+            elif ev.type == pygame.MOUSEBUTTONDOWN and ev.button == 1:
+                # Clicks are resolved against what is on screen, i.e. the drawn snapshot
+                world_x, world_y = screen_to_world(ev.pos[0], ev.pos[1], self.renderer.view)
+                self.inputs.append(InputCommand(CLICK, world_x, world_y))
+
+        self.inputs.append(InputCommand(MOVE, value=self.player.read_input()))
+
+    def before_steps(self, frame_time: float) -> float:
+        inputs = self.inputs
+        if self.replay is not None:
+            # Live input is dropped, the recording says what happens
+            inputs.clear()
+            return self._replay_batch()
 
-        self.player.handle_input()
+        clicks = []
+        while inputs:
+            command = inputs.popleft()
+            if command.kind == MOVE:
+                self._held_keys = command.value
+            elif command.kind == CLICK:
+                clicks.append((command.x, command.y))
+            elif command.kind == ZOOM:
+                self.camera.zoom_by(command.value)
+        batch = BatchInput(frame_time, self._held_keys, self.camera.level, self.camera.size, clicks)
+        self._apply_input(batch)
+        if self.recorder is not None:
+            self.recorder.record(batch)
+        return frame_time
+
+    def after_steps(self, dt: float):
+        # Advance the animations of everything on screen in one pass, then publish it
+        min_x, min_y, max_x, max_y = get_screen_bounds(self.camera)
+        visible = self.world.get_entities_in_region(min_x, min_y, max_x, max_y)
+        self.renderer.animator.update(visible, dt)
+        self._publish_snapshot(visible)
 
     def fixed_update(self, dt: float):
+        """Run every system for one step of dt. The game itself steps them through the scheduler."""
+        self._physics_step(dt)
+        self._ai_step(dt)
+        self._wave_step(dt)
+
+    def _physics_step(self, dt: float):
         if self.world.is_frozen:
             return
-        min_x, min_y, max_x, max_y = get_screen_bounds(self.player, self.game)
+        self.world.time += dt
+        min_x, min_y, max_x, max_y = get_screen_bounds(self.camera)
         entities = self.world.get_entities_in_region(min_x, min_y, max_x, max_y)
 
         for ent in entities:
             ent.tick(dt)
 
+    def _ai_step(self, dt: float):
+        if self.world.is_frozen:
+            return
+        min_x, min_y, max_x, max_y = get_screen_bounds(self.camera)
+        entities = self.world.get_entities_in_region(min_x, min_y, max_x, max_y)
+
+        for ent in entities:
+            if isinstance(ent, Zombie):
+                ent.think(dt)
+
+    def _chunk_step(self, dt: float):
+        # Stream chunks in around the player and drop far ones
+        self.chunks.update(self.player.pos[0], self.player.pos[1])
+
+        # Streamed chunks stay resident for a while, freeze them too once enough have
+        # loaded. Entities of chunks unloaded later are still freed by reference counting;
+        # only reference cycles among them would be kept until the scene unfreezes.
+        if self.chunks.chunks_generated - self._frozen_chunks >= CHUNK_FREEZE_BATCH:
+            self.game.gc.freeze()
+            self._frozen_chunks = self.chunks.chunks_generated
+
+    def _autosave_step(self, dt: float):
+        # Only the snapshot happens here, encoding and writing run on the autosave thread
+        self.autosaver.start(self._save_state(), self._resident_entities())
+
+    def _minimap_step(self, dt: float):
+        self.minimap.refresh()
+
+    def _wave_step(self, dt: float):
+        if self.world.is_frozen:
+            return
+
         # Zombie spawning – deterministic, fixed-rate
-        self._spawn_zombies()
+        self._spawn_zombies(dt)
 
         if self.wave_manager.get_current_wave() is not None:
             progress = self.wave_manager.get_current_progress()
             if self.wave_manager.current_wave_index is not None and progress is not None and progress >= 1.0:
                 # Wave complete
                 self.log.add(f"Wave {self.wave_manager.current_wave_index + 1} complete!")
+                self._report_memory()
                 self.wave_manager.waves.append(self._make_wave(self.wave_manager.current_wave_index + 2))
                 self.wave_manager.start_next_wave()
                 if self.wave_manager.get_current_wave() is not None:
@@ -91,69 +265,175 @@ class WorldScene(Scene):
                     self.log.add("All waves complete! You survived!")
 
     def update(self, dt: float):
-        # Update UI elements
-        self.hud.update()
+        self.renderer.particles.update(dt)
+
+        # The UI reads simulation state. While the simulation thread is stepping,
+        # skip this frame's refresh rather than wait for it.
+        if not self.game.sim_lock.acquire(blocking=False):
+            return
+        try:
+            self.hud.update()
+            self.log.flush()
+            if self.autosaver is not None and self.autosaver.poll():
+                self.log.add(f"Game saved ({self.autosaver.last_save_ms:.0f} ms in background)")
+        finally:
+            self.game.sim_lock.release()
 
     def render(self, screen: pygame.Surface, alpha: float):
         # Render world - UI is handled by ui_manager in main.py
-        self.renderer.render()
+        self.renderer.render(self.snapshots.latest())
+        self.minimap.draw(screen)
+
+    def get_stats(self) -> Dict[str, float]:
+        spatial_hash = self.world.spatial_hash
+        queries = spatial_hash.query_count - self._last_query_count
+        self._last_query_count = spatial_hash.query_count
+
+        # Snapshot latency and lock contention since the last call
+        snapshots, lock = self.snapshots, self.game.sim_lock
+        drawn, latency, dropped, contended, wait = self._last_stats
+        self._last_stats = (snapshots.drawn, snapshots.latency_total, snapshots.dropped, lock.contended, lock.wait_time)
+        new_drawn = snapshots.drawn - drawn
+        hits, misses = self.world.query_hits - self._last_query_cache[0], self.world.query_misses - self._last_query_cache[1]
+        self._last_query_cache = (self.world.query_hits, self.world.query_misses)
+        return {
+            "entities": len(spatial_hash),
+            "queries": queries,
+            "query_hit_pct": hits / (hits + misses) * 100.0 if hits + misses else 0.0,
+            "hud_renders": self.hud.renders_per_second,
+            "chunks": len(self.chunks),
+            "chunk_gen_ms": self.chunks.last_generation_ms,
+            "particles": len(self.renderer.particles),
+            "snapshot_ms": (snapshots.latency_total - latency) / new_drawn * 1000.0 if new_drawn else 0.0,
+            "snapshots_dropped": snapshots.dropped - dropped,
+            "lock_contended": lock.contended - contended,
+            "lock_wait_ms": (lock.wait_time - wait) * 1000.0,
+        }
+
+    def on_leave(self):
+        super().on_leave()
+        if self.recorder is not None:
+            self.recorder.close(self._state_digest())
+            print(f"Recorded {self.recorder.batches} batches of input to {self.recorder.path}")
+            self.recorder = None
+        if self.autosaver is not None:
+            # A running autosave is finished first so the final save replaces it
+            self.autosaver.wait()
+            self.autosaver.start(self._save_state(), self._resident_entities())
+            self.autosaver.wait()
+        # Let the frozen world be collected
+        self.game.gc.unfreeze()
+
+    def get_capture_label(self) -> str:
+        wave_index = self.wave_manager.current_wave_index
+        wave = f"wave{wave_index + 1}" if wave_index is not None else "done"
+        return f"{type(self).__name__}-{wave}"
 
     # ----------------------------------------------------------------------
     # Internal helpers
     # ----------------------------------------------------------------------
 
-    def _generate_tiles(self):
-        tile_map = self.world.get_tile_map()
+    def _apply_input(self, batch: BatchInput):
+        self.player.set_velocity(*self.player.velocity_for(batch.keys))
+        self.camera.level = batch.zoom_level
+        for x, y in batch.clicks:
+            if not self.world.is_frozen:
+                self.player.handle_click(x, y)
 
-        for x in range(-50, 50):
-            for y in range(-50, 50):
-                r = random.random()
+    def _replay_batch(self) -> float:
+        """Apply the next recorded batch and return its frame time; stops the game at the end."""
+        batch = self.replay.next_batch()
+        if batch is None:
+            if self.game.running:
+                self._finish_replay()
+            return 0.0
+        # Simulate the area that was on screen when recording, whatever the window size now
+        self.camera.view_size = batch.view_size
+        self._apply_input(batch)
+        return batch.frame_time
 
-                if (x + y) % 3 == 0:
-                    tile_map.add_tile(x, y, DIRT)
-                else:
-                    tile_map.add_tile(x, y, GRASS)
-                    if r < 0.1:
-                        tree = Tree(x, y)
-                        if not self.world.has_collision(tree):
-                            tree.set_world(self.world)
-                        else:
-                            del tree
-
-                if r < 0.005:
-                    chest = Chest(x, y)
-                    if not self.world.has_collision(chest):
-                        chest.set_world(self.world)
-                    else:
-                        del chest
-
-    def _spawn_zombies(self):
+    def _finish_replay(self):
+        result = self.replay.verify(self._state_digest())
+        if result is None:
+            print(f"Replayed {self.replay.batches} batches; the recording has no final state to compare with")
+        elif result:
+            print(f"Replayed {self.replay.batches} batches, final state matches the recording")
+        else:
+            print(f"Replayed {self.replay.batches} batches, final state differs from the recording")
+        self.game.running = False
+
+    def _state_digest(self) -> bytes:
+        return state_digest(self.world, self.player, self.wave_manager.current_wave_index)
+
+    def _publish_snapshot(self, visible: List[Entity] | None = None):
+        if visible is None:
+            min_x, min_y, max_x, max_y = get_screen_bounds(self.camera)
+            visible = self.world.get_entities_in_region(min_x, min_y, max_x, max_y)
+        self._snapshot_sequence += 1
+        self.snapshots.publish(RenderSnapshot.capture(self._snapshot_sequence, self.player, visible, self.renderer.sprites))
+
+    def _resident_entities(self) -> Dict[tuple, List[Entity]]:
+        return {key: self.chunks.entities_in(chunk) for key, chunk in self.chunks.chunks.items()}
+
+    def _save_state(self) -> SaveState:
+        manager = self.wave_manager
+        elapsed = manager.clock() - manager.current_start_time if manager.current_start_time is not None else 0.0
+        player = self.player
+        return SaveState(
+            self.settings.seed,
+            self.settings.max_waves,
+            manager.current_wave_index,
+            elapsed,
+            list(manager.waves),
+            (player.pos[0], player.pos[1], player.health, player.max_health, player.points, player.lives)
+        )
+
+    def _restore_waves(self, state: SaveState):
+        self.wave_manager.waves = list(state.waves)
+        self.wave_manager.current_wave_index = state.wave_index
+        if state.wave_index is not None:
+            self.wave_manager.current_start_time = self.wave_manager.clock() - state.wave_elapsed
+
+    def _report_memory(self):
+        wave_index = self.wave_manager.current_wave_index
+        report = self.memory.snapshot(self.world, wave_index + 1 if wave_index is not None else 0)
+        if report is not None:
+            entities = sum(stats.count for stats in report.entity_types.values())
+            self.log.add(f"Memory: {report.traced_bytes / 1024:.0f} KiB traced, {entities} entities")
+
+    def _spawn_zombies(self, dt: float):
         current_wave = self.wave_manager.get_current_wave()
         if current_wave is None:
             return
-        
+
         max_zombies = current_wave.max_zombies
-        r = random.random()
-        if len(self.world.get_entities_of_type(Zombie)) >= max_zombies:
-            return
+        # Whole expected spawns always happen, the fractional part is a chance
+        expected = ZOMBIE_SPAWN_RATE * dt
+        rng = self.world.rng
+        count = int(expected) + (1 if rng.random() < expected % 1 else 0)
+        zombie_count = len(self.world.get_entities_of_type(Zombie))
 
-        if r < 0.2:  # Spawn chance per tick
-            x = random.randint(-50, 50)
-            y = random.randint(-50, 50)
-            zombie = Zombie(x, y)
-            zombie.health = random.randint(current_wave.min_zombie_health, current_wave.max_zombie_health)
+        for _ in range(min(count, max_zombies - zombie_count)):
+            # Draw a guaranteed-free cell instead of trying random positions
+            cell = self.world.free_cells.sample(
+                rng=rng,
+                near=self.player.pos,
+                min_distance=ZOMBIE_SPAWN_MIN_DISTANCE
+            )
+            if cell is None:
+                return
+            zombie = Zombie(cell[0], cell[1])
+            zombie.health = rng.randint(current_wave.min_zombie_health, current_wave.max_zombie_health)
             zombie.max_health = zombie.health
-            if not self.world.has_collision(zombie):
-                zombie.set_world(self.world)
-            else:
-                del zombie
+            zombie.set_world(self.world)
 
     def _make_wave(self, wave_number: int) -> Wave:
-        max_zombies = random.randint(5 + wave_number * 2, 10 + wave_number * 3)
-        min_zombie_health = random.randint(10 + wave_number * 5, 20 + wave_number * 5)
-        max_zombie_health = min_zombie_health + random.randint(0, 10 + wave_number * 5)
-        min_zombie_strength = random.randint(1 + wave_number, 3 + wave_number)
-        max_zombie_strength = min_zombie_strength + random.randint(0, 2 + wave_number)
+        rng = self.world.rng
+        max_zombies = rng.randint(5 + wave_number * 2, 10 + wave_number * 3)
+        min_zombie_health = rng.randint(10 + wave_number * 5, 20 + wave_number * 5)
+        max_zombie_health = min_zombie_health + rng.randint(0, 10 + wave_number * 5)
+        min_zombie_strength = rng.randint(1 + wave_number, 3 + wave_number)
+        max_zombie_strength = min_zombie_strength + rng.randint(0, 2 + wave_number)
 
         return Wave(
             max_zombies=max_zombies,
@@ -0,0 +1,117 @@
+"""
+Render snapshots: what the renderer needs from one simulation state, in flat arrays.
+
+The simulation captures a RenderSnapshot after each batch of fixed steps and
+publishes it to a SnapshotBuffer; the renderer draws the latest one. Snapshots are
+never modified once published, so with the simulation on its own thread the
+renderer can draw one while the next is being captured, without locking.
+"""
+import time
+from array import array
+from typing import TYPE_CHECKING, Dict, Iterable, List, Tuple
+
+if TYPE_CHECKING:
+    from .world_core import Entity
+
+NO_HEALTH_BAR = -1.0
+
+
+class SpriteTable:
+    """
+    Interns what an entity is drawn with as a small int, so snapshots hold only numbers.
+    Keys are ("frame", clip id, frame index) for animated entities and ("image", path)
+    otherwise; id 0 draws nothing. The table only grows, so a reader on another
+    thread never sees a partial entry.
+    """
+
+    def __init__(self):
+        self.keys: List[Tuple | None] = [None]
+        self._ids: Dict[Tuple, int] = {}
+
+    def id_for(self, key: Tuple) -> int:
+        sprite_id = self._ids.get(key)
+        if sprite_id is None:
+            self.keys.append(key)
+            sprite_id = len(self.keys) - 1
+            self._ids[key] = sprite_id
+        return sprite_id
+
+    def id_of(self, entity: 'Entity') -> int:
+        if entity.anim_id:
+            return self.id_for(("frame", entity.anim_id, int(entity.anim_phase)))
+        image = entity.get_current_image()
+        return self.id_for(("image", image)) if image else 0
+
+
+class RenderSnapshot:
+    """Entity positions, sprite ids and health bar ratios, plus the camera focus (pos)."""
+
+    __slots__ = ("sequence", "pos", "xs", "ys", "sprites", "health", "published_at")
+
+    def __init__(self, sequence: int, pos: Tuple[float, float], xs: array, ys: array, sprites: array, health: array):
+        self.sequence = sequence
+        self.pos = pos  # Named like Entity.pos so a snapshot can be a Camera target
+        self.xs = xs
+        self.ys = ys
+        self.sprites = sprites
+        self.health = health  # Fraction of max health, NO_HEALTH_BAR when no bar is drawn
+        self.published_at = 0.0
+
+    def __len__(self) -> int:
+        return len(self.sprites)
+
+    @classmethod
+    def capture(cls, sequence: int, focus: 'Entity', entities: Iterable['Entity'], sprites: SpriteTable) -> 'RenderSnapshot':
+        # Positions stay doubles: the world is unbounded, and far from spawn float32
+        # steps would be a visible fraction of a pixel
+        xs = array('d')
+        ys = array('d')
+        ids = array('I')
+        health = array('f')
+        for entity in entities:
+            sprite_id = sprites.id_of(entity)
+            if not sprite_id:
+                continue
+            xs.append(entity.pos[0])
+            ys.append(entity.pos[1])
+            ids.append(sprite_id)
+            if 0 < entity.health < entity.max_health:
+                health.append(entity.health / entity.max_health)
+            else:
+                health.append(NO_HEALTH_BAR)
+        return cls(sequence, focus.pos, xs, ys, ids, health)
+
+
+class SnapshotBuffer:
+    """
+    Double buffer between the simulation and the renderer. The snapshot being
+    captured is the back buffer; publish() makes it the front one with a single
+    reference assignment, which is atomic, so neither side takes a lock. Counts
+    how many published snapshots were never drawn and how old drawn ones were.
+    """
+
+    def __init__(self):
+        self._front: RenderSnapshot | None = None
+        self.published = 0
+        self.drawn = 0
+        self.dropped = 0
+        self._last_drawn = -1
+        self.latency_total = 0.0  # seconds between publishing and drawing, summed over drawn snapshots
+
+    def publish(self, snapshot: RenderSnapshot):
+        snapshot.published_at = time.perf_counter()
+        self._front = snapshot
+        self.published += 1
+
+    def latest(self) -> RenderSnapshot | None:
+        """Return the newest snapshot for drawing, recording its latency."""
+        snapshot = self._front
+        if snapshot is None:
+            return None
+        if snapshot.sequence != self._last_drawn:
+            if self._last_drawn >= 0:
+                self.dropped += snapshot.sequence - self._last_drawn - 1
+            self._last_drawn = snapshot.sequence
+            self.drawn += 1
+            self.latency_total += time.perf_counter() - snapshot.published_at
+        return snapshot
@@ -1,4 +1,4 @@
-from typing import List
+from typing import Callable, List
 from dataclasses import dataclass
 import time
 
@@ -15,10 +15,11 @@ class Wave:
 
 
 class WaveManager:
-    def __init__(self, starting_wave: Wave):
+    def __init__(self, starting_wave: Wave, clock: Callable[[], float] = time.time):
         self.waves: List[Wave] = [starting_wave]
         self.current_wave_index: int | None = None
         self.current_start_time: float | None = None
+        self.clock = clock  # Wave timing source in seconds, e.g. the world's simulation clock
 
     def add_wave(self, wave: Wave):
         self.waves.append(wave)
@@ -30,7 +31,7 @@ class WaveManager:
             self.current_wave_index += 1
 
         if self.current_wave_index < len(self.waves):
-            self.current_start_time = time.time()
+            self.current_start_time = self.clock()
         else:
             self.current_wave_index = None  # No more waves
 
@@ -41,7 +42,7 @@ class WaveManager:
     
     def get_current_progress(self) -> float | None:
         if self.current_wave_index is not None and self.current_start_time is not None:
-            elapsed_time = time.time() - self.current_start_time
+            elapsed_time = self.clock() - self.current_start_time
             current_wave = self.waves[self.current_wave_index]
             return min(elapsed_time / current_wave.wave_duration_seconds, 1.0)
         return None
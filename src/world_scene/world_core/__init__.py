@@ -2,6 +2,9 @@ from .entity import Entity
 from .world import World
 from .tiles import TileMap, Tile
 from .spatial_hash import SpatialHash
+from .free_cells import FreeCellIndex
+from .walkability import WalkabilityGrid
+from .chunks import Chunk, ChunkManager, CHUNK_SIZE
 
 __all__ = [
     "Entity",
@@ -9,4 +12,9 @@ __all__ = [
     "TileMap",
     "Tile",
     "SpatialHash",
+    "FreeCellIndex",
+    "WalkabilityGrid",
+    "Chunk",
+    "ChunkManager",
+    "CHUNK_SIZE",
 ]
\ No newline at end of file
@@ -0,0 +1,175 @@
+import time
+from typing import TYPE_CHECKING, Callable, Dict, List, Sequence, Tuple, Type
+
+from .tiles import TILE_CHUNK_SIZE
+
+if TYPE_CHECKING:
+    from .entity import Entity
+    from .world import World
+
+# World chunks line up with the tile map's storage chunks
+CHUNK_SIZE = TILE_CHUNK_SIZE
+
+
+class Chunk:
+    """A resident CHUNK_SIZE x CHUNK_SIZE square of the world and the static entities generated in it."""
+    def __init__(self, cx: int, cy: int):
+        self.cx = cx
+        self.cy = cy
+        self.entities: List['Entity'] = []
+
+    @property
+    def bounds(self) -> Tuple[int, int, int, int]:
+        """Tile bounds (min_x, min_y, max_x, max_y), max exclusive."""
+        min_x = self.cx * CHUNK_SIZE
+        min_y = self.cy * CHUNK_SIZE
+        return min_x, min_y, min_x + CHUNK_SIZE, min_y + CHUNK_SIZE
+
+
+class ChunkManager:
+    """
+    Keeps the chunks around a point resident, generating them on demand.
+
+    generate(world, chunk) must fill the chunk's tiles and return the entities it
+    created; it has to be deterministic for given chunk coordinates so that an
+    unloaded chunk comes back identical. Chunks within load_radius (in chunks) of the
+    centre are loaded nearest first, at most max_loads_per_update per call. Chunks
+    beyond unload_radius are unloaded along with every entity standing in them,
+    except entities of keep_types. At most max_resident chunks are kept. If set,
+    on_unload(chunk) is called first, e.g. to serialise the chunk's state.
+    """
+
+    def __init__(
+        self,
+        world: 'World',
+        generate: Callable[['World', Chunk], List['Entity']],
+        load_radius: int = 2,
+        unload_radius: int = 3,
+        max_resident: int = 64,
+        max_loads_per_update: int = 1,
+        keep_types: Sequence[Type['Entity']] = (),
+        on_unload: Callable[[Chunk], None] | None = None
+    ):
+        self.world = world
+        self.generate = generate
+        self.load_radius = load_radius
+        self.unload_radius = max(unload_radius, load_radius)
+        # The cap can never evict chunks inside the load radius
+        self.max_resident = max(max_resident, (2 * load_radius + 1) ** 2)
+        self.max_loads_per_update = max_loads_per_update
+        self.keep_types = tuple(keep_types)
+        self.on_unload = on_unload
+        self.chunks: Dict[Tuple[int, int], Chunk] = {}
+
+        # Generation metrics
+        self.chunks_generated = 0
+        self.total_generation_ms = 0.0
+        self.last_generation_ms = 0.0
+        self.max_generation_ms = 0.0
+
+    @staticmethod
+    def chunk_of(x: float, y: float) -> Tuple[int, int]:
+        """Convert world coordinates to chunk coordinates."""
+        return (int(x // CHUNK_SIZE), int(y // CHUNK_SIZE))
+
+    @property
+    def average_generation_ms(self) -> float:
+        return self.total_generation_ms / self.chunks_generated if self.chunks_generated else 0.0
+
+    @property
+    def tiles_per_second(self) -> float:
+        """Generation throughput over every chunk generated so far."""
+        if self.total_generation_ms <= 0.0:
+            return 0.0
+        return self.chunks_generated * CHUNK_SIZE * CHUNK_SIZE / (self.total_generation_ms / 1000.0)
+
+    def is_loaded(self, cx: int, cy: int) -> bool:
+        return (cx, cy) in self.chunks
+
+    def _missing_around(self, ccx: int, ccy: int, radius: int) -> List[Tuple[int, int]]:
+        missing = [
+            (cx, cy)
+            for cx in range(ccx - radius, ccx + radius + 1)
+            for cy in range(ccy - radius, ccy + radius + 1)
+            if (cx, cy) not in self.chunks
+        ]
+        missing.sort(key=lambda c: (c[0] - ccx) ** 2 + (c[1] - ccy) ** 2)
+        return missing
+
+    def missing_around(self, x: float, y: float, radius: int | None = None) -> List[Tuple[int, int]]:
+        """Return the chunks within radius of (x, y) that are not loaded, nearest first."""
+        ccx, ccy = self.chunk_of(x, y)
+        return self._missing_around(ccx, ccy, self.load_radius if radius is None else radius)
+
+    def ensure_loaded(self, x: float, y: float, radius: int | None = None):
+        """Synchronously load every chunk within radius of (x, y), e.g. before the first frame."""
+        for cx, cy in self.missing_around(x, y, radius):
+            self.load_chunk(cx, cy)
+
+    def update(self, x: float, y: float):
+        """Stream chunks around (x, y): load the nearest missing ones, unload far ones."""
+        ccx, ccy = self.chunk_of(x, y)
+
+        for cx, cy in self._missing_around(ccx, ccy, self.load_radius)[:self.max_loads_per_update]:
+            self.load_chunk(cx, cy)
+
+        far = [
+            key for key in self.chunks
+            if max(abs(key[0] - ccx), abs(key[1] - ccy)) > self.unload_radius
+        ]
+        for cx, cy in far:
+            self.unload_chunk(cx, cy)
+
+        if len(self.chunks) > self.max_resident:
+            by_distance = sorted(self.chunks, key=lambda c: (c[0] - ccx) ** 2 + (c[1] - ccy) ** 2)
+            for cx, cy in by_distance[self.max_resident:]:
+                self.unload_chunk(cx, cy)
+
+    def load_chunk(self, cx: int, cy: int) -> Chunk:
+        chunk = self.chunks.get((cx, cy))
+        if chunk is not None:
+            return chunk
+
+        chunk = Chunk(cx, cy)
+        start = time.perf_counter()
+        chunk.entities = self.generate(self.world, chunk)
+        elapsed = (time.perf_counter() - start) * 1000.0
+
+        self.chunks_generated += 1
+        self.total_generation_ms += elapsed
+        self.last_generation_ms = elapsed
+        self.max_generation_ms = max(self.max_generation_ms, elapsed)
+
+        self.chunks[(cx, cy)] = chunk
+        return chunk
+
+    def entities_in(self, chunk: Chunk) -> List['Entity']:
+        """Return the entities anchored inside chunk, except entities of keep_types."""
+        min_x, min_y, max_x, max_y = chunk.bounds
+        result = []
+        for entity in self.world.get_entities_in_region(min_x, min_y, max_x, max_y):
+            if self.keep_types and isinstance(entity, self.keep_types):
+                continue
+            if min_x <= entity.pos[0] < max_x and min_y <= entity.pos[1] < max_y:
+                result.append(entity)
+        return result
+
+    def unload_chunk(self, cx: int, cy: int):
+        chunk = self.chunks.get((cx, cy))
+        if chunk is None:
+            return
+        if self.on_unload is not None:
+            self.on_unload(chunk)
+        del self.chunks[(cx, cy)]
+
+        for entity in self.entities_in(chunk):
+            self.world.remove_entity(entity)
+        for entity in chunk.entities:
+            self.world.remove_entity(entity)
+        chunk.entities.clear()
+
+        min_x, min_y, max_x, max_y = chunk.bounds
+        self.world.get_tile_map().clear_region(min_x, min_y, max_x, max_y)
+
+    def __len__(self) -> int:
+        return len(self.chunks)
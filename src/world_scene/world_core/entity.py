@@ -1,3 +1,4 @@
+import math
 from typing import TYPE_CHECKING, Tuple, Dict
 if TYPE_CHECKING:
     from ..player import Player
@@ -6,6 +7,8 @@ from .world import World
 from ..constants import TILE_SIZE
 
 class Entity:
+    ANIMATION: str | None = None  # Animation set played by the Animator, None for static images
+
     def __init__(self,
                  x: float,
                  y: float,
@@ -21,13 +24,24 @@ class Entity:
         self.current_image_key: str | None = None
         self.health = -1 # -1 means infinite health
         self.max_health = -1
+        # Animation state: clip id (0 = not started) and phase in frames
+        self.anim_id = 0
+        self.anim_phase = 0.0
 
     def set_world(self, world: World):
         self.world = world
         world.add_entity(self)
 
+    def emit_effect(self, effect: str):
+        """Play a particle effect at the centre of the entity, if the world is being drawn."""
+        if self.world is not None and self.world.particles is not None:
+            width, height = self.size_world_units
+            self.world.particles.burst(effect, self.pos[0] + width / 2, self.pos[1] + height / 2)
+
     def tick(self, dt: float):
-        """Move applying simple AABB entity-vs-entity collision using World.has_collision.
+        """Move applying solid-tile collision (World.is_area_walkable) and simple AABB
+        entity-vs-entity collision using World.has_collision. Movement is slowed by the
+        movement cost of the tile under the entity.
 
         Strategy:
         1) Compute target (x, y).
@@ -46,6 +60,11 @@ class Entity:
         if self.velocity == (0.0, 0.0):
             return
 
+        # Slower on costly tiles, judged by the cell under the entity's centre
+        width, height = self.size_world_units
+        cost = self.world.walkability.cost(math.floor(self.pos[0] + width / 2), math.floor(self.pos[1] + height / 2))
+        if cost != 1.0 and cost != math.inf:
+            dt /= cost
         target_x = self.pos[0] + (self.velocity[0] * dt)
         target_y = self.pos[1] + (self.velocity[1] * dt)
         orig_x, orig_y = self.pos
@@ -56,6 +75,9 @@ class Entity:
         def _collides_at(target: Tuple[float, float]) -> bool:
             if not self.world:
                 return False
+            # Solid tiles are an O(1) grid lookup per covered cell
+            if not self.world.is_area_walkable(target[0], target[1], target[0] + width, target[1] + height):
+                return True
 
             saved_pos = self.pos
             try:
@@ -84,8 +106,8 @@ class Entity:
             self.pos = (self.pos[0], target_y)
         else:
             # blocked on Y
-            self.y = orig_y
-            self.velocity_dy = 0.0
+            self.pos = (self.pos[0], orig_y)
+            self.velocity = (self.velocity[0], 0.0)
 
         # Update spatial hash if position changed
         if self.pos != (orig_x, orig_y):
@@ -122,8 +144,3 @@ class Entity:
         if self.current_image_key:
             return self.image_map[self.current_image_key]
         return None
-
-    def __del__(self):
-        # Remove from world on garbage collection
-        if self.world:
-            self.world.remove_entity(self)
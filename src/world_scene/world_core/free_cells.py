@@ -0,0 +1,218 @@
+import math
+import random
+from typing import TYPE_CHECKING, Dict, List, Sequence, Set, Tuple
+
+if TYPE_CHECKING:
+    from .entity import Entity
+
+
+CellRect = Tuple[int, int, int, int]
+
+
+class FreeCellIndex:
+    """
+    Index of cells where an entity of a given footprint can be placed.
+
+    A cell is spawnable when it has a tile and no entity's bounding box overlaps it.
+    An anchor cell is free when every cell of the footprint starting at it is spawnable.
+    Free anchors are kept in a list with a position map so that drawing a random one,
+    adding one and removing one are all O(1).
+    """
+
+    def __init__(self, footprint: Tuple[int, int] = (1, 1)):
+        self.footprint = footprint
+        self._spawnable: Set[Tuple[int, int]] = set()
+        self._occupancy: Dict[Tuple[int, int], int] = {}
+        self._entity_rects: Dict['Entity', CellRect] = {}
+        self._free: List[Tuple[int, int]] = []
+        self._free_pos: Dict[Tuple[int, int], int] = {}
+
+    def _get_rect_for_entity(self, entity: 'Entity') -> CellRect:
+        """Get the inclusive range of cells an entity's bounding box overlaps."""
+        min_x, min_y = entity.pos
+        max_x = min_x + entity.size_world_units[0]
+        max_y = min_y + entity.size_world_units[1]
+        return (
+            math.floor(min_x), math.floor(min_y),
+            math.ceil(max_x) - 1, math.ceil(max_y) - 1
+        )
+
+    def _is_cell_open(self, cell: Tuple[int, int]) -> bool:
+        return cell in self._spawnable and cell not in self._occupancy
+
+    def _refresh_anchor(self, anchor: Tuple[int, int]) -> None:
+        """Re-evaluate whether the footprint starting at anchor is free."""
+        ax, ay = anchor
+        fw, fh = self.footprint
+        free = True
+        for cx in range(ax, ax + fw):
+            for cy in range(ay, ay + fh):
+                if not self._is_cell_open((cx, cy)):
+                    free = False
+                    break
+            if not free:
+                break
+
+        if free:
+            if anchor not in self._free_pos:
+                self._free_pos[anchor] = len(self._free)
+                self._free.append(anchor)
+        elif anchor in self._free_pos:
+            # Swap-remove to keep removal O(1)
+            index = self._free_pos.pop(anchor)
+            last = self._free.pop()
+            if last != anchor:
+                self._free[index] = last
+                self._free_pos[last] = index
+
+    def _refresh_cell(self, cx: int, cy: int) -> None:
+        """Re-evaluate every anchor whose footprint covers cell (cx, cy)."""
+        fw, fh = self.footprint
+        for ax in range(cx - fw + 1, cx + 1):
+            for ay in range(cy - fh + 1, cy + 1):
+                self._refresh_anchor((ax, ay))
+
+    def _occupy_rect(self, rect: CellRect, delta: int) -> None:
+        min_cx, min_cy, max_cx, max_cy = rect
+        for cx in range(min_cx, max_cx + 1):
+            for cy in range(min_cy, max_cy + 1):
+                cell = (cx, cy)
+                count = self._occupancy.get(cell, 0) + delta
+                if count > 0:
+                    self._occupancy[cell] = count
+                else:
+                    self._occupancy.pop(cell, None)
+                # Only a transition between empty and occupied affects free anchors
+                if count == 0 or (count == 1 and delta > 0):
+                    self._refresh_cell(cx, cy)
+
+    def set_spawnable(self, cx: int, cy: int, spawnable: bool) -> None:
+        """Mark whether cell (cx, cy) may be spawned on at all (e.g. it has a tile)."""
+        cell = (cx, cy)
+        if spawnable == (cell in self._spawnable):
+            return
+        if spawnable:
+            self._spawnable.add(cell)
+        else:
+            self._spawnable.discard(cell)
+        self._refresh_cell(cx, cy)
+
+    def set_spawnable_region(self, min_x: int, min_y: int, width: int, spawnable: Sequence[bool]) -> None:
+        """Mark a row-major block of cells at once, re-evaluating each affected anchor only once."""
+        changed = False
+        for i, value in enumerate(spawnable):
+            cell = (min_x + i % width, min_y + i // width)
+            if value != (cell in self._spawnable):
+                changed = True
+                if value:
+                    self._spawnable.add(cell)
+                else:
+                    self._spawnable.discard(cell)
+        if not changed:
+            return
+
+        fw, fh = self.footprint
+        max_x = min_x + width
+        max_y = min_y + -(-len(spawnable) // width)
+        offsets = [(dx, dy) for dx in range(fw) for dy in range(fh)]
+        spawnable_cells = self._spawnable
+        occupancy = self._occupancy
+        free = self._free
+        free_pos = self._free_pos
+        # Same as _refresh_anchor for every affected anchor, with the lookups hoisted
+        for ax in range(min_x - fw + 1, max_x):
+            for ay in range(min_y - fh + 1, max_y):
+                anchor = (ax, ay)
+                is_free = True
+                for dx, dy in offsets:
+                    cell = (ax + dx, ay + dy)
+                    if cell not in spawnable_cells or cell in occupancy:
+                        is_free = False
+                        break
+                if is_free:
+                    if anchor not in free_pos:
+                        free_pos[anchor] = len(free)
+                        free.append(anchor)
+                elif anchor in free_pos:
+                    index = free_pos.pop(anchor)
+                    last = free.pop()
+                    if last != anchor:
+                        free[index] = last
+                        free_pos[last] = index
+
+    def insert(self, entity: 'Entity') -> None:
+        """Mark the cells covered by an entity as occupied."""
+        if entity in self._entity_rects:
+            self.update(entity)
+            return
+        rect = self._get_rect_for_entity(entity)
+        self._entity_rects[entity] = rect
+        self._occupy_rect(rect, 1)
+
+    def remove(self, entity: 'Entity') -> None:
+        """Release the cells covered by an entity."""
+        rect = self._entity_rects.pop(entity, None)
+        if rect is not None:
+            self._occupy_rect(rect, -1)
+
+    def update(self, entity: 'Entity') -> None:
+        """Update occupancy after an entity moved."""
+        old_rect = self._entity_rects.get(entity)
+        new_rect = self._get_rect_for_entity(entity)
+
+        # Only update if the covered cells changed
+        if old_rect == new_rect:
+            return
+        if old_rect is not None:
+            self._occupy_rect(old_rect, -1)
+        self._entity_rects[entity] = new_rect
+        self._occupy_rect(new_rect, 1)
+
+    def is_free(self, cx: int, cy: int) -> bool:
+        """Check if the footprint anchored at cell (cx, cy) is free."""
+        return (cx, cy) in self._free_pos
+
+    def sample(
+        self,
+        rng: random.Random | None = None,
+        near: Tuple[float, float] | None = None,
+        min_distance: float = 0.0,
+        outside: Tuple[float, float, float, float] | None = None,
+        max_attempts: int = 16
+    ) -> Tuple[int, int] | None:
+        """
+        Draw a random free anchor cell, or None if no acceptable cell was found.
+
+        Each draw is O(1). Constraints are applied by rejection:
+          - near/min_distance: the anchor must be at least min_distance from near.
+          - outside: the anchor must lie outside the (min_x, min_y, max_x, max_y) region,
+            e.g. the bounds returned by get_screen_bounds for "off-screen only".
+        """
+        if not self._free:
+            return None
+        randrange = rng.randrange if rng is not None else random.randrange
+
+        for _ in range(max_attempts):
+            cell = self._free[randrange(len(self._free))]
+            cx, cy = cell
+            if near is not None and min_distance > 0:
+                if (cx - near[0]) ** 2 + (cy - near[1]) ** 2 < min_distance ** 2:
+                    continue
+            if outside is not None:
+                min_x, min_y, max_x, max_y = outside
+                if min_x <= cx <= max_x and min_y <= cy <= max_y:
+                    continue
+            return cell
+        return None
+
+    def __len__(self) -> int:
+        """Return the number of free anchor cells."""
+        return len(self._free)
+
+    def clear(self) -> None:
+        """Clear all occupancy and spawnable cells."""
+        self._spawnable.clear()
+        self._occupancy.clear()
+        self._entity_rects.clear()
+        self._free.clear()
+        self._free_pos.clear()
@@ -10,12 +10,17 @@ class SpatialHash:
     A spatial hash grid for efficient spatial queries.
     Entities are stored in cells based on their position.
     Cell size should match or be a multiple of your tile size for best performance.
+
+    Cells hold their entities in dicts used as ordered sets, so queries return
+    entities in insertion order rather than an order that depends on where
+    the entities happen to be in memory; replays rely on that.
     """
     
     def __init__(self, cell_size: float = 1.0):
         self.cell_size = cell_size
-        self._grid: Dict[Tuple[int, int], Set[Entity]] = defaultdict(set)
+        self._grid: Dict[Tuple[int, int], Dict[Entity, None]] = defaultdict(dict)
         self._entity_cells: Dict[Entity, Set[Tuple[int, int]]] = defaultdict(set)
+        self.query_count = 0  # Number of region/point queries, for profiling
 
     def _get_cell(self, x: float, y: float) -> Tuple[int, int]:
         """Convert world coordinates to cell coordinates."""
@@ -23,10 +28,10 @@ class SpatialHash:
 
     def _get_cells_for_entity(self, entity: 'Entity') -> Set[Tuple[int, int]]:
         """Get all cells that an entity occupies based on its bounding box."""
-        min_cell_x, min_cell_y = self._get_cell(entity.x, entity.y)
+        min_cell_x, min_cell_y = self._get_cell(entity.pos[0], entity.pos[1])
         max_cell_x, max_cell_y = self._get_cell(
-            entity.x + entity.world_units_width,
-            entity.y + entity.world_units_height
+            entity.pos[0] + entity.size_world_units[0],
+            entity.pos[1] + entity.size_world_units[1]
         )
         
         cells = set()
@@ -39,14 +44,14 @@ class SpatialHash:
         """Insert an entity into the spatial hash."""
         cells = self._get_cells_for_entity(entity)
         for cell in cells:
-            self._grid[cell].add(entity)
+            self._grid[cell][entity] = None
         self._entity_cells[entity] = cells
 
     def remove(self, entity: 'Entity') -> None:
         """Remove an entity from the spatial hash."""
         if entity in self._entity_cells:
             for cell in self._entity_cells[entity]:
-                self._grid[cell].discard(entity)
+                self._grid[cell].pop(entity, None)
                 # Clean up empty cells to save memory
                 if not self._grid[cell]:
                     del self._grid[cell]
@@ -61,13 +66,13 @@ class SpatialHash:
         if new_cells != old_cells:
             # Remove from old cells that are no longer occupied
             for cell in old_cells - new_cells:
-                self._grid[cell].discard(entity)
+                self._grid[cell].pop(entity, None)
                 if not self._grid[cell]:
                     del self._grid[cell]
             
             # Add to new cells
             for cell in new_cells - old_cells:
-                self._grid[cell].add(entity)
+                self._grid[cell][entity] = None
             
             self._entity_cells[entity] = new_cells
 
@@ -76,10 +81,11 @@ class SpatialHash:
         Query all entities that may intersect the given region.
         Returns entities in cells that overlap with the query region.
         """
+        self.query_count += 1
         min_cell_x, min_cell_y = self._get_cell(min_x, min_y)
         max_cell_x, max_cell_y = self._get_cell(max_x, max_y)
         
-        result: Set[Entity] = set()
+        result: Dict[Entity, None] = {}
         for cx in range(min_cell_x, max_cell_x + 1):
             for cy in range(min_cell_y, max_cell_y + 1):
                 cell_key = (cx, cy)
@@ -90,6 +96,7 @@ class SpatialHash:
 
     def query_point(self, x: float, y: float) -> List['Entity']:
         """Query all entities that may contain the given point."""
+        self.query_count += 1
         cell = self._get_cell(x, y)
         if cell in self._grid:
             return list(self._grid[cell])
@@ -99,6 +106,10 @@ class SpatialHash:
         """Return all entities in the spatial hash."""
         return list(self._entity_cells.keys())
 
+    def __len__(self) -> int:
+        """Return the number of entities in the spatial hash."""
+        return len(self._entity_cells)
+
     def __contains__(self, entity: 'Entity') -> bool:
         """Check if an entity is in the spatial hash."""
         return entity in self._entity_cells
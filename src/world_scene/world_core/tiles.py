@@ -1,19 +1,191 @@
+from array import array
+from typing import Callable, Dict, Iterator, List, Sequence, Set, Tuple
+
+TILE_CHUNK_SIZE = 16  # Tiles per storage chunk side
+
+
 class Tile:
-    def __init__(self, name: str, image: str):
+    def __init__(self, name: str, image: str, solid: bool = False, movement_cost: float = 1.0):
         self.name = name
         self.image = image
+        self.solid = solid                  # Blocks movement entirely
+        self.movement_cost = movement_cost  # Movement speed is divided by this
 
 class TileMap:
+    """
+    Tile storage split into TILE_CHUNK_SIZE x TILE_CHUNK_SIZE chunks.
+
+    Each chunk is a flat row-major array of palette indices, where 0 means no tile
+    and n refers to palette[n - 1]. Indices are stored as uint8 and the whole map
+    switches to uint16 once more than 255 distinct tiles are used. Empty chunks are
+    dropped.
+    """
+
     def __init__(self):
-        self.tiles: dict[tuple[int, int], Tile] = {}
+        self.palette: List[Tile] = []
+        self._palette_index: Dict[Tile, int] = {}
+        self._typecode = 'B'
+        self._chunks: Dict[Tuple[int, int], array] = {}
+        self._chunk_counts: Dict[Tuple[int, int], int] = {}
+        self._shared: Set[Tuple[int, int]] = set()  # chunks referenced by a snapshot
+        self._listeners: List[Callable[[int, int, Tile | None], None]] = []
+        self._region_listeners: List[Callable[[int, int, int, int], None]] = []
+
+    def add_listener(self, listener: Callable[[int, int, Tile | None], None]):
+        """Register a callback invoked with (x, y, tile) whenever a tile changes; tile is None on removal."""
+        self._listeners.append(listener)
+
+    def add_region_listener(self, listener: Callable[[int, int, int, int], None]):
+        """
+        Register a callback invoked with (min_x, min_y, max_x, max_y), max exclusive,
+        once per change: a single tile or a whole write_region. Cheaper than a tile
+        listener for bulk writes such as chunk generation.
+        """
+        self._region_listeners.append(listener)
+
+    def _notify(self, x: int, y: int, tile: Tile | None):
+        for listener in self._listeners:
+            listener(x, y, tile)
+        for region_listener in self._region_listeners:
+            region_listener(x, y, x + 1, y + 1)
+
+    def index_of(self, tile: Tile | None) -> int:
+        """Return the palette index of tile, registering it if needed. None is 0."""
+        if tile is None:
+            return 0
+        index = self._palette_index.get(tile)
+        if index is None:
+            self.palette.append(tile)
+            index = len(self.palette)
+            self._palette_index[tile] = index
+            if index > 0xFF and self._typecode == 'B':
+                self._typecode = 'H'
+                for key, chunk in self._chunks.items():
+                    self._chunks[key] = array('H', chunk)
+        return index
+
+    def tile_for(self, index: int) -> Tile | None:
+        return self.palette[index - 1] if index else None
+
+    def _set(self, x: int, y: int, index: int) -> bool:
+        """Store a palette index, returning True if the cell changed."""
+        key = (x // TILE_CHUNK_SIZE, y // TILE_CHUNK_SIZE)
+        offset = (y % TILE_CHUNK_SIZE) * TILE_CHUNK_SIZE + (x % TILE_CHUNK_SIZE)
+        chunk = self._chunks.get(key)
+        if chunk is None:
+            if index == 0:
+                return False
+            chunk = array(self._typecode, bytes(TILE_CHUNK_SIZE * TILE_CHUNK_SIZE * array(self._typecode).itemsize))
+            self._chunks[key] = chunk
+            self._chunk_counts[key] = 0
+
+        old = chunk[offset]
+        if old == index:
+            return False
+        if key in self._shared:
+            # Copy-on-write: a snapshot still holds the current array
+            self._shared.discard(key)
+            chunk = array(chunk.typecode, chunk)
+            self._chunks[key] = chunk
+        chunk[offset] = index
+        if old == 0:
+            self._chunk_counts[key] += 1
+        elif index == 0:
+            self._chunk_counts[key] -= 1
+            if self._chunk_counts[key] == 0:
+                del self._chunks[key]
+                del self._chunk_counts[key]
+        return True
 
     def add_tile(self, x: int, y: int, tile: Tile):
-        self.tiles[(x, y)] = tile
+        if self._set(x, y, self.index_of(tile)):
+            self._notify(x, y, tile)
 
     def get_tile(self, x: int, y: int) -> Tile | None:
-        return self.tiles.get((x, y))
+        chunk = self._chunks.get((x // TILE_CHUNK_SIZE, y // TILE_CHUNK_SIZE))
+        if chunk is None:
+            return None
+        index = chunk[(y % TILE_CHUNK_SIZE) * TILE_CHUNK_SIZE + (x % TILE_CHUNK_SIZE)]
+        return self.palette[index - 1] if index else None
 
     def remove_tile(self, x: int, y: int):
-        self.tiles.pop((x, y), None)
+        if self._set(x, y, 0):
+            self._notify(x, y, None)
+
+    def read_region(self, min_x: int, min_y: int, max_x: int, max_y: int) -> array:
+        """
+        Return the palette indices of the region [min_x, max_x) x [min_y, max_y) as a
+        row-major array of (max_x - min_x) * (max_y - min_y) entries. Use tile_for() or
+        palette to resolve them.
+        """
+        width = max_x - min_x
+        height = max_y - min_y
+        result = array(self._typecode, bytes(max(width, 0) * max(height, 0) * array(self._typecode).itemsize))
+        if width <= 0 or height <= 0:
+            return result
+
+        for cy in range(min_y // TILE_CHUNK_SIZE, (max_y - 1) // TILE_CHUNK_SIZE + 1):
+            chunk_y = cy * TILE_CHUNK_SIZE
+            y0 = max(min_y, chunk_y)
+            y1 = min(max_y, chunk_y + TILE_CHUNK_SIZE)
+            for cx in range(min_x // TILE_CHUNK_SIZE, (max_x - 1) // TILE_CHUNK_SIZE + 1):
+                chunk = self._chunks.get((cx, cy))
+                if chunk is None:
+                    continue
+                chunk_x = cx * TILE_CHUNK_SIZE
+                x0 = max(min_x, chunk_x)
+                x1 = min(max_x, chunk_x + TILE_CHUNK_SIZE)
+                # Copy one row slice of this chunk at a time
+                for y in range(y0, y1):
+                    src = (y - chunk_y) * TILE_CHUNK_SIZE
+                    dst = (y - min_y) * width
+                    result[dst + x0 - min_x:dst + x1 - min_x] = chunk[src + x0 - chunk_x:src + x1 - chunk_x]
+        return result
+
+    def write_region(self, min_x: int, min_y: int, width: int, tiles: Sequence[Tile | None]):
+        """Set a row-major block of tiles starting at (min_x, min_y), width tiles per row. None removes."""
+        indices = [self.index_of(tile) for tile in tiles]
+        changed = False
+        for i, index in enumerate(indices):
+            x = min_x + i % width
+            y = min_y + i // width
+            if self._set(x, y, index):
+                changed = True
+                for listener in self._listeners:
+                    listener(x, y, self.tile_for(index))
+        if changed:
+            for region_listener in self._region_listeners:
+                region_listener(min_x, min_y, min_x + width, min_y + -(-len(indices) // width))
+
+    def clear_region(self, min_x: int, min_y: int, max_x: int, max_y: int):
+        """Remove every tile in [min_x, max_x) x [min_y, max_y)."""
+        width = max_x - min_x
+        self.write_region(min_x, min_y, width, [None] * (width * (max_y - min_y)))
+
+    def get_chunk(self, cx: int, cy: int) -> array | None:
+        """Return the palette-index array of storage chunk (cx, cy), or None if it has no tiles."""
+        return self._chunks.get((cx, cy))
+
+    def snapshot_chunks(self) -> Dict[Tuple[int, int], array]:
+        """
+        Return every chunk array without copying. The arrays must not be modified; the
+        map copies a chunk before its next write instead, so the snapshot stays
+        consistent while it is read, e.g. on another thread.
+        """
+        self._shared = set(self._chunks)
+        return dict(self._chunks)
+
+    def items(self) -> Iterator[Tuple[Tuple[int, int], Tile]]:
+        """Iterate over ((x, y), tile) for every stored tile."""
+        for (cx, cy), chunk in self._chunks.items():
+            for offset, index in enumerate(chunk):
+                if index:
+                    yield (cx * TILE_CHUNK_SIZE + offset % TILE_CHUNK_SIZE,
+                           cy * TILE_CHUNK_SIZE + offset // TILE_CHUNK_SIZE), self.palette[index - 1]
 
+    def __len__(self) -> int:
+        """Return the number of stored tiles."""
+        return sum(self._chunk_counts.values())
 
+    def __contains__(self, position: Tuple[int, int]) -> bool:
+        return self.get_tile(position[0], position[1]) is not None
@@ -0,0 +1,117 @@
+import math
+from typing import Dict, Tuple
+
+from .tiles import TILE_CHUNK_SIZE, Tile, TileMap
+
+# Cell codes: 0 is no tile, SOLID blocks movement, anything in between is a
+# walkable tile whose movement cost is code / COST_SCALE
+NO_TILE = 0
+SOLID = 0xFF
+COST_SCALE = 16
+MAX_COST_CODE = SOLID - 1
+
+
+def tile_code(tile: Tile | None) -> int:
+    if tile is None:
+        return NO_TILE
+    if tile.solid:
+        return SOLID
+    return max(1, min(MAX_COST_CODE, round(tile.movement_cost * COST_SCALE)))
+
+
+class WalkabilityGrid:
+    """
+    Per-cell walkability derived from a TileMap's tile properties.
+
+    Cells are stored as one byte per cell in chunks matching the TileMap's storage
+    chunks, and kept in sync through a TileMap region listener, so lookups are O(1)
+    and never allocate. Cells without a tile (e.g. chunks that are not loaded) are
+    walkable at cost 1 but not spawnable.
+    """
+
+    def __init__(self, tile_map: TileMap):
+        self.tile_map = tile_map
+        self._chunks: Dict[Tuple[int, int], bytearray] = {}
+        # Palette index -> cell code, extended as the palette grows
+        self._table = bytearray(256)
+        self._table_size = 0
+
+    def _refresh_table(self):
+        palette = self.tile_map.palette
+        if len(palette) == self._table_size:
+            return
+        if len(palette) >= len(self._table):
+            self._table.extend(bytes(len(palette) + 1 - len(self._table)))
+        for index in range(self._table_size + 1, len(palette) + 1):
+            self._table[index] = tile_code(palette[index - 1])
+        self._table_size = len(palette)
+
+    def update_region(self, min_x: int, min_y: int, max_x: int, max_y: int) -> bytes:
+        """Re-derive the cells of [min_x, max_x) x [min_y, max_y). Returns their codes, row-major."""
+        self._refresh_table()
+        indices = self.tile_map.read_region(min_x, min_y, max_x, max_y)
+        if indices.typecode == 'B':
+            codes = indices.tobytes().translate(self._table)
+        else:
+            codes = bytes(self._table[index] for index in indices)
+
+        width = max_x - min_x
+        for cy in range(min_y // TILE_CHUNK_SIZE, (max_y - 1) // TILE_CHUNK_SIZE + 1):
+            chunk_y = cy * TILE_CHUNK_SIZE
+            y0 = max(min_y, chunk_y)
+            y1 = min(max_y, chunk_y + TILE_CHUNK_SIZE)
+            for cx in range(min_x // TILE_CHUNK_SIZE, (max_x - 1) // TILE_CHUNK_SIZE + 1):
+                chunk_x = cx * TILE_CHUNK_SIZE
+                x0 = max(min_x, chunk_x)
+                x1 = min(max_x, chunk_x + TILE_CHUNK_SIZE)
+                chunk = self._chunks.get((cx, cy))
+                if chunk is None:
+                    chunk = bytearray(TILE_CHUNK_SIZE * TILE_CHUNK_SIZE)
+                    self._chunks[(cx, cy)] = chunk
+                for y in range(y0, y1):
+                    src = (y - min_y) * width
+                    dst = (y - chunk_y) * TILE_CHUNK_SIZE
+                    chunk[dst + x0 - chunk_x:dst + x1 - chunk_x] = codes[src + x0 - min_x:src + x1 - min_x]
+                # Chunks without any tile are dropped, like the TileMap's
+                if chunk.count(NO_TILE) == len(chunk):
+                    del self._chunks[(cx, cy)]
+        return codes
+
+    def code_at(self, x: int, y: int) -> int:
+        chunk = self._chunks.get((x // TILE_CHUNK_SIZE, y // TILE_CHUNK_SIZE))
+        if chunk is None:
+            return NO_TILE
+        return chunk[(y % TILE_CHUNK_SIZE) * TILE_CHUNK_SIZE + (x % TILE_CHUNK_SIZE)]
+
+    def is_solid(self, x: int, y: int) -> bool:
+        return self.code_at(x, y) == SOLID
+
+    def is_spawnable(self, x: int, y: int) -> bool:
+        """True if the cell has a tile that does not block movement."""
+        return NO_TILE < self.code_at(x, y) < SOLID
+
+    def cost(self, x: int, y: int) -> float:
+        """Movement cost of a walkable cell (1.0 without a tile), inf for solid cells."""
+        code = self.code_at(x, y)
+        if code == SOLID:
+            return math.inf
+        return code / COST_SCALE if code else 1.0
+
+    def is_area_walkable(self, min_x: float, min_y: float, max_x: float, max_y: float) -> bool:
+        """True if no solid cell overlaps the box [min_x, max_x) x [min_y, max_y) in world units."""
+        chunks = self._chunks
+        for y in range(math.floor(min_y), math.ceil(max_y)):
+            cy, row = divmod(y, TILE_CHUNK_SIZE)
+            for x in range(math.floor(min_x), math.ceil(max_x)):
+                cx, column = divmod(x, TILE_CHUNK_SIZE)
+                chunk = chunks.get((cx, cy))
+                if chunk is not None and chunk[row * TILE_CHUNK_SIZE + column] == SOLID:
+                    return False
+        return True
+
+    def get_chunk(self, cx: int, cy: int) -> bytearray | None:
+        """
+        Return the row-major cell codes of storage chunk (cx, cy) without copying, or None
+        if it has no tiles. For bulk consumers such as pathfinding; do not modify.
+        """
+        return self._chunks.get((cx, cy))
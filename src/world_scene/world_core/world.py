@@ -1,38 +1,130 @@
-from typing import List, Sequence, Type, TYPE_CHECKING
+import math
+import random
+from collections import OrderedDict
+from typing import Dict, List, Sequence, Tuple, Type, TYPE_CHECKING
 
 from .tiles import TileMap, Tile
 from .spatial_hash import SpatialHash
+from .free_cells import FreeCellIndex
+from .walkability import NO_TILE, SOLID, WalkabilityGrid
+from ..constants import TILE_SIZE
 
 if TYPE_CHECKING:
+    import pygame
+    from assets import AssetManager
     from .entity import Entity
-    from ..graphics import MessageLog
+    from ..graphics import MessageLog, ParticleSystem
+
+QUERY_CACHE_SIZE = 64  # Query results kept per generation
+# World units a drawn sprite may extend above or left of its entity's AABB (see _mask_pixel)
+SPRITE_OVERHANG = 2.0
+
+# Filled circle masks by radius in pixels, for precise radius queries
+_circle_masks: Dict[int, 'pygame.mask.Mask'] = {}
+
+
+def _circle_mask(radius: int) -> 'pygame.mask.Mask':
+    mask = _circle_masks.get(radius)
+    if mask is None:
+        import pygame
+        surface = pygame.Surface((radius * 2 + 1, radius * 2 + 1), pygame.SRCALPHA)
+        pygame.draw.circle(surface, (255, 255, 255), (radius, radius), radius)
+        mask = pygame.mask.from_surface(surface)
+        _circle_masks[radius] = mask
+    return mask
 
 
 class World:
-    def __init__(self, message_log: 'MessageLog'):
+    def __init__(self, message_log: 'MessageLog', spawn_footprint: Tuple[int, int] = (1, 1)):
         self.tile_map = TileMap()
         self.spatial_hash = SpatialHash(cell_size=1.0)  # 1 world unit per cell
+        self.free_cells = FreeCellIndex(footprint=spawn_footprint)
+        self.walkability = WalkabilityGrid(self.tile_map)
+        # Entities by exact class, in insertion order (dicts used as ordered sets)
+        self._by_type: Dict[type, Dict['Entity', None]] = {}
+
+        # Bumped whenever an entity is added, removed or moved. Region query results are
+        # cached until it changes; callers must not modify them. Radius queries are not
+        # cached: they are centred on moving entities, so they do not repeat between moves.
+        self.generation = 0
+        self._query_cache: OrderedDict[tuple, List['Entity']] = OrderedDict()
+        self._query_cache_generation = 0
+        self.query_hits = 0
+        self.query_misses = 0
         self.log = message_log
+        # Gameplay randomness and the simulation clock (seconds of simulated time), seeded
+        # and advanced by the scene so a recorded session replays identically
+        self.rng = random.Random()
+        self.time = 0.0
+        self.particles: 'ParticleSystem | None' = None  # Set by the scene that draws the world
+        # Source of image masks for pixel-precise hit tests; without it they use bounding boxes
+        self.assets: 'AssetManager | None' = None
         self.is_frozen = False
 
+        self.tile_map.add_region_listener(self._on_tiles_changed)
+
+    def _on_tiles_changed(self, min_x: int, min_y: int, max_x: int, max_y: int):
+        # Spawning only uses cells the walkability grid considers walkable tiles
+        codes = self.walkability.update_region(min_x, min_y, max_x, max_y)
+        self.free_cells.set_spawnable_region(min_x, min_y, max_x - min_x, [NO_TILE < code < SOLID for code in codes])
+
     def add_entity(self, entity: 'Entity'):
         self.spatial_hash.insert(entity)
+        self.free_cells.insert(entity)
+        self._by_type.setdefault(type(entity), {})[entity] = None
+        self.generation += 1
 
     def remove_entity(self, entity: 'Entity'):
         """Remove an entity from the world."""
         self.spatial_hash.remove(entity)
+        self.free_cells.remove(entity)
+        entities = self._by_type.get(type(entity))
+        if entities is not None:
+            entities.pop(entity, None)
+        self.generation += 1
 
     def update_entity_position(self, entity: 'Entity'):
         """Update an entity's position in the spatial hash. Call after entity movement."""
         self.spatial_hash.update(entity)
+        self.free_cells.update(entity)
+        self.generation += 1
 
     def get_entities_in_region(self, min_x: float, min_y: float, max_x: float, max_y: float) -> List['Entity']:
         """Get all entities that may be visible in the given world coordinate region."""
-        return self.spatial_hash.query_region(min_x, min_y, max_x, max_y)
+        key = ("region", min_x, min_y, max_x, max_y)
+        result = self._cached_query(key)
+        if result is None:
+            result = self.spatial_hash.query_region(min_x, min_y, max_x, max_y)
+            self._cache_query(key, result)
+        return result
+
+    def _cached_query(self, key: tuple) -> List['Entity'] | None:
+        cache = self._query_cache
+        if self._query_cache_generation != self.generation:
+            cache.clear()
+            self._query_cache_generation = self.generation
+        result = cache.get(key)
+        if result is None:
+            self.query_misses += 1
+        else:
+            self.query_hits += 1
+            cache.move_to_end(key)
+        return result
+
+    def _cache_query(self, key: tuple, result: List['Entity']):
+        cache = self._query_cache
+        cache[key] = result
+        if len(cache) > QUERY_CACHE_SIZE:
+            cache.popitem(last=False)
+
+    @property
+    def query_hit_rate(self) -> float:
+        total = self.query_hits + self.query_misses
+        return self.query_hits / total if total else 0.0
     
     def get_entities_of_type(self, entity_type: Type['Entity']) -> List['Entity']:
-        """Get all entities of the specified type."""
-        return [ent for ent in self.spatial_hash.get_all_entities() if isinstance(ent, entity_type)]
+        """Get all entities of the specified type, from the type index rather than a scan of every entity."""
+        return [ent for cls, entities in self._by_type.items() if issubclass(cls, entity_type) for ent in entities]
 
     def get_tile_map(self) -> TileMap:
         return self.tile_map
@@ -43,6 +135,10 @@ class World:
     def get_tile_at(self, x: int, y: int) -> Tile | None:
         return self.tile_map.get_tile(x, y)
 
+    def is_area_walkable(self, min_x: float, min_y: float, max_x: float, max_y: float) -> bool:
+        """Check the box against solid tiles only. O(cells covered), no entity queries."""
+        return self.walkability.is_area_walkable(min_x, min_y, max_x, max_y)
+
     def has_collision(self, source: 'Entity', excluded: Sequence[Type['Entity']] | None = None) -> 'Entity | None':
         """
         Check if the source entity collides with any other entity in the world,
@@ -71,21 +167,50 @@ class World:
                 return entity
         return None
 
+    def _mask_of(self, entity: 'Entity') -> 'pygame.mask.Mask | None':
+        """The mask of the entity's current image."""
+        if self.assets is None:
+            return None
+        image = entity.get_current_image()
+        return self.assets.get_mask(image) if image else None
+
+    @staticmethod
+    def _mask_pixel(entity: 'Entity', mask: 'pygame.mask.Mask', x: float, y: float) -> Tuple[int, int]:
+        """
+        The mask pixel under world point (x, y), where the renderer draws the sprite:
+        left-aligned with the entity and, for sprites taller than a tile, shifted up
+        so its base sits on the entity's tile row.
+        """
+        lift = max(0, mask.get_size()[1] - TILE_SIZE)
+        return math.floor((x - entity.pos[0]) * TILE_SIZE), math.floor((y - entity.pos[1]) * TILE_SIZE) + lift
+
     def point_collision(self, x: float, y: float, excluded: Sequence[Type['Entity']] | None = None) -> 'Entity | None':
         """
         Check if the point (x, y) collides with any entity in the world,
         excluding entities of the specified types.
 
-        Uses axis-aligned bounding box (AABB) collision detection.
+        Entities with an image mask are hit where their sprite is drawn, and only on
+        opaque pixels, so transparent pixels (e.g. around a tree's canopy) do not
+        count. Others use axis-aligned bounding box (AABB) collision detection.
         Uses spatial hash to only check nearby entities.
         """
-        nearby = self.spatial_hash.query_point(x, y)
+        if self.assets is None:
+            nearby = self.spatial_hash.query_point(x, y)
+        else:
+            # Sprites can be drawn above or left of the AABB cells they are stored in
+            nearby = self.spatial_hash.query_region(x - SPRITE_OVERHANG, y, x, y + SPRITE_OVERHANG)
         
         for entity in nearby:
             if excluded and isinstance(entity, tuple(excluded)):
                 continue
 
-            if (x >= entity.pos[0] and
+            mask = self._mask_of(entity)
+            if mask is not None:
+                px, py = self._mask_pixel(entity, mask, x, y)
+                width, height = mask.get_size()
+                if 0 <= px < width and 0 <= py < height and mask.get_at((px, py)):
+                    return entity
+            elif (x >= entity.pos[0] and
                 x <= entity.pos[0] + entity.size_world_units[0] and
                 y >= entity.pos[1] and
                 y <= entity.pos[1] + entity.size_world_units[1]):
@@ -96,21 +221,41 @@ class World:
         """Calculate Euclidean distance between two points."""
         return ((sx - ex) ** 2 + (sy - ey) ** 2) ** 0.5
     
-    def entities_in_radius(self, x: float, y: float, radius: float, excluded: Sequence[Type['Entity']] | None = None) -> List['Entity']:
+    def entities_in_radius(
+        self,
+        x: float,
+        y: float,
+        radius: float,
+        excluded: Sequence[Type['Entity']] | None = None,
+        precise: bool = False
+    ) -> List['Entity']:
         """Return a list of entities within the specified radius from point (x, y).
         
-        Uses spatial hash to only check entities in the bounding region.
+        Uses spatial hash to only check entities in the bounding region. By default an
+        entity's centre must be in range; precise instead checks whether any opaque
+        pixel of its image overlaps the circle (mask against a cached circle mask).
         """
-        # Query the square region that bounds the circle
+        # Query the square region that bounds the circle, and for precise queries the
+        # entities whose sprites are drawn into it from below or the right
+        overhang = SPRITE_OVERHANG if precise else 0.0
         nearby = self.spatial_hash.query_region(
-            x - radius, y - radius,
-            x + radius, y + radius
+            x - radius - overhang, y - radius,
+            x + radius, y + radius + overhang
         )
         
         result = []
         for entity in nearby:
             if excluded and isinstance(entity, tuple(excluded)):
                 continue
+            mask = self._mask_of(entity) if precise else None
+            if mask is not None:
+                # The circle mask's pixel (0, 0) is at (x - radius, y - radius)
+                pixels = round(radius * TILE_SIZE)
+                px, py = self._mask_pixel(entity, mask, x - radius, y - radius)
+                offset = (-px, -py)
+                if _circle_mask(pixels).overlap(mask, offset) is not None:
+                    result.append(entity)
+                continue
             dist = self.distance_between(x, y, entity.pos[0] + entity.size_world_units[0] / 2, entity.pos[1] + entity.size_world_units[1] / 2)
             if dist <= radius:
                 result.append(entity)